@@ -0,0 +1,136 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+pragma experimental ABIEncoderV2;
+
+import "@openzeppelin/contracts/math/SafeMath.sol";
+import "@openzeppelin/contracts/utils/Address.sol";
+
+interface IRouterStrategy {
+    function harvest() external;
+
+    function tend() external;
+
+    function depositInVault() external;
+}
+
+// Runs harvest / tend / depositInVault on many routers in one transaction.
+// It has to be set as keeper of every strategy it works on.
+contract BatchHarvester {
+    using SafeMath for uint256;
+
+    enum Action {Harvest, Tend, DepositInVault}
+
+    struct Job {
+        address strategy;
+        Action action;
+        uint256 gasLimit; // gas forwarded to the job, required
+    }
+
+    struct Result {
+        address strategy;
+        Action action;
+        bool success;
+        uint256 gasUsed;
+        bytes returnData; // revert reason when success is false
+    }
+
+    address public governance;
+    address public pendingGovernance;
+    mapping(address => bool) public keepers;
+
+    event Executed(
+        address indexed strategy,
+        Action action,
+        bool success,
+        uint256 gasUsed
+    );
+    event UpdatedKeeper(address indexed keeper, bool allowed);
+    event UpdatedGovernance(address governance);
+
+    modifier onlyGovernance() {
+        require(msg.sender == governance, "!authorized");
+        _;
+    }
+
+    modifier onlyKeepers() {
+        require(
+            msg.sender == governance || keepers[msg.sender],
+            "!authorized"
+        );
+        _;
+    }
+
+    constructor() public {
+        governance = msg.sender;
+    }
+
+    function setKeeper(address _keeper, bool _allowed)
+        external
+        onlyGovernance
+    {
+        keepers[_keeper] = _allowed;
+        emit UpdatedKeeper(_keeper, _allowed);
+    }
+
+    function setGovernance(address _governance) external onlyGovernance {
+        pendingGovernance = _governance;
+    }
+
+    function acceptGovernance() external {
+        require(msg.sender == pendingGovernance, "!authorized");
+        governance = pendingGovernance;
+        emit UpdatedGovernance(governance);
+    }
+
+    // A failing job does not revert the batch, its result is reported instead.
+    // Every job has its own gas limit, so a job running out of gas can't
+    // starve the ones after it
+    function execute(Job[] calldata _jobs)
+        external
+        onlyKeepers
+        returns (Result[] memory results)
+    {
+        for (uint256 i = 0; i < _jobs.length; i++) {
+            require(_jobs[i].gasLimit > 0, "!gasLimit");
+        }
+        results = new Result[](_jobs.length);
+        for (uint256 i = 0; i < _jobs.length; i++) {
+            Job memory job = _jobs[i];
+            results[i] = _execute(job);
+            emit Executed(
+                job.strategy,
+                job.action,
+                results[i].success,
+                results[i].gasUsed
+            );
+        }
+    }
+
+    function _execute(Job memory _job)
+        internal
+        returns (Result memory result)
+    {
+        result.strategy = _job.strategy;
+        result.action = _job.action;
+        if (!Address.isContract(_job.strategy)) {
+            return result;
+        }
+
+        bytes memory data;
+        if (_job.action == Action.Harvest) {
+            data = abi.encodeWithSelector(IRouterStrategy.harvest.selector);
+        } else if (_job.action == Action.Tend) {
+            data = abi.encodeWithSelector(IRouterStrategy.tend.selector);
+        } else {
+            data = abi.encodeWithSelector(
+                IRouterStrategy.depositInVault.selector
+            );
+        }
+
+        uint256 gasBefore = gasleft();
+        (result.success, result.returnData) = _job.strategy.call{
+            gas: _job.gasLimit
+        }(data);
+        result.gasUsed = gasBefore.sub(gasleft());
+    }
+}
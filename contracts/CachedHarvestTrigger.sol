@@ -0,0 +1,216 @@
+// SPDX-License-Identifier: AGPL-3.0
+
+pragma solidity 0.6.12;
+pragma experimental ABIEncoderV2;
+
+import {
+    BaseStrategy,
+    StrategyParams
+} from "@yearnvaults/contracts/BaseStrategy.sol";
+import {
+    SafeMath,
+    Address
+} from "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
+import "@openzeppelin/contracts/utils/SafeCast.sol";
+
+interface IUni {
+    function getAmountsOut(uint256 amountIn, address[] calldata path)
+        external
+        view
+        returns (uint256[] memory amounts);
+}
+
+// harvestTrigger of the routers. The call cost is priced with a quote of a
+// Uniswap V2 style router for WETH => want, cached on harvest for
+// ethToWantCacheInterval seconds, and a strategy that has never been quoted
+// does not take the call as free
+abstract contract CachedHarvestTrigger is BaseStrategy {
+    using Address for address;
+    using SafeMath for uint256;
+
+    address public constant weth = 0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2;
+    address public constant uniswapRouter =
+        0x7a250d5630B4cF539739dF2C5dAcb4c659F2488D;
+
+    // Shares its slot with BaseStrategy's emergencyExit, both are read by
+    // every harvest
+    uint128 public cachedEthToWant;
+
+    address public ethToWantRouter;
+    uint64 public ethToWantCachedAt;
+    uint32 public ethToWantCacheInterval;
+
+    function _initializeEthToWantCache() internal {
+        ethToWantRouter = uniswapRouter;
+        ethToWantCacheInterval = 1 days;
+    }
+
+    // 0 while no quote exists, never a price. harvestTrigger prices the call
+    // with _cachedEthToWant instead, which can tell the two apart
+    function ethToWant(uint256 _amtInWei)
+        public
+        view
+        virtual
+        override
+        returns (uint256)
+    {
+        if (_amtInWei == 0 || address(want) == weth) {
+            return _amtInWei;
+        }
+        return _amtInWei.mul(_wantPerEth()).div(1e18);
+    }
+
+    // ethToWant, type(uint256).max while no quote exists: the cost is unknown
+    // and no reward can cover it
+    function _cachedEthToWant(uint256 _amtInWei)
+        internal
+        view
+        returns (uint256)
+    {
+        if (_amtInWei == 0 || address(want) == weth) {
+            return _amtInWei;
+        }
+        uint256 _rate = _wantPerEth();
+        if (_rate == 0) {
+            return type(uint256).max;
+        }
+        return _amtInWei.mul(_rate).div(1e18);
+    }
+
+    // The cached quote of 1 ether, 0 if there has never been one
+    function _wantPerEth() internal view returns (uint256 _rate) {
+        _rate = cachedEthToWant;
+        if (!_isEthToWantCacheFresh()) {
+            // stale cache, use a live quote if the router answers and the
+            // last cached one, however old, otherwise
+            uint256 _quote = _quoteEthToWant();
+            if (_quote > 0) {
+                _rate = _quote;
+            }
+        }
+    }
+
+    function updateEthToWantCache() external onlyKeepers {
+        _updateEthToWantCache();
+    }
+
+    function setEthToWantRouter(address _ethToWantRouter)
+        external
+        onlyVaultManagers
+    {
+        ethToWantRouter = _ethToWantRouter;
+        ethToWantCachedAt = 0;
+    }
+
+    function setEthToWantCacheInterval(uint256 _ethToWantCacheInterval)
+        external
+        onlyVaultManagers
+    {
+        ethToWantCacheInterval = SafeCast.toUint32(_ethToWantCacheInterval);
+    }
+
+    // Refreshes the cached quote at most once per ethToWantCacheInterval
+    function _updateEthToWantCache() internal {
+        if (address(want) == weth || _isEthToWantCacheFresh()) {
+            return;
+        }
+        uint256 _quote = _quoteEthToWant();
+        if (_quote > 0) {
+            cachedEthToWant = SafeCast.toUint128(_quote);
+            ethToWantCachedAt = uint64(block.timestamp);
+        }
+    }
+
+    function _isEthToWantCacheFresh() internal view returns (bool) {
+        return
+            ethToWantCachedAt != 0 &&
+            block.timestamp <
+            uint256(ethToWantCachedAt).add(ethToWantCacheInterval);
+    }
+
+    // Want received for 1 ether, 0 if the router cannot quote it
+    function _quoteEthToWant() internal view returns (uint256) {
+        if (!ethToWantRouter.isContract()) {
+            return 0;
+        }
+
+        address[] memory path = new address[](2);
+        path[0] = weth;
+        path[1] = address(want);
+        try IUni(ethToWantRouter).getAmountsOut(1e18, path) returns (
+            uint256[] memory amounts
+        ) {
+            return amounts[amounts.length - 1];
+        } catch {
+            return 0;
+        }
+    }
+
+    // Same checks as BaseStrategy, but the reward of a harvest is the pending
+    // profit plus the credit (see _harvestCredit) and it has to beat
+    // profitFactor * callCost, both in want
+    function harvestTrigger(uint256 callCostInWei)
+        public
+        view
+        virtual
+        override
+        returns (bool)
+    {
+        StrategyParams memory params = vault.strategies(address(this));
+        if (params.activation == 0) {
+            return false;
+        }
+
+        uint256 sinceLastReport = block.timestamp.sub(params.lastReport);
+        if (sinceLastReport < minReportDelay) {
+            return false;
+        }
+        if (sinceLastReport >= maxReportDelay) {
+            return true;
+        }
+        if (vault.debtOutstanding() > debtThreshold) {
+            return true;
+        }
+
+        (uint256 _profit, uint256 _loss) = _pendingProfit(params.totalDebt);
+        if (_loss > debtThreshold) {
+            return true;
+        }
+        return _isWorthTheCall(callCostInWei, _profit);
+    }
+
+    // Whether the pending profit and the credit to invest pay for the call
+    function _isWorthTheCall(uint256 callCostInWei, uint256 _profit)
+        internal
+        view
+        virtual
+        returns (bool)
+    {
+        // without any ethToWant quote only the checks above trigger a harvest
+        uint256 _callCost = _cachedEthToWant(callCostInWei);
+        if (_callCost == type(uint256).max) {
+            return false;
+        }
+        return profitFactor.mul(_callCost) < _profit.add(_harvestCredit());
+    }
+
+    // Credit counted as harvest reward
+    function _harvestCredit() internal view virtual returns (uint256) {
+        return vault.creditAvailable();
+    }
+
+    // Profit or loss a harvest would report, in want
+    function _pendingProfit(uint256 _totalDebt)
+        internal
+        view
+        virtual
+        returns (uint256 _profit, uint256 _loss)
+    {
+        uint256 _totalAssets = estimatedTotalAssets();
+        if (_totalAssets >= _totalDebt) {
+            _profit = _totalAssets.sub(_totalDebt);
+        } else {
+            _loss = _totalDebt.sub(_totalAssets);
+        }
+    }
+}
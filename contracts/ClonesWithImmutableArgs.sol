@@ -0,0 +1,85 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+// EIP-1167 style proxies with fixed arguments appended to their code, based on
+// https://github.com/wighawag/clones-with-immutable-args. The proxy appends
+// the arguments and their length (2 bytes) to the calldata of every call it
+// delegates, and the implementation reads them back with calldataload instead
+// of storage.
+library ClonesWithImmutableArgs {
+    // proxy runtime without the appended arguments
+    uint256 internal constant RUNTIME_SIZE = 0x37;
+
+    function cloneCode(address _implementation, bytes memory _args)
+        internal
+        pure
+        returns (bytes memory)
+    {
+        uint256 extraLength = _args.length + 2;
+        require(RUNTIME_SIZE + extraLength <= type(uint16).max, "!args");
+        return
+            abi.encodePacked(
+                // creation: copies the runtime below to memory and returns it
+                hex"61",
+                uint16(RUNTIME_SIZE + extraLength),
+                hex"3d81600a3d39f3",
+                // runtime: calldata ++ code[0x37:], delegatecall, bubble up
+                hex"3d3d3d3d363d3d3761",
+                uint16(extraLength),
+                hex"603736393661",
+                uint16(extraLength),
+                hex"013d73",
+                _implementation,
+                hex"5af43d3d93803e603557fd5bf3",
+                _args,
+                uint16(_args.length)
+            );
+    }
+
+    function clone(address _implementation, bytes memory _args)
+        internal
+        returns (address instance)
+    {
+        bytes memory code = cloneCode(_implementation, _args);
+        assembly {
+            instance := create(0, add(code, 0x20), mload(code))
+        }
+        require(instance != address(0), "!create");
+    }
+
+    function cloneDeterministic(
+        address _implementation,
+        bytes memory _args,
+        bytes32 _salt
+    ) internal returns (address instance) {
+        bytes memory code = cloneCode(_implementation, _args);
+        assembly {
+            instance := create2(0, add(code, 0x20), mload(code), _salt)
+        }
+        require(instance != address(0), "!create2");
+    }
+
+    // Only meaningful in a call forwarded by one of these proxies
+    function argsOffset() internal pure returns (uint256 offset) {
+        assembly {
+            offset := sub(
+                calldatasize(),
+                add(shr(240, calldataload(sub(calldatasize(), 2))), 2)
+            )
+        }
+    }
+
+    function argAddress(uint256 _offset) internal pure returns (address arg) {
+        uint256 offset = argsOffset();
+        assembly {
+            arg := shr(96, calldataload(add(offset, _offset)))
+        }
+    }
+
+    function argBytes32(uint256 _offset) internal pure returns (bytes32 arg) {
+        uint256 offset = argsOffset();
+        assembly {
+            arg := calldataload(add(offset, _offset))
+        }
+    }
+}
@@ -0,0 +1,71 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+import {
+    SafeERC20,
+    SafeMath,
+    IERC20
+} from "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
+import "./Interfaces/venues/IExchangeVenue.sol";
+
+interface ICurvePool {
+    function get_dy(
+        int128 i,
+        int128 j,
+        uint256 dx
+    ) external view returns (uint256);
+
+    function exchange(
+        int128 i,
+        int128 j,
+        uint256 dx,
+        uint256 min_dy
+    ) external;
+}
+
+// IExchangeVenue for a Curve pool. The coins are given in pool order, older
+// pools take an int128 in coins()
+contract CurveVenue is IExchangeVenue {
+    using SafeERC20 for IERC20;
+    using SafeMath for uint256;
+
+    ICurvePool public immutable pool;
+    // coin => index + 1, 0 if the pool does not have it
+    mapping(address => uint256) internal coinIndexes;
+
+    constructor(address _pool, address[] memory _coins) public {
+        pool = ICurvePool(_pool);
+        for (uint256 i = 0; i < _coins.length; i++) {
+            coinIndexes[_coins[i]] = i + 1;
+            IERC20(_coins[i]).safeApprove(_pool, type(uint256).max);
+        }
+    }
+
+    function quote(
+        address _from,
+        address _to,
+        uint256 _amount
+    ) external view override returns (uint256) {
+        return pool.get_dy(_index(_from), _index(_to), _amount);
+    }
+
+    function exchange(
+        address _from,
+        address _to,
+        uint256 _amount,
+        uint256 _minAmountOut,
+        address _recipient
+    ) external override returns (uint256 amountOut) {
+        IERC20(_from).safeTransferFrom(msg.sender, address(this), _amount);
+        uint256 balanceBefore = IERC20(_to).balanceOf(address(this));
+        pool.exchange(_index(_from), _index(_to), _amount, _minAmountOut);
+        amountOut = IERC20(_to).balanceOf(address(this)).sub(balanceBefore);
+        IERC20(_to).safeTransfer(_recipient, amountOut);
+    }
+
+    function _index(address _coin) internal view returns (int128) {
+        uint256 index = coinIndexes[_coin];
+        require(index > 0, "!coin");
+        return int128(index - 1);
+    }
+}
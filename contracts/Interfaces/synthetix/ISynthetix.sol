@@ -1,6 +1,8 @@
 // SPDX-License-Identifier: MIT
 pragma solidity 0.6.12;
 
+import "./IVirtualSynth.sol";
+
 // https://docs.synthetix.io/contracts/source/interfaces/isynthetix
 interface ISynthetix {
     // Views
@@ -101,6 +103,13 @@ interface ISynthetix {
         bytes32 trackingCode
     ) external returns (uint256 amountReceived);
 
+    function exchangeWithVirtual(
+        bytes32 sourceCurrencyKey,
+        uint256 sourceAmount,
+        bytes32 destinationCurrencyKey,
+        bytes32 trackingCode
+    ) external returns (uint256 amountReceived, IVirtualSynth vSynth);
+
     function issueMaxSynths() external;
 
     function issueMaxSynthsOnBehalf(address issueForAddress) external;
@@ -0,0 +1,21 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+// Atomic exchange venue quoted against Synthetix by the Synthetix mixin.
+// exchange pulls _amount of _from from the caller (approved beforehand) and
+// sends at least _minAmountOut of _to to _recipient
+interface IExchangeVenue {
+    function quote(
+        address _from,
+        address _to,
+        uint256 _amount
+    ) external view returns (uint256 amountOut);
+
+    function exchange(
+        address _from,
+        address _to,
+        uint256 _amount,
+        uint256 _minAmountOut,
+        address _recipient
+    ) external returns (uint256 amountOut);
+}
@@ -0,0 +1,164 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+pragma experimental ABIEncoderV2;
+
+import "./RouterStrategy.sol";
+import "./SynthetixRouterStrategy.sol";
+import "./ClonesWithImmutableArgs.sol";
+
+// Deploys router clones with CREATE2 so their address is known in advance.
+// The salt is derived from (vault, yVault, synth), synth is 0 for plain routers.
+contract RouterFactory {
+    address public immutable routerOriginal;
+    address public immutable synthetixRouterOriginal;
+
+    address public governance;
+    address public pendingGovernance;
+
+    struct RouterParams {
+        address vault;
+        address strategist;
+        address rewards;
+        address keeper;
+        address yVault;
+        string strategyName;
+        bytes32 synth; // 0 for a RouterStrategy
+        uint256 susdBuffer; // only used for a SynthetixRouterStrategy
+    }
+
+    event Cloned(address indexed clone);
+    event UpdatedGovernance(address governance);
+
+    modifier onlyGovernance() {
+        require(msg.sender == governance, "!authorized");
+        _;
+    }
+
+    constructor(address _routerOriginal, address _synthetixRouterOriginal)
+        public
+    {
+        routerOriginal = _routerOriginal;
+        synthetixRouterOriginal = _synthetixRouterOriginal;
+        governance = msg.sender;
+    }
+
+    function setGovernance(address _governance) external onlyGovernance {
+        pendingGovernance = _governance;
+    }
+
+    function acceptGovernance() external {
+        require(msg.sender == pendingGovernance, "!authorized");
+        governance = pendingGovernance;
+        emit UpdatedGovernance(governance);
+    }
+
+    function getSalt(
+        address _vault,
+        address _yVault,
+        bytes32 _synth
+    ) public pure returns (bytes32) {
+        return keccak256(abi.encode(_vault, _yVault, _synth));
+    }
+
+    function predictRouterAddress(
+        address _vault,
+        address _yVault,
+        bytes32 _synth
+    ) public view returns (address) {
+        bytes32 codeHash = keccak256(_cloneCode(_yVault, _synth));
+        return
+            address(
+                uint160(
+                    uint256(
+                        keccak256(
+                            abi.encodePacked(
+                                bytes1(0xff),
+                                address(this),
+                                getSalt(_vault, _yVault, _synth),
+                                codeHash
+                            )
+                        )
+                    )
+                )
+            );
+    }
+
+    function deployRouter(RouterParams calldata _params)
+        external
+        onlyGovernance
+        returns (address newStrategy)
+    {
+        return _deployRouter(_params);
+    }
+
+    function deployRouters(RouterParams[] calldata _params)
+        external
+        onlyGovernance
+        returns (address[] memory newStrategies)
+    {
+        newStrategies = new address[](_params.length);
+        for (uint256 i = 0; i < _params.length; i++) {
+            newStrategies[i] = _deployRouter(_params[i]);
+        }
+    }
+
+    function _deployRouter(RouterParams memory _params)
+        internal
+        returns (address newStrategy)
+    {
+        address original = _original(_params.synth);
+        newStrategy = ClonesWithImmutableArgs.cloneDeterministic(
+            original,
+            RouterStrategy(original).immutableArgs(
+                _params.yVault,
+                _params.synth
+            ),
+            getSalt(_params.vault, _params.yVault, _params.synth)
+        );
+
+        if (_params.synth == 0) {
+            RouterStrategy(newStrategy).initialize(
+                _params.vault,
+                _params.strategist,
+                _params.rewards,
+                _params.keeper,
+                _params.yVault,
+                _params.strategyName
+            );
+        } else {
+            SynthetixRouterStrategy(newStrategy).initialize(
+                _params.vault,
+                _params.strategist,
+                _params.rewards,
+                _params.keeper,
+                _params.yVault,
+                _params.strategyName,
+                _params.synth,
+                _params.susdBuffer
+            );
+        }
+
+        emit Cloned(newStrategy);
+    }
+
+    function _original(bytes32 _synth) internal view returns (address) {
+        address original =
+            _synth == 0 ? routerOriginal : synthetixRouterOriginal;
+        require(original != address(0), "!original");
+        return original;
+    }
+
+    // Same proxy as RouterStrategy.cloneRouter, with the route arguments
+    function _cloneCode(address _yVault, bytes32 _synth)
+        internal
+        view
+        returns (bytes memory)
+    {
+        address original = _original(_synth);
+        return
+            ClonesWithImmutableArgs.cloneCode(
+                original,
+                RouterStrategy(original).immutableArgs(_yVault, _synth)
+            );
+    }
+}
@@ -0,0 +1,147 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+pragma experimental ABIEncoderV2;
+
+import {
+    StrategyParams,
+    VaultAPI
+} from "@yearnvaults/contracts/BaseStrategy.sol";
+import "@openzeppelin/contracts/utils/Address.sol";
+
+interface IRouter {
+    function vault() external view returns (address);
+
+    function yVault() external view returns (address);
+
+    function maxLoss() external view returns (uint256);
+
+    function estimatedTotalAssets() external view returns (uint256);
+
+    function valueOfInvestment() external view returns (uint256);
+
+    function balanceOfWant() external view returns (uint256);
+}
+
+interface ISynthRouter {
+    function susdBuffer() external view returns (uint256);
+
+    function balanceOfSynth() external view returns (uint256);
+
+    function isWaitingPeriodFinished() external view returns (bool);
+}
+
+// Reads the state of many routers in a single eth_call. Not meant to be
+// called on-chain.
+contract RouterLens {
+    struct RouterState {
+        address strategy;
+        address vault;
+        address yVault;
+        bool isRouter; // false for addresses that are not routers
+        // false if a read of a router reverted, the other fields of the
+        // entry are then incomplete
+        bool valid;
+        bool isSynth;
+        bool waitingPeriodFinished;
+        uint256 estimatedTotalAssets;
+        uint256 valueOfInvestment;
+        uint256 balanceOfWant;
+        uint256 balanceOfSynth;
+        uint256 susdBuffer;
+        uint256 maxLoss;
+        uint256 debtRatio;
+        uint256 totalDebt;
+        uint256 lastReport;
+    }
+
+    function getStates(address[] calldata _strategies)
+        external
+        view
+        returns (RouterState[] memory states)
+    {
+        states = new RouterState[](_strategies.length);
+        for (uint256 i = 0; i < _strategies.length; i++) {
+            states[i] = getState(_strategies[i]);
+        }
+    }
+
+    function getState(address _strategy)
+        public
+        view
+        returns (RouterState memory state)
+    {
+        state.strategy = _strategy;
+        if (!Address.isContract(_strategy)) {
+            return state;
+        }
+        IRouter router = IRouter(_strategy);
+        try router.yVault() returns (address _yVault) {
+            state.yVault = _yVault;
+        } catch {
+            return state;
+        }
+
+        state.isRouter = true;
+        state.valid = true;
+        // a router whose reads revert (e.g. a paused yVault) must not
+        // revert the read of the whole page
+        try router.vault() returns (address _vault) {
+            state.vault = _vault;
+        } catch {
+            state.valid = false;
+        }
+        try router.maxLoss() returns (uint256 _maxLoss) {
+            state.maxLoss = _maxLoss;
+        } catch {
+            state.valid = false;
+        }
+        try router.estimatedTotalAssets() returns (uint256 _assets) {
+            state.estimatedTotalAssets = _assets;
+        } catch {
+            state.valid = false;
+        }
+        try router.valueOfInvestment() returns (uint256 _value) {
+            state.valueOfInvestment = _value;
+        } catch {
+            state.valid = false;
+        }
+        try router.balanceOfWant() returns (uint256 _balance) {
+            state.balanceOfWant = _balance;
+        } catch {
+            state.valid = false;
+        }
+
+        // calls to an address without code can't be caught
+        if (Address.isContract(state.vault)) {
+            try VaultAPI(state.vault).strategies(_strategy) returns (
+                StrategyParams memory params
+            ) {
+                state.debtRatio = params.debtRatio;
+                state.totalDebt = params.totalDebt;
+                state.lastReport = params.lastReport;
+            } catch {
+                state.valid = false;
+            }
+        } else {
+            state.valid = false;
+        }
+
+        ISynthRouter synthRouter = ISynthRouter(_strategy);
+        try synthRouter.susdBuffer() returns (uint256 _susdBuffer) {
+            state.isSynth = true;
+            state.susdBuffer = _susdBuffer;
+        } catch {
+            return state;
+        }
+        try synthRouter.balanceOfSynth() returns (uint256 _balance) {
+            state.balanceOfSynth = _balance;
+        } catch {
+            state.valid = false;
+        }
+        try synthRouter.isWaitingPeriodFinished() returns (bool _finished) {
+            state.waitingPeriodFinished = _finished;
+        } catch {
+            state.valid = false;
+        }
+    }
+}
@@ -3,7 +3,12 @@
 pragma solidity 0.6.12;
 pragma experimental ABIEncoderV2;
 
-import {BaseStrategy} from "@yearnvaults/contracts/BaseStrategy.sol";
+import {
+    BaseStrategy,
+    HealthCheck,
+    StrategyParams
+} from "@yearnvaults/contracts/BaseStrategy.sol";
+import "./CachedHarvestTrigger.sol";
 import {
     SafeERC20,
     SafeMath,
@@ -11,6 +16,8 @@ import {
     Address
 } from "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
 import "@openzeppelin/contracts/math/Math.sol";
+import "@openzeppelin/contracts/utils/SafeCast.sol";
+import "./ClonesWithImmutableArgs.sol";
 
 interface IVault is IERC20 {
     function token() external view returns (address);
@@ -19,8 +26,12 @@ interface IVault is IERC20 {
 
     function deposit() external;
 
+    function deposit(uint256 amount) external returns (uint256);
+
     function pricePerShare() external view returns (uint256);
 
+    function availableDepositLimit() external view returns (uint256);
+
     function withdraw(
         uint256 amount,
         address account,
@@ -28,25 +39,70 @@ interface IVault is IERC20 {
     ) external returns (uint256);
 }
 
-contract RouterStrategy is BaseStrategy {
+contract RouterStrategy is CachedHarvestTrigger {
     using SafeERC20 for IERC20;
     using Address for address;
     using SafeMath for uint256;
 
+    uint256 internal constant DENOMINATOR = 10_000;
+
+    // Clones are ClonesWithImmutableArgs proxies of the original. The fixed
+    // route parameters (see immutableArgs) are appended to their code and
+    // only the original keeps them in storage. Not readable during creation,
+    // constructor paths must not reach yVault() or other argument getters
+    address internal immutable ORIGINAL;
+
     string internal strategyName;
-    IVault public yVault;
-    uint256 public maxLoss;
-    bool internal isOriginal = true;
+
+    // The configuration read by every harvest shares one slot
+    IVault internal storedYVault; // only set in the original, see yVault()
+    uint16 public maxLoss;
+    // Share of the vault credit (in bps) counted as harvest reward in harvestTrigger
+    uint16 public creditFactor;
+    // Netted harvests: adjustPosition keeps profitReserveFactor (bps) of the
+    // last harvest profit loose, so the next profit is paid without a yVault
+    // withdraw and only the net amount goes into the yVault. 0 disables it
+    uint32 public profitReserveFactor;
+
+    // only read and written while profitReserveFactor > 0
+    uint128 public lastHarvestProfit;
+
+    // Snapshot of the position, read once and passed through the harvest
+    // so the same external values are not fetched several times.
+    struct Position {
+        uint256 totalDebt; // only filled in prepareReturn
+        uint256 looseWant;
+        uint256 yShares;
+        uint256 pricePerShare;
+        uint256 yUnit; // 10 ** yVault.decimals()
+    }
+
+    // What harvest() would do, see previewHarvest
+    struct HarvestPreview {
+        uint256 profit;
+        uint256 loss;
+        uint256 debtPayment;
+        uint256 credit; // want the vault sends with the report
+        bool deposit; // adjustPosition deposits in the yVault
+        bool exchange; // adjustPosition exchanges sUSD to synth
+        bool refillBuffer; // adjustPosition sells synth for the sUSD buffer
+        bool healthCheckPassed; // also true when harvest skips the check
+        string revertReason; // empty when the harvest goes through
+    }
 
     constructor(
         address _vault,
         address _yVault,
         string memory _strategyName
     ) public BaseStrategy(_vault) {
+        ORIGINAL = address(this);
+        storedYVault = IVault(_yVault);
         _initializeThis(_yVault, _strategyName);
     }
 
     event Cloned(address indexed clone);
+    event UpdatedCreditFactor(uint256 creditFactor);
+    event UpdatedProfitReserveFactor(uint256 profitReserveFactor);
 
     function cloneRouter(
         address _vault,
@@ -56,23 +112,11 @@ contract RouterStrategy is BaseStrategy {
         address _yVault,
         string memory _strategyName
     ) external virtual returns (address newStrategy) {
-        require(isOriginal);
-        // Copied from https://github.com/optionality/clone-factory/blob/master/contracts/CloneFactory.sol
-        bytes20 addressBytes = bytes20(address(this));
-        assembly {
-            // EIP-1167 bytecode
-            let clone_code := mload(0x40)
-            mstore(
-                clone_code,
-                0x3d602d80600a3d3981f3363d3d373d3d3d363d73000000000000000000000000
-            )
-            mstore(add(clone_code, 0x14), addressBytes)
-            mstore(
-                add(clone_code, 0x28),
-                0x5af43d82803e903d91602b57fd5bf30000000000000000000000000000000000
-            )
-            newStrategy := create(0, clone_code, 0x37)
-        }
+        require(address(this) == ORIGINAL);
+        newStrategy = ClonesWithImmutableArgs.clone(
+            address(this),
+            immutableArgs(_yVault, 0)
+        );
 
         RouterStrategy(newStrategy).initialize(
             _vault,
@@ -86,6 +130,18 @@ contract RouterStrategy is BaseStrategy {
         emit Cloned(newStrategy);
     }
 
+    // Arguments appended to a clone of this original, _synth is 0 for a
+    // RouterStrategy
+    function immutableArgs(address _yVault, bytes32 _synth)
+        public
+        view
+        virtual
+        returns (bytes memory)
+    {
+        require(_synth == 0, "!synth");
+        return abi.encodePacked(_yVault);
+    }
+
     function initialize(
         address _vault,
         address _strategist,
@@ -95,15 +151,28 @@ contract RouterStrategy is BaseStrategy {
         string memory _strategyName
     ) public {
         _initialize(_vault, _strategist, _rewards, _keeper);
-        require(address(yVault) == address(0));
+        require(_yVault == address(yVault()), "!yVault");
         _initializeThis(_yVault, _strategyName);
     }
 
     function _initializeThis(address _yVault, string memory _strategyName)
         internal
     {
-        yVault = IVault(_yVault);
         strategyName = _strategyName;
+        creditFactor = uint16(DENOMINATOR);
+        _initializeEthToWantCache();
+        // granted once, deposits do not check the allowance
+        IERC20(IVault(_yVault).token()).safeApprove(
+            _yVault,
+            type(uint256).max
+        );
+    }
+
+    function yVault() public view returns (IVault) {
+        if (address(this) == ORIGINAL) {
+            return storedYVault;
+        }
+        return IVault(ClonesWithImmutableArgs.argAddress(0));
     }
 
     function name() external view override returns (string memory) {
@@ -134,36 +203,46 @@ contract RouterStrategy is BaseStrategy {
             uint256 _debtPayment
         )
     {
-        uint256 _totalDebt = vault.strategies(address(this)).totalDebt;
-        uint256 _totalAsset = estimatedTotalAssets();
+        Position memory _pos = _position();
+        _pos.totalDebt = vault.strategies(address(this)).totalDebt;
+        uint256 _totalAsset = _pos.looseWant.add(_valueOfShares(_pos));
 
         // Estimate the profit we have so far
-        if (_totalDebt <= _totalAsset) {
-            _profit = _totalAsset.sub(_totalDebt);
+        if (_pos.totalDebt <= _totalAsset) {
+            _profit = _totalAsset.sub(_pos.totalDebt);
         }
 
         // We take profit and debt
         uint256 _amountFreed;
-        (_amountFreed, _loss) = liquidatePosition(
-            _debtOutstanding.add(_profit)
+        (_amountFreed, _loss) = _liquidatePosition(
+            _debtOutstanding.add(_profit),
+            _pos
         );
         _debtPayment = Math.min(_debtOutstanding, _amountFreed);
+        (_profit, _loss) = _netProfitAndLoss(_profit, _loss);
 
+        if (profitReserveFactor > 0) {
+            lastHarvestProfit = SafeCast.toUint128(_profit);
+        }
+    }
+
+    function _netProfitAndLoss(uint256 _profit, uint256 _loss)
+        internal
+        pure
+        returns (uint256, uint256)
+    {
         if (_loss > _profit) {
             // Example:
             // debtOutstanding 100, profit 40, _amountFreed 100, _loss 50
             // loss should be 10, (50-40)
             // profit should endup in 0
-            _loss = _loss.sub(_profit);
-            _profit = 0;
-        } else {
-            // Example:
-            // debtOutstanding 100, profit 50, _amountFreed 140, _loss 10
-            // _profit should be 40, (50 profit - 10 loss)
-            // loss should end up in be 0
-            _profit = _profit.sub(_loss);
-            _loss = 0;
+            return (0, _loss.sub(_profit));
         }
+        // Example:
+        // debtOutstanding 100, profit 50, _amountFreed 140, _loss 10
+        // _profit should be 40, (50 profit - 10 loss)
+        // loss should end up in be 0
+        return (_profit.sub(_loss), 0);
     }
 
     function adjustPosition(uint256 _debtOutstanding)
@@ -174,29 +253,189 @@ contract RouterStrategy is BaseStrategy {
         if (emergencyExit) {
             return;
         }
+        _updateEthToWantCache();
 
         uint256 balance = balanceOfWant();
-        if (balance > 0) {
-            _checkAllowance(address(yVault), address(want), balance);
-            yVault.deposit();
+        uint256 reserve = _profitReserve(lastHarvestProfit);
+        if (balance > reserve) {
+            if (reserve == 0) {
+                yVault().deposit();
+            } else {
+                yVault().deposit(balance.sub(reserve));
+            }
+        }
+    }
+
+    function _profitReserve(uint256 _lastHarvestProfit)
+        internal
+        view
+        returns (uint256)
+    {
+        uint256 _profitReserveFactor = profitReserveFactor;
+        if (_profitReserveFactor == 0) {
+            return 0;
+        }
+        return _lastHarvestProfit.mul(_profitReserveFactor).div(DENOMINATOR);
+    }
+
+    // Projection of harvest() from the current state, for keepers to skip
+    // harvests that would revert or do nothing. yVault withdrawals are
+    // assumed to pay pricePerShare and the credit is the current one
+    function previewHarvest()
+        external
+        view
+        returns (HarvestPreview memory _preview)
+    {
+        uint256 _debtOutstanding = vault.debtOutstanding();
+        uint256 _looseWant;
+        if (emergencyExit) {
+            uint256 _amountFreed;
+            (
+                _amountFreed,
+                _looseWant,
+                _preview.revertReason
+            ) = _previewLiquidateAllPositions();
+            if (bytes(_preview.revertReason).length > 0) {
+                return _preview;
+            }
+            // same as BaseStrategy.harvest
+            if (_amountFreed < _debtOutstanding) {
+                _preview.loss = _debtOutstanding.sub(_amountFreed);
+            } else if (_amountFreed > _debtOutstanding) {
+                _preview.profit = _amountFreed.sub(_debtOutstanding);
+            }
+            _preview.debtPayment = _debtOutstanding.sub(_preview.loss);
+        } else {
+            _looseWant = _previewPrepareReturn(_debtOutstanding, _preview);
+        }
+
+        _preview.credit = vault.creditAvailable();
+        _previewReport(_preview, _looseWant);
+        if (bytes(_preview.revertReason).length > 0) {
+            return _preview;
+        }
+        _previewHealthCheck(_preview, _debtOutstanding);
+        if (bytes(_preview.revertReason).length > 0 || emergencyExit) {
+            return _preview;
+        }
+        _previewAdjustPosition(
+            _preview,
+            _looseWant.add(_preview.credit).sub(
+                _preview.profit.add(_preview.debtPayment)
+            )
+        );
+    }
+
+    // Fills profit, loss and debtPayment, returns the loose want afterwards
+    function _previewPrepareReturn(
+        uint256 _debtOutstanding,
+        HarvestPreview memory _preview
+    ) internal view virtual returns (uint256 _looseWant) {
+        Position memory _pos = _position();
+        _pos.totalDebt = vault.strategies(address(this)).totalDebt;
+        uint256 _totalAsset = _pos.looseWant.add(_valueOfShares(_pos));
+        uint256 _profit =
+            _totalAsset > _pos.totalDebt ? _totalAsset.sub(_pos.totalDebt) : 0;
+
+        uint256 _amountNeeded = _debtOutstanding.add(_profit);
+        uint256 _loss;
+        _looseWant = _pos.looseWant;
+        if (_looseWant < _amountNeeded) {
+            _looseWant = Math.min(_amountNeeded, _totalAsset);
+            _loss = _amountNeeded.sub(_looseWant);
+        }
+        _preview.debtPayment = Math.min(
+            _debtOutstanding,
+            Math.min(_amountNeeded, _looseWant)
+        );
+        (_preview.profit, _preview.loss) = _netProfitAndLoss(_profit, _loss);
+    }
+
+    function _previewLiquidateAllPositions()
+        internal
+        view
+        virtual
+        returns (
+            uint256 _amountFreed,
+            uint256 _looseWant,
+            string memory _revertReason
+        )
+    {
+        _amountFreed = valueOfInvestment();
+        _looseWant = balanceOfWant().add(_amountFreed);
+    }
+
+    // The vault takes profit + debtPayment (less the credit) from the strategy
+    function _previewReport(HarvestPreview memory _preview, uint256 _looseWant)
+        internal
+        view
+        virtual
+    {
+        if (_looseWant < _preview.profit.add(_preview.debtPayment)) {
+            _preview.revertReason = "!balance";
+        }
+    }
+
+    // Same check as the end of BaseStrategy.harvest. The debt outstanding
+    // after the report is taken as the current one less what the report
+    // repays
+    function _previewHealthCheck(
+        HarvestPreview memory _preview,
+        uint256 _debtOutstanding
+    ) internal view {
+        _preview.healthCheckPassed = true;
+        if (!doHealthCheck || healthCheck == address(0)) {
+            return;
+        }
+
+        uint256 _repaid = _preview.loss.add(_preview.debtPayment);
+        _preview.healthCheckPassed = HealthCheck(healthCheck).check(
+            _preview.profit,
+            _preview.loss,
+            _preview.debtPayment,
+            _debtOutstanding > _repaid ? _debtOutstanding - _repaid : 0,
+            vault.strategies(address(this)).totalDebt
+        );
+        if (!_preview.healthCheckPassed) {
+            _preview.revertReason = "!healthcheck";
         }
     }
 
+    function _previewAdjustPosition(
+        HarvestPreview memory _preview,
+        uint256 _looseWant
+    ) internal view virtual {
+        _preview.deposit = _looseWant > _profitReserve(_preview.profit);
+    }
+
     function liquidatePosition(uint256 _amountNeeded)
         internal
         virtual
         override
         returns (uint256 _liquidatedAmount, uint256 _loss)
     {
-        uint256 balance = balanceOfWant();
-        if (balance >= _amountNeeded) {
+        Position memory _pos;
+        _pos.looseWant = balanceOfWant();
+        if (_pos.looseWant >= _amountNeeded) {
             return (_amountNeeded, 0);
         }
 
-        uint256 toWithdraw = _amountNeeded.sub(balance);
-        _withdrawFromYVault(toWithdraw);
+        _loadInvestment(_pos);
+        return _liquidatePosition(_amountNeeded, _pos);
+    }
+
+    function _liquidatePosition(uint256 _amountNeeded, Position memory _pos)
+        internal
+        returns (uint256 _liquidatedAmount, uint256 _loss)
+    {
+        if (_pos.looseWant >= _amountNeeded) {
+            return (_amountNeeded, 0);
+        }
+
+        uint256 toWithdraw = _amountNeeded.sub(_pos.looseWant);
+        uint256 looseWant =
+            _pos.looseWant.add(_withdrawFromYVault(toWithdraw, _pos));
 
-        uint256 looseWant = balanceOfWant();
         if (_amountNeeded > looseWant) {
             _liquidatedAmount = looseWant;
             _loss = _amountNeeded.sub(looseWant);
@@ -205,20 +444,53 @@ contract RouterStrategy is BaseStrategy {
         }
     }
 
-    function _withdrawFromYVault(uint256 _amount) internal {
+    function _withdrawFromYVault(uint256 _amount) internal returns (uint256) {
         if (_amount == 0) {
-            return;
+            return 0;
         }
 
-        uint256 _balanceOfYShares = yVault.balanceOf(address(this));
-        uint256 sharesToWithdraw =
-            Math.min(_investmentTokenToYShares(_amount), _balanceOfYShares);
+        Position memory _pos;
+        _loadInvestment(_pos);
+        return _withdrawFromYVault(_amount, _pos);
+    }
 
-        if (sharesToWithdraw == 0) {
-            return;
+    // Returns the amount of yVault tokens received, at least _amount unless
+    // the shares run out
+    function _withdrawFromYVault(uint256 _amount, Position memory _pos)
+        internal
+        returns (uint256 _received)
+    {
+        if (_amount == 0) {
+            return 0;
         }
 
-        yVault.withdraw(sharesToWithdraw, address(this), maxLoss);
+        _received = _withdrawShares(
+            _investmentTokenToYShares(_amount, _pos),
+            _pos
+        );
+        if (_received < _amount && _pos.yShares > 0) {
+            // the yVault paid less than pricePerShare said (e.g. a loss in
+            // its withdrawal queue), withdraw the shortfall once more
+            _received = _received.add(
+                _withdrawShares(
+                    _investmentTokenToYShares(_amount.sub(_received), _pos),
+                    _pos
+                )
+            );
+        }
+    }
+
+    function _withdrawShares(uint256 _shares, Position memory _pos)
+        internal
+        returns (uint256)
+    {
+        _shares = Math.min(_shares, _pos.yShares);
+        if (_shares == 0) {
+            return 0;
+        }
+
+        _pos.yShares = _pos.yShares.sub(_shares);
+        return yVault().withdraw(_shares, address(this), maxLoss);
     }
 
     function liquidateAllPositions()
@@ -227,18 +499,22 @@ contract RouterStrategy is BaseStrategy {
         override
         returns (uint256 _amountFreed)
     {
+        IVault _yVault = yVault();
         return
-            yVault.withdraw(
-                yVault.balanceOf(address(this)),
+            _yVault.withdraw(
+                _yVault.balanceOf(address(this)),
                 address(this),
                 maxLoss
             );
     }
 
     function prepareMigration(address _newStrategy) internal virtual override {
-        IERC20(yVault).safeTransfer(
+        // the new strategy approves the yVault in its own initialize
+        IVault _yVault = yVault();
+        IERC20(_yVault.token()).safeApprove(address(_yVault), 0);
+        IERC20(_yVault).safeTransfer(
             _newStrategy,
-            IERC20(yVault).balanceOf(address(this))
+            _yVault.balanceOf(address(this))
         );
     }
 
@@ -249,50 +525,74 @@ contract RouterStrategy is BaseStrategy {
         returns (address[] memory ret)
     {
         ret = new address[](1);
-        ret[0] = address(yVault);
+        ret[0] = address(yVault());
     }
 
-    function ethToWant(uint256 _amtInWei)
-        public
-        view
+    function setMaxLoss(uint256 _maxLoss) public onlyVaultManagers {
+        maxLoss = SafeCast.toUint16(_maxLoss);
+    }
+
+    function setProfitReserveFactor(uint256 _profitReserveFactor)
+        external
         virtual
-        override
-        returns (uint256)
+        onlyVaultManagers
     {
-        return _amtInWei;
+        require(_profitReserveFactor <= DENOMINATOR, "!too high");
+        profitReserveFactor = uint32(_profitReserveFactor);
+        emit UpdatedProfitReserveFactor(_profitReserveFactor);
     }
 
-    function setMaxLoss(uint256 _maxLoss) public onlyVaultManagers {
-        maxLoss = _maxLoss;
+    function setCreditFactor(uint256 _creditFactor) external onlyAuthorized {
+        require(_creditFactor <= DENOMINATOR, "!too high");
+        creditFactor = uint16(_creditFactor);
+        emit UpdatedCreditFactor(_creditFactor);
     }
 
-    function _checkAllowance(
-        address _contract,
-        address _token,
-        uint256 _amount
-    ) internal {
-        if (IERC20(_token).allowance(address(this), _contract) < _amount) {
-            IERC20(_token).safeApprove(_contract, 0);
-            IERC20(_token).safeApprove(_contract, type(uint256).max);
-        }
+    // The credit is weighted by creditFactor
+    function _harvestCredit() internal view override returns (uint256) {
+        return super._harvestCredit().mul(creditFactor).div(DENOMINATOR);
     }
 
     function balanceOfWant() public view returns (uint256) {
         return want.balanceOf(address(this));
     }
 
-    function _investmentTokenToYShares(uint256 amount)
+    // Rounded up, so the shares are worth at least amount
+    function _investmentTokenToYShares(uint256 amount, Position memory _pos)
         internal
-        view
+        pure
         returns (uint256)
     {
-        return amount.mul(10**yVault.decimals()).div(yVault.pricePerShare());
+        return
+            amount.mul(_pos.yUnit).add(_pos.pricePerShare).sub(1).div(
+                _pos.pricePerShare
+            );
     }
 
     function valueOfInvestment() public view virtual returns (uint256) {
-        return
-            yVault.balanceOf(address(this)).mul(yVault.pricePerShare()).div(
-                10**yVault.decimals()
-            );
+        Position memory _pos;
+        _loadInvestment(_pos);
+        return _valueOfShares(_pos);
+    }
+
+    function _position() internal view returns (Position memory _pos) {
+        _pos.looseWant = balanceOfWant();
+        _loadInvestment(_pos);
+    }
+
+    function _loadInvestment(Position memory _pos) internal view {
+        IVault _yVault = yVault();
+        _pos.yShares = _yVault.balanceOf(address(this));
+        _pos.pricePerShare = _yVault.pricePerShare();
+        _pos.yUnit = 10**_yVault.decimals();
+    }
+
+    // Value of the yVault shares held, in yVault tokens
+    function _valueOfShares(Position memory _pos)
+        internal
+        pure
+        returns (uint256)
+    {
+        return _pos.yShares.mul(_pos.pricePerShare).div(_pos.yUnit);
     }
 }
@@ -4,6 +4,7 @@ pragma experimental ABIEncoderV2;
 
 import "@openzeppelin/contracts/math/SafeMath.sol";
 import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+import "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
 
 import "./Interfaces/synthetix/ISynth.sol";
 import "./Interfaces/synthetix/IReadProxy.sol";
@@ -12,13 +13,16 @@ import "./Interfaces/synthetix/IExchanger.sol";
 import "./Interfaces/synthetix/IVirtualSynth.sol";
 import "./Interfaces/synthetix/IExchangeRates.sol";
 import "./Interfaces/synthetix/IAddressResolver.sol";
+import "./Interfaces/venues/IExchangeVenue.sol";
 
 contract Synthetix {
     using SafeMath for uint256;
+    using SafeERC20 for IERC20;
 
     // ========== SYNTHETIX CONFIGURATION ==========
     bytes32 public constant sUSD = "sUSD";
-    bytes32 public synthCurrencyKey;
+    // see synthCurrencyKey() and _contractSynth()
+    bytes32 internal storedSynthCurrencyKey;
 
     bytes32 internal constant TRACKING_CODE = "YEARN";
 
@@ -27,21 +31,118 @@ contract Synthetix {
     bytes32 private constant CONTRACT_EXCHANGER = "Exchanger";
     bytes32 private constant CONTRACT_EXCHANGERATES = "ExchangeRates";
     bytes32 private constant CONTRACT_SYNTHSUSD = "ProxyERC20sUSD";
-    bytes32 private contractSynth;
+    bytes32 internal storedContractSynth;
 
     IReadProxy public constant readProxy =
         IReadProxy(0x4E3b31eB0E5CB73641EE1E65E7dCEFe520bA3ef2);
 
+    // Resolved addresses, same idea as Synthetix's MixinResolver
+    mapping(bytes32 => address) private addressCache;
+
+    // Atomic venues quoted against Synthetix on every exchange, the best net
+    // amount wins. Their quote can slip by venueSlippage (bps) at most
+    uint256 internal constant MAX_VENUES = 3;
+    uint256 internal constant MAX_VENUE_SLIPPAGE = 10_000;
+    IExchangeVenue[] public venues;
+    uint256 public venueSlippage;
+
+    event CacheUpdated(bytes32 name, address destination);
+
+    // Called from the constructor, so it must not read the synth getters
     function _initializeSynthetix(bytes32 _synth) internal {
         // sETH / sBTC / sEUR / sLINK
-        require(contractSynth == 0, "Synth already assigned.");
-        contractSynth = _synth;
-        synthCurrencyKey = ISynth(
-            IReadProxy(address(resolver().getAddress(_synth))).target()
-        )
-            .currencyKey();
+        require(storedContractSynth == 0, "Synth already assigned.");
+        storedContractSynth = _synth;
+        _rebuildCache(_synth);
+        storedSynthCurrencyKey = _currencyKeyOf(_synth);
+    }
 
-        require(synthCurrencyKey != 0x0, "!key");
+    function synthCurrencyKey() public view virtual returns (bytes32) {
+        return storedSynthCurrencyKey;
+    }
+
+    function _contractSynth() internal view virtual returns (bytes32) {
+        return storedContractSynth;
+    }
+
+    function _currencyKeyOf(bytes32 _synth) internal view returns (bytes32) {
+        address proxy = resolver().requireAndGetAddress(_synth, "!resolver");
+        bytes32 key = ISynth(IReadProxy(proxy).target()).currencyKey();
+        require(key != 0x0, "!key");
+        return key;
+    }
+
+    function resolverAddressesRequired()
+        public
+        view
+        returns (bytes32[] memory addresses)
+    {
+        return _resolverAddressesRequired(_contractSynth());
+    }
+
+    function _resolverAddressesRequired(bytes32 _synth)
+        internal
+        pure
+        returns (bytes32[] memory addresses)
+    {
+        addresses = new bytes32[](5);
+        addresses[0] = CONTRACT_SYNTHETIX;
+        addresses[1] = CONTRACT_EXCHANGER;
+        addresses[2] = CONTRACT_EXCHANGERATES;
+        addresses[3] = CONTRACT_SYNTHSUSD;
+        addresses[4] = _synth;
+    }
+
+    // Returns false if any cached address no longer matches the resolver
+    function isResolverCached() public view returns (bool) {
+        bytes32[] memory requiredAddresses = resolverAddressesRequired();
+        IAddressResolver _resolver = resolver();
+        for (uint256 i = 0; i < requiredAddresses.length; i++) {
+            bytes32 _name = requiredAddresses[i];
+            address cached = addressCache[_name];
+            if (
+                cached == address(0) || cached != _resolver.getAddress(_name)
+            ) {
+                return false;
+            }
+        }
+        return true;
+    }
+
+    function _rebuildCache(bytes32 _synth) internal {
+        bytes32[] memory requiredAddresses = _resolverAddressesRequired(_synth);
+        IAddressResolver _resolver = resolver();
+        for (uint256 i = 0; i < requiredAddresses.length; i++) {
+            bytes32 _name = requiredAddresses[i];
+            address destination =
+                _resolver.requireAndGetAddress(_name, "!resolver");
+            addressCache[_name] = destination;
+            emit CacheUpdated(_name, destination);
+        }
+    }
+
+    function _getCachedAddress(bytes32 _name) internal view returns (address) {
+        address cached = addressCache[_name];
+        require(cached != address(0), "!cached");
+        return cached;
+    }
+
+    // A synth received from an exchange can't be moved during the waiting
+    // period
+    function _isWaitingPeriodFinished(bytes32 _currencyKey)
+        internal
+        view
+        returns (bool)
+    {
+        return
+            _exchanger().maxSecsLeftInWaitingPeriod(
+                address(this),
+                _currencyKey
+            ) == 0;
+    }
+
+    function _isSUSDWaitingPeriodFinished() internal view returns (bool) {
+        return _isWaitingPeriodFinished(sUSD);
     }
 
     function _balanceOfSynth() internal view returns (uint256) {
@@ -62,7 +163,7 @@ contract Synthetix {
         }
         (amountReceived, , ) = _exchanger().getAmountsForExchange(
             _amountToSend,
-            synthCurrencyKey,
+            synthCurrencyKey(),
             sUSD
         );
     }
@@ -78,10 +179,39 @@ contract Synthetix {
         (amountReceived, , ) = _exchanger().getAmountsForExchange(
             _amountToSend,
             sUSD,
-            synthCurrencyKey
+            synthCurrencyKey()
         );
     }
 
+    // Rates and fee of one exchange direction, read once and then used to
+    // price any number of amounts
+    struct SynthPricing {
+        uint256 synthRate;
+        uint256 sUSDRate;
+        uint256 feeRate; // in base 1e18
+        bool rateInvalid;
+    }
+
+    // _toSynth selects the fee of sUSD => synth (used by _sUSDFromSynth),
+    // otherwise the fee of synth => sUSD (used by _synthFromSUSD)
+    function _synthPricing(bool _toSynth)
+        internal
+        view
+        returns (SynthPricing memory _pricing)
+    {
+        bytes32[] memory currencyKeys = new bytes32[](2);
+        currencyKeys[0] = synthCurrencyKey();
+        currencyKeys[1] = sUSD;
+        uint256[] memory rates;
+        (rates, _pricing.rateInvalid) = _exchangeRates()
+            .ratesAndInvalidForCurrencies(currencyKeys);
+        _pricing.synthRate = rates[0];
+        _pricing.sUSDRate = rates[1];
+        _pricing.feeRate = _toSynth
+            ? _exchanger().feeRateForExchange(sUSD, synthCurrencyKey())
+            : _exchanger().feeRateForExchange(synthCurrencyKey(), sUSD);
+    }
+
     function _sUSDFromSynth(uint256 _amountToReceive)
         internal
         view
@@ -90,15 +220,26 @@ contract Synthetix {
         if (_amountToReceive == 0 || _amountToReceive == type(uint256).max) {
             return _amountToReceive;
         }
-        // NOTE: the fee of the trade that would be done (sUSD => synth) in this case
-        uint256 feeRate =
-            _exchanger().feeRateForExchange(sUSD, synthCurrencyKey); // in base 1e18
+        return _sUSDFromSynth(_amountToReceive, _synthPricing(true));
+    }
+
+    function _sUSDFromSynth(
+        uint256 _amountToReceive,
+        SynthPricing memory _pricing
+    ) internal pure returns (uint256 amountToSend) {
+        if (_amountToReceive == 0 || _amountToReceive == type(uint256).max) {
+            return _amountToReceive;
+        }
+        // NOTE: _pricing.feeRate is the fee of the trade that would be done (sUSD => synth) in this case
         // formula => amountToReceive (Synth) * price (sUSD/Synth) / (1 - feeRate)
         return
-            _exchangeRates()
-                .effectiveValue(synthCurrencyKey, _amountToReceive, sUSD)
+            _effectiveValue(
+                _amountToReceive,
+                _pricing.synthRate,
+                _pricing.sUSDRate
+            )
                 .mul(1e18)
-                .div(uint256(1e18).sub(feeRate));
+                .div(uint256(1e18).sub(_pricing.feeRate));
     }
 
     function _synthFromSUSD(uint256 _amountToReceive)
@@ -109,69 +250,196 @@ contract Synthetix {
         if (_amountToReceive == 0 || _amountToReceive == type(uint256).max) {
             return _amountToReceive;
         }
-        // NOTE: the fee of the trade that would be done (synth => sUSD) in this case
-        uint256 feeRate =
-            _exchanger().feeRateForExchange(synthCurrencyKey, sUSD); // in base 1e18
+        return _synthFromSUSD(_amountToReceive, _synthPricing(false));
+    }
+
+    function _synthFromSUSD(
+        uint256 _amountToReceive,
+        SynthPricing memory _pricing
+    ) internal pure returns (uint256 amountToSend) {
+        if (_amountToReceive == 0 || _amountToReceive == type(uint256).max) {
+            return _amountToReceive;
+        }
+        // NOTE: _pricing.feeRate is the fee of the trade that would be done (synth => sUSD) in this case
         // formula => amountToReceive (sUSD) * price (Synth/sUSD) / (1 - feeRate)
         return
-            _exchangeRates()
-                .effectiveValue(sUSD, _amountToReceive, synthCurrencyKey)
+            _effectiveValue(
+                _amountToReceive,
+                _pricing.sUSDRate,
+                _pricing.synthRate
+            )
                 .mul(1e18)
-                .div(uint256(1e18).sub(feeRate));
+                .div(uint256(1e18).sub(_pricing.feeRate));
+    }
+
+    // Same rounding as ExchangeRates.effectiveValue
+    // (multiplyDecimalRound then divideDecimalRound)
+    function _effectiveValue(
+        uint256 _sourceAmount,
+        uint256 _sourceRate,
+        uint256 _destinationRate
+    ) internal pure returns (uint256) {
+        uint256 valueTimesTen = _sourceAmount.mul(_sourceRate).div(1e17);
+        uint256 value = valueTimesTen.add(5).div(10);
+        valueTimesTen = value.mul(1e19).div(_destinationRate);
+        return valueTimesTen.add(5).div(10);
     }
 
     function exchangeSynthToSUSD(uint256 amount) internal returns (uint256) {
-        if (amount == 0) {
+        return _exchangeOnBestVenue(false, amount);
+    }
+
+    function exchangeSUSDToSynth(uint256 amount) internal returns (uint256) {
+        // swap amount of sUSD for Synth
+        return _exchangeOnBestVenue(true, amount);
+    }
+
+    function _exchangeOnBestVenue(bool _toSynth, uint256 _amount)
+        internal
+        returns (uint256)
+    {
+        if (_amount == 0) {
             return 0;
         }
+        (IExchangeVenue venue, uint256 quote) = _bestVenue(_toSynth, _amount);
+        if (address(venue) != address(0)) {
+            return _exchangeOnVenue(venue, _toSynth, _amount, quote);
+        }
+        return _exchangeOnSynthetix(_toSynth, _amount);
+    }
 
+    // Starts the waiting period of the destination synth
+    function _exchangeOnSynthetix(bool _toSynth, uint256 _amount)
+        internal
+        returns (uint256)
+    {
         return
             _synthetix().exchangeWithTracking(
-                synthCurrencyKey,
-                amount,
-                sUSD,
+                _toSynth ? sUSD : synthCurrencyKey(),
+                _amount,
+                _toSynth ? synthCurrencyKey() : sUSD,
                 address(this),
                 TRACKING_CODE
             );
     }
 
-    function exchangeSUSDToSynth(uint256 amount) internal returns (uint256) {
-        // swap amount of sUSD for Synth
-        if (amount == 0) {
-            return 0;
+    // Venue paying the most, address(0) when it is Synthetix. Venues win ties
+    // since they do not start a waiting period
+    function _bestVenue(bool _toSynth, uint256 _amount)
+        internal
+        view
+        returns (IExchangeVenue bestVenue, uint256 bestQuote)
+    {
+        uint256 _venuesLength = venues.length;
+        // the source synth can't be sent to a venue during its waiting period
+        if (
+            _venuesLength == 0 ||
+            !_isWaitingPeriodFinished(_toSynth ? sUSD : synthCurrencyKey())
+        ) {
+            return (bestVenue, 0);
         }
+        bestQuote = _toSynth ? _sUSDToSynth(_amount) : _synthToSUSD(_amount);
+        (address from, address to) = _venueTokens(_toSynth);
+        for (uint256 i = 0; i < _venuesLength; i++) {
+            IExchangeVenue venue = venues[i];
+            try venue.quote(from, to, _amount) returns (uint256 _quote) {
+                if (_quote >= bestQuote) {
+                    bestQuote = _quote;
+                    bestVenue = venue;
+                }
+            } catch {}
+        }
+    }
 
-        return
-            _synthetix().exchangeWithTracking(
-                sUSD,
-                amount,
-                synthCurrencyKey,
-                address(this),
-                TRACKING_CODE
+    function _exchangeOnVenue(
+        IExchangeVenue _venue,
+        bool _toSynth,
+        uint256 _amount,
+        uint256 _quote
+    ) internal returns (uint256 amountReceived) {
+        (address from, address to) = _venueTokens(_toSynth);
+        uint256 minAmountOut =
+            _quote.mul(MAX_VENUE_SLIPPAGE.sub(venueSlippage)).div(
+                MAX_VENUE_SLIPPAGE
             );
+        uint256 balanceBefore = IERC20(to).balanceOf(address(this));
+        IERC20(from).safeApprove(address(_venue), _amount);
+        _venue.exchange(from, to, _amount, minAmountOut, address(this));
+        // safeApprove reverts on a nonzero allowance, clear what was not pulled
+        if (IERC20(from).allowance(address(this), address(_venue)) > 0) {
+            IERC20(from).safeApprove(address(_venue), 0);
+        }
+        amountReceived = IERC20(to).balanceOf(address(this)).sub(
+            balanceBefore
+        );
+        require(amountReceived >= minAmountOut, "!slippage");
+    }
+
+    function _venueTokens(bool _toSynth)
+        internal
+        view
+        returns (address from, address to)
+    {
+        from = address(_synthsUSD());
+        to = address(_synthCoin());
+        if (!_toSynth) {
+            (from, to) = (to, from);
+        }
+    }
+
+    function _setVenues(IExchangeVenue[] memory _venues) internal {
+        require(_venues.length <= MAX_VENUES, "!venues");
+        delete venues;
+        for (uint256 i = 0; i < _venues.length; i++) {
+            venues.push(_venues[i]);
+        }
+    }
+
+    function _setVenueSlippage(uint256 _venueSlippage) internal {
+        require(_venueSlippage <= MAX_VENUE_SLIPPAGE, "!too high");
+        venueSlippage = _venueSlippage;
+    }
+
+    // The synth is held by the virtual synth until it settles, so the waiting
+    // period is not on this contract
+    function exchangeSUSDToVirtualSynth(uint256 amount)
+        internal
+        returns (IVirtualSynth vSynth)
+    {
+        (, vSynth) = _synthetix().exchangeWithVirtual(
+            sUSD,
+            amount,
+            synthCurrencyKey(),
+            TRACKING_CODE
+        );
     }
 
     function resolver() internal view returns (IAddressResolver) {
-        return IAddressResolver(readProxy.target());
+        return IAddressResolver(_readProxy().target());
+    }
+
+    // Overridden by the test build to point at a local Synthetix deployment
+    function _readProxy() internal view virtual returns (IReadProxy) {
+        return readProxy;
     }
 
     function _synthCoin() internal view returns (ISynth) {
-        return ISynth(resolver().getAddress(contractSynth));
+        return ISynth(_getCachedAddress(_contractSynth()));
     }
 
     function _synthsUSD() internal view returns (ISynth) {
-        return ISynth(resolver().getAddress(CONTRACT_SYNTHSUSD));
+        return ISynth(_getCachedAddress(CONTRACT_SYNTHSUSD));
     }
 
     function _synthetix() internal view returns (ISynthetix) {
-        return ISynthetix(resolver().getAddress(CONTRACT_SYNTHETIX));
+        return ISynthetix(_getCachedAddress(CONTRACT_SYNTHETIX));
     }
 
     function _exchangeRates() internal view returns (IExchangeRates) {
-        return IExchangeRates(resolver().getAddress(CONTRACT_EXCHANGERATES));
+        return IExchangeRates(_getCachedAddress(CONTRACT_EXCHANGERATES));
     }
 
     function _exchanger() internal view returns (IExchanger) {
-        return IExchanger(resolver().getAddress(CONTRACT_EXCHANGER));
+        return IExchanger(_getCachedAddress(CONTRACT_EXCHANGER));
     }
 }
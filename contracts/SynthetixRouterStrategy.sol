@@ -5,23 +5,26 @@ pragma experimental ABIEncoderV2;
 import "./RouterStrategy.sol";
 import "./Synthetix.sol";
 
-interface IUni {
-    function getAmountsOut(uint256 amountIn, address[] calldata path)
-        external
-        view
-        returns (uint256[] memory amounts);
-}
-
 contract SynthetixRouterStrategy is RouterStrategy, Synthetix {
-    uint256 internal constant DENOMINATOR = 10_000;
     uint256 internal constant DUST_THRESHOLD = 10_000;
-    address public constant weth = 0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2;
-    address public constant uniswapRouter =
-        0x7a250d5630B4cF539739dF2C5dAcb4c659F2488D;
+    uint256 internal constant MAX_VIRTUAL_SYNTHS = 5;
 
     // This is the amount of sUSD that should not be exchanged for synth
     // Usually 100 for 1%.
-    uint256 public susdBuffer;
+    uint16 public susdBuffer;
+
+    // sUSD is exchanged into virtual synths, which settle on their own while
+    // the strategy keeps withdrawing and depositing
+    bool public useVirtualSynths;
+    // Not settled yet, at most MAX_VIRTUAL_SYNTHS
+    IVirtualSynth[] public virtualSynths;
+
+    // Position snapshot extended with the synth that is not in the yVault
+    struct SynthPosition {
+        Position base;
+        uint256 looseSynth;
+        uint256 virtualSynth;
+    }
 
     constructor(
         address _vault,
@@ -54,23 +57,11 @@ contract SynthetixRouterStrategy is RouterStrategy, Synthetix {
         bytes32 _synth,
         uint256 _susdBuffer
     ) external returns (address newStrategy) {
-        require(isOriginal);
-        // Copied from https://github.com/optionality/clone-factory/blob/master/contracts/CloneFactory.sol
-        bytes20 addressBytes = bytes20(address(this));
-        assembly {
-            // EIP-1167 bytecode
-            let clone_code := mload(0x40)
-            mstore(
-                clone_code,
-                0x3d602d80600a3d3981f3363d3d373d3d3d363d73000000000000000000000000
-            )
-            mstore(add(clone_code, 0x14), addressBytes)
-            mstore(
-                add(clone_code, 0x28),
-                0x5af43d82803e903d91602b57fd5bf30000000000000000000000000000000000
-            )
-            newStrategy := create(0, clone_code, 0x37)
-        }
+        require(address(this) == ORIGINAL);
+        newStrategy = ClonesWithImmutableArgs.clone(
+            address(this),
+            immutableArgs(_yVault, _synth)
+        );
 
         SynthetixRouterStrategy(newStrategy).initialize(
             _vault,
@@ -104,45 +95,79 @@ contract SynthetixRouterStrategy is RouterStrategy, Synthetix {
             _yVault,
             _strategyName
         );
-        _initializeSynthetixRouter(_synth, _susdBuffer);
+        // the synth and its currency key are immutable arguments
+        require(_synth == _contractSynth(), "!synth");
+        _rebuildCache(_synth);
+        _setSUSDBuffer(_susdBuffer);
     }
 
     function _initializeSynthetixRouter(bytes32 _synth, uint256 _susdBuffer)
         internal
     {
         _initializeSynthetix(_synth);
-        susdBuffer = _susdBuffer;
+        _setSUSDBuffer(_susdBuffer);
+    }
+
+    // yVault, synth and its currency key, resolved once by the original
+    function immutableArgs(address _yVault, bytes32 _synth)
+        public
+        view
+        virtual
+        override
+        returns (bytes memory)
+    {
+        require(_synth != 0, "!synth");
+        return abi.encodePacked(_yVault, _synth, _currencyKeyOf(_synth));
+    }
+
+    function synthCurrencyKey() public view override returns (bytes32) {
+        if (address(this) == ORIGINAL) {
+            return storedSynthCurrencyKey;
+        }
+        return ClonesWithImmutableArgs.argBytes32(52);
+    }
+
+    function _contractSynth() internal view override returns (bytes32) {
+        if (address(this) == ORIGINAL) {
+            return storedContractSynth;
+        }
+        return ClonesWithImmutableArgs.argBytes32(20);
     }
 
     function adjustPosition(uint256 _debtOutstanding) internal override {
         if (emergencyExit) {
             return;
         }
+        _updateEthToWantCache();
+        _settleVirtualSynths();
         uint256 looseSynth = _balanceOfSynth();
         uint256 _sUSDBalance = balanceOfWant();
 
-        // this will tell us how much we need to keep in the buffer
         uint256 totalDebt = vault.strategies(address(this)).totalDebt; // in sUSD (want)
-        uint256 buffer = totalDebt.mul(susdBuffer).div(DENOMINATOR);
-
-        uint256 _sUSDToInvest =
-            _sUSDBalance > buffer ? _sUSDBalance.sub(buffer) : 0;
-        uint256 _sUSDNeeded = _sUSDToInvest == 0 ? buffer.sub(_sUSDBalance) : 0;
+        (uint256 _sUSDToInvest, uint256 _sUSDNeeded) =
+            _bufferPlan(_sUSDBalance, totalDebt);
+        SynthPricing memory _pricing;
+        if (_sUSDToInvest > 0 || _sUSDNeeded > 0) {
+            _pricing = _synthPricing(false);
+        }
+        // an invalid rate can't price the synth and would make the exchange
+        // revert, only loose synth is deposited then
         uint256 _synthToSell =
-            _sUSDNeeded > 0 ? _synthFromSUSD(_sUSDNeeded) : 0; // amount of Synth that we need to sell to refill buffer
+            _sUSDNeeded > 0 && !_pricing.rateInvalid
+                ? _synthFromSUSD(_sUSDNeeded, _pricing)
+                : 0; // amount of Synth that we need to sell to refill buffer
 
         if (_synthToSell == 0) {
             // This will first deposit any loose synth in the vault if it not locked
             // Then will invest all available sUSD (exchanging to Synth)
-            // After this, user has to manually call depositInVault to deposit synth after settlement period
-            if (_sUSDToInvest == 0) {
-                return;
+            // After this, tend deposits the synth once the settlement period is over
+            if (looseSynth > DUST_THRESHOLD && isWaitingPeriodFinished()) {
+                _depositInVault();
             }
-            if (isWaitingPeriodFinished() && looseSynth > DUST_THRESHOLD) {
-                depositInVault();
+            if (_sUSDToInvest == 0 || _pricing.rateInvalid) {
+                return;
             }
-            exchangeSUSDToSynth(_sUSDToInvest);
-            // now the waiting period starts
+            _investSUSD(_sUSDToInvest);
         } else if (_synthToSell >= DUST_THRESHOLD) {
             // this means that we need to refill the buffer
             // we may have already some uninvested Synth so we use it
@@ -151,8 +176,46 @@ contract SynthetixRouterStrategy is RouterStrategy, Synthetix {
                 _sUSDNeeded > available ? _sUSDNeeded.sub(available) : 0;
             // this will withdraw and sell full balance of Synth (inside withdrawSomeWant)
             if (sUSDToWithdraw > 0) {
-                withdrawSomeWant(sUSDToWithdraw, true);
+                _withdrawSomeWant(
+                    sUSDToWithdraw,
+                    true,
+                    _sUSDBalance,
+                    looseSynth
+                );
+            }
+        }
+    }
+
+    // Exchanges sUSD to synth on the best venue. The synth from an atomic
+    // venue goes to the yVault right away
+    function _investSUSD(uint256 _sUSDToInvest) internal {
+        (IExchangeVenue venue, uint256 quote) = _bestVenue(true, _sUSDToInvest);
+        if (address(venue) != address(0)) {
+            _exchangeOnVenue(venue, true, _sUSDToInvest, quote);
+            if (isWaitingPeriodFinished()) {
+                _depositInVault();
             }
+        } else if (
+            useVirtualSynths && virtualSynths.length < MAX_VIRTUAL_SYNTHS
+        ) {
+            virtualSynths.push(exchangeSUSDToVirtualSynth(_sUSDToInvest));
+        } else {
+            _exchangeOnSynthetix(true, _sUSDToInvest);
+            // now the waiting period starts
+        }
+    }
+
+    // sUSD above the buffer to invest, or sUSD missing to fill it
+    function _bufferPlan(uint256 _sUSDBalance, uint256 _totalDebt)
+        internal
+        view
+        returns (uint256 _sUSDToInvest, uint256 _sUSDNeeded)
+    {
+        uint256 buffer = _totalDebt.mul(susdBuffer).div(DENOMINATOR);
+        if (_sUSDBalance > buffer) {
+            _sUSDToInvest = _sUSDBalance.sub(buffer);
+        } else {
+            _sUSDNeeded = buffer.sub(_sUSDBalance);
         }
     }
 
@@ -164,7 +227,12 @@ contract SynthetixRouterStrategy is RouterStrategy, Synthetix {
         uint256 wantBal = balanceOfWant(); // want is always sUSD
 
         if (wantBal < _amountNeeded) {
-            (_liquidatedAmount, _loss) = withdrawSomeWant(_amountNeeded, false);
+            (_liquidatedAmount, _loss) = _withdrawSomeWant(
+                _amountNeeded,
+                false,
+                wantBal,
+                0
+            );
         }
 
         _liquidatedAmount = Math.min(
@@ -174,64 +242,222 @@ contract SynthetixRouterStrategy is RouterStrategy, Synthetix {
     }
 
     function updateSUSDBuffer(uint256 _susdBuffer) public onlyVaultManagers {
+        _setSUSDBuffer(_susdBuffer);
+    }
+
+    function _setSUSDBuffer(uint256 _susdBuffer) internal {
         require(_susdBuffer <= 10_000, "!too high");
-        susdBuffer = _susdBuffer;
+        susdBuffer = uint16(_susdBuffer);
+    }
+
+    // The sUSD buffer keeps the profit loose here. adjustPosition does not
+    // read lastHarvestProfit, so a reserve factor would have no effect
+    function setProfitReserveFactor(uint256 _profitReserveFactor)
+        external
+        override
+    {
+        revert("use susdBuffer");
+    }
+
+    // Venues receive the strategy's sUSD and synth, only governance sets them
+    function setVenues(IExchangeVenue[] calldata _venues)
+        external
+        onlyGovernance
+    {
+        _setVenues(_venues);
+    }
+
+    function setVenueSlippage(uint256 _venueSlippage)
+        external
+        onlyVaultManagers
+    {
+        _setVenueSlippage(_venueSlippage);
+    }
+
+    function getVenues() external view returns (IExchangeVenue[] memory) {
+        return venues;
+    }
+
+    function setUseVirtualSynths(bool _useVirtualSynths)
+        external
+        onlyVaultManagers
+    {
+        useVirtualSynths = _useVirtualSynths;
+    }
+
+    function virtualSynthsLength() external view returns (uint256) {
+        return virtualSynths.length;
+    }
+
+    // Synth still held by the virtual synths
+    function balanceOfVirtualSynths() external view returns (uint256) {
+        return _balanceOfVirtualSynths();
+    }
+
+    function settleVirtualSynths() external onlyKeepers {
+        _settleVirtualSynths();
+    }
+
+    function _balanceOfVirtualSynths() internal view returns (uint256 total) {
+        for (uint256 i = 0; i < virtualSynths.length; i++) {
+            total = total.add(
+                virtualSynths[i].balanceOfUnderlying(address(this))
+            );
+        }
+    }
+
+    // Synth _settleVirtualSynths would receive now
+    function _balanceOfSettleableVirtualSynths()
+        internal
+        view
+        returns (uint256 total)
+    {
+        for (uint256 i = 0; i < virtualSynths.length; i++) {
+            IVirtualSynth vSynth = virtualSynths[i];
+            if (vSynth.settled() || vSynth.readyToSettle()) {
+                total = total.add(vSynth.balanceOfUnderlying(address(this)));
+            }
+        }
+    }
+
+    // Anyone can settle a virtual synth for us, those are just dropped
+    function _settleVirtualSynths() internal {
+        uint256 i = virtualSynths.length;
+        while (i > 0) {
+            i--;
+            IVirtualSynth vSynth = virtualSynths[i];
+            if (IERC20(address(vSynth)).balanceOf(address(this)) > 0) {
+                if (!vSynth.settled() && !vSynth.readyToSettle()) {
+                    continue;
+                }
+                vSynth.settle(address(this));
+            }
+            virtualSynths[i] = virtualSynths[virtualSynths.length - 1];
+            virtualSynths.pop();
+        }
+    }
+
+    // Re-resolves the Synthetix addresses, e.g. after a Synthetix release
+    function rebuildCache() external onlyKeepers {
+        _rebuildCache(_contractSynth());
+    }
+
+    function balanceOfSynth() external view returns (uint256) {
+        return _balanceOfSynth();
     }
 
     function isWaitingPeriodFinished() public view returns (bool freeToMove) {
+        return _isWaitingPeriodFinished(synthCurrencyKey());
+    }
+
+    // Investing the profit and the credit exchanges sUSD, which waits for
+    // the settlement. The report delay, debt and loss checks do not
+    function _isWorthTheCall(uint256 callCostInWei, uint256 _profit)
+        internal
+        view
+        override
+        returns (bool)
+    {
+        if (!isWaitingPeriodFinished()) {
+            return false;
+        }
+        return super._isWorthTheCall(callCostInWei, _profit);
+    }
+
+    // prepareReturn only reports the loose sUSD (the buffer) as profit
+    function _pendingProfit(uint256 _totalDebt)
+        internal
+        view
+        override
+        returns (uint256 _profit, uint256 _loss)
+    {
+        (_profit, _loss) = super._pendingProfit(_totalDebt);
+        _profit = Math.min(_profit, balanceOfWant());
+    }
+
+    // Settled synth is waiting to be deposited or a virtual synth can be
+    // settled, adjustPosition does both
+    function tendTrigger(uint256 callCostInWei)
+        public
+        view
+        override
+        returns (bool)
+    {
+        if (emergencyExit) {
+            return false;
+        }
         return
-            _exchanger().maxSecsLeftInWaitingPeriod(
-                address(this),
-                synthCurrencyKey
-            ) == 0;
+            (_balanceOfSynth() > DUST_THRESHOLD &&
+                isWaitingPeriodFinished()) ||
+            _balanceOfSettleableVirtualSynths() > 0;
     }
 
-    function depositInVault() public onlyVaultManagers {
+    function depositInVault() external onlyKeepers {
         uint256 balanceOfSynth = _balanceOfSynth();
         if (balanceOfSynth > DUST_THRESHOLD && isWaitingPeriodFinished()) {
-            _checkAllowance(
-                address(yVault),
-                address(_synthCoin()),
-                balanceOfSynth
-            );
-            yVault.deposit();
+            _depositInVault();
         }
     }
 
+    // The yVault was approved in initialize
+    function _depositInVault() internal {
+        yVault().deposit();
+    }
+
     //safe to enter more than we have
     function withdrawSomeWant(uint256 _amount, bool performExchanges)
         private
         returns (uint256 _liquidatedAmount, uint256 _loss)
     {
         if (performExchanges) {
-            // we exchange synths to susd
-            uint256 synthBalanceBefore = _balanceOfSynth();
-            uint256 sUSDBalanceBefore = balanceOfWant();
+            _settleVirtualSynths();
+        }
+        return
+            _withdrawSomeWant(
+                _amount,
+                performExchanges,
+                balanceOfWant(),
+                performExchanges ? _balanceOfSynth() : 0
+            );
+    }
 
-            if (sUSDBalanceBefore < _amount) {
-                uint256 _newAmount = _amount.sub(sUSDBalanceBefore);
+    function _withdrawSomeWant(
+        uint256 _amount,
+        bool performExchanges,
+        uint256 sUSDBalanceBefore,
+        uint256 synthBalanceBefore
+    ) private returns (uint256 _liquidatedAmount, uint256 _loss) {
+        uint256 totalAssets = sUSDBalanceBefore;
 
-                uint256 _synthAmount = _synthFromSUSD(_newAmount);
-                if (isWaitingPeriodFinished()) {
-                    if (_synthAmount <= synthBalanceBefore) {
-                        exchangeSynthToSUSD(_synthAmount);
-                        return (_amount, 0);
-                    }
+        if (performExchanges && sUSDBalanceBefore < _amount) {
+            // we exchange synths to susd
+            uint256 _newAmount = _amount.sub(sUSDBalanceBefore);
 
-                    _synthAmount = _synthAmount.sub(synthBalanceBefore);
-                }
-                _withdrawFromYVault(_synthAmount);
-                uint256 newBalanceOfSynth = _balanceOfSynth();
-                if (
-                    newBalanceOfSynth > DUST_THRESHOLD &&
-                    isWaitingPeriodFinished()
-                ) {
-                    exchangeSynthToSUSD(newBalanceOfSynth);
+            SynthPricing memory _pricing = _synthPricing(false);
+            // an invalid rate can't price the synth to withdraw and would
+            // make the exchange revert
+            if (_pricing.rateInvalid) {
+                return (sUSDBalanceBefore, _newAmount);
+            }
+            uint256 _synthAmount = _synthFromSUSD(_newAmount, _pricing);
+            // withdrawing from the yVault does not start a new waiting period
+            bool canExchange = isWaitingPeriodFinished();
+            if (canExchange) {
+                if (_synthAmount <= synthBalanceBefore) {
+                    exchangeSynthToSUSD(_synthAmount);
+                    return (_amount, 0);
                 }
+
+                _synthAmount = _synthAmount.sub(synthBalanceBefore);
+            }
+            uint256 newBalanceOfSynth =
+                synthBalanceBefore.add(_withdrawFromYVault(_synthAmount));
+            if (newBalanceOfSynth > DUST_THRESHOLD && canExchange) {
+                exchangeSynthToSUSD(newBalanceOfSynth);
+                totalAssets = balanceOfWant();
             }
         }
 
-        uint256 totalAssets = balanceOfWant();
         if (_amount > totalAssets) {
             _liquidatedAmount = totalAssets;
             _loss = _amount.sub(totalAssets);
@@ -245,16 +471,31 @@ contract SynthetixRouterStrategy is RouterStrategy, Synthetix {
         override
         returns (uint256 _amountFreed)
     {
-        // In order to work, manualRemoveFullLiquidity needs to be call 6 min in advance
-        require(isWaitingPeriodFinished(), "settlement period");
-        require(valueOfInvestment() < DUST_THRESHOLD, "remove liquidity first");
-        require(
-            _balanceOfSynth() < DUST_THRESHOLD,
-            "exchange synth to want first"
-        );
+        string memory revertReason = _liquidateAllPositionsRevertReason();
+        require(bytes(revertReason).length == 0, revertReason);
         _amountFreed = balanceOfWant();
     }
 
+    function _liquidateAllPositionsRevertReason()
+        internal
+        view
+        returns (string memory)
+    {
+        // In order to work, manualRemoveFullLiquidity needs to be call 6 min in advance
+        if (!isWaitingPeriodFinished()) {
+            return "settlement period";
+        }
+        if (valueOfInvestment() >= DUST_THRESHOLD) {
+            return "remove liquidity first";
+        }
+        if (_balanceOfSynth() >= DUST_THRESHOLD) {
+            return "exchange synth to want first";
+        }
+        if (virtualSynths.length > 0) {
+            return "settle virtual synths first";
+        }
+    }
+
     function manualRemoveFullLiquidity()
         external
         onlyVaultManagers
@@ -281,38 +522,48 @@ contract SynthetixRouterStrategy is RouterStrategy, Synthetix {
     }
 
     function estimatedTotalAssets() public view override returns (uint256) {
-        return
-            balanceOfWant().add(_sUSDFromSynth(_balanceOfSynth())).add(
-                valueOfInvestment()
-            );
+        return _estimatedTotalAssets(_synthPosition());
     }
 
-    function ethToWant(uint256 _amtInWei)
-        public
+    function _estimatedTotalAssets(SynthPosition memory _pos)
+        internal
         view
-        override
         returns (uint256)
     {
-        address[] memory path = new address[](2);
-        path[0] = weth;
-        path[1] = address(want);
-
-        uint256[] memory amounts =
-            IUni(uniswapRouter).getAmountsOut(_amtInWei, path);
+        // loose and invested synth are priced together with a single quote
+        uint256 totalSynth =
+            _pos.looseSynth.add(_pos.virtualSynth).add(
+                _valueOfShares(_pos.base)
+            );
+        if (totalSynth == 0) {
+            return _pos.base.looseWant;
+        }
+        return
+            _pos.base.looseWant.add(
+                _sUSDFromSynth(totalSynth, _synthPricing(true))
+            );
+    }
 
-        return amounts[amounts.length - 1];
+    function _synthPosition()
+        internal
+        view
+        returns (SynthPosition memory _pos)
+    {
+        _pos.base = _position();
+        _pos.looseSynth = _balanceOfSynth();
+        _pos.virtualSynth = _balanceOfVirtualSynths();
     }
 
     function valueOfInvestment() public view override returns (uint256) {
-        return
-            _sUSDFromSynth(
-                yVault.balanceOf(address(this)).mul(yVault.pricePerShare()).div(
-                    10**yVault.decimals()
-                )
-            );
+        Position memory _pos;
+        _loadInvestment(_pos);
+        return _sUSDFromSynth(_valueOfShares(_pos));
     }
 
     function prepareMigration(address _newStrategy) internal override {
+        // the new strategy would not know about them
+        _settleVirtualSynths();
+        require(virtualSynths.length == 0, "settle virtual synths first");
         super.prepareMigration(_newStrategy);
         _synthCoin().transferAndSettle(_newStrategy, _balanceOfSynth());
     }
@@ -325,10 +576,25 @@ contract SynthetixRouterStrategy is RouterStrategy, Synthetix {
             uint256 _loss,
             uint256 _debtPayment
         )
+    {
+        return _prepareReturn(_debtOutstanding, _synthPosition());
+    }
+
+    function _prepareReturn(
+        uint256 _debtOutstanding,
+        SynthPosition memory _pos
+    )
+        internal
+        view
+        returns (
+            uint256 _profit,
+            uint256 _loss,
+            uint256 _debtPayment
+        )
     {
         uint256 totalDebt = vault.strategies(address(this)).totalDebt;
-        uint256 totalAssetsAfterProfit = estimatedTotalAssets();
-        uint256 _balanceOfWant = balanceOfWant();
+        uint256 totalAssetsAfterProfit = _estimatedTotalAssets(_pos);
+        uint256 _balanceOfWant = _pos.base.looseWant;
 
         _debtPayment = Math.min(_debtOutstanding, _balanceOfWant);
 
@@ -338,4 +604,89 @@ contract SynthetixRouterStrategy is RouterStrategy, Synthetix {
             _loss = totalDebt.sub(totalAssetsAfterProfit);
         }
     }
+
+    function _previewPrepareReturn(
+        uint256 _debtOutstanding,
+        HarvestPreview memory _preview
+    ) internal view override returns (uint256 _looseWant) {
+        SynthPosition memory _pos = _synthPosition();
+        (
+            _preview.profit,
+            _preview.loss,
+            _preview.debtPayment
+        ) = _prepareReturn(_debtOutstanding, _pos);
+        _looseWant = _pos.base.looseWant;
+    }
+
+    function _previewLiquidateAllPositions()
+        internal
+        view
+        override
+        returns (
+            uint256 _amountFreed,
+            uint256 _looseWant,
+            string memory _revertReason
+        )
+    {
+        _revertReason = _liquidateAllPositionsRevertReason();
+        _amountFreed = balanceOfWant();
+        _looseWant = _amountFreed;
+    }
+
+    // sUSD can't be transferred to the vault during its waiting period
+    function _previewReport(HarvestPreview memory _preview, uint256 _looseWant)
+        internal
+        view
+        override
+    {
+        super._previewReport(_preview, _looseWant);
+        if (
+            bytes(_preview.revertReason).length == 0 &&
+            _preview.profit.add(_preview.debtPayment) > _preview.credit &&
+            !_isSUSDWaitingPeriodFinished()
+        ) {
+            _preview.revertReason = "Cannot transfer during waiting period";
+        }
+    }
+
+    function _previewAdjustPosition(
+        HarvestPreview memory _preview,
+        uint256 _looseWant
+    ) internal view override {
+        uint256 totalDebt =
+            vault
+                .strategies(address(this))
+                .totalDebt
+                .add(_preview.credit)
+                .sub(_preview.loss.add(_preview.debtPayment));
+        (uint256 _sUSDToInvest, uint256 _sUSDNeeded) =
+            _bufferPlan(_looseWant, totalDebt);
+        uint256 looseSynth =
+            _balanceOfSynth().add(_balanceOfSettleableVirtualSynths());
+        SynthPricing memory _pricing;
+        if (_sUSDToInvest > 0 || _sUSDNeeded > 0) {
+            _pricing = _synthPricing(false);
+        }
+        uint256 _synthToSell =
+            _sUSDNeeded > 0 && !_pricing.rateInvalid
+                ? _synthFromSUSD(_sUSDNeeded, _pricing)
+                : 0;
+
+        if (_synthToSell == 0) {
+            _preview.deposit =
+                looseSynth > DUST_THRESHOLD &&
+                isWaitingPeriodFinished();
+            _preview.exchange = _sUSDToInvest > 0 && !_pricing.rateInvalid;
+            if (_preview.exchange && !_isSUSDWaitingPeriodFinished()) {
+                _preview.revertReason = "Cannot settle during waiting period";
+            }
+            if (_preview.exchange && isWaitingPeriodFinished()) {
+                (IExchangeVenue venue, ) = _bestVenue(true, _sUSDToInvest);
+                _preview.deposit =
+                    _preview.deposit || address(venue) != address(0);
+            }
+        } else if (_synthToSell >= DUST_THRESHOLD) {
+            _preview.refillBuffer = _sUSDNeeded > _synthToSUSD(looseSynth);
+        }
+    }
 }
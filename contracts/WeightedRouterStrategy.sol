@@ -0,0 +1,456 @@
+// SPDX-License-Identifier: AGPL-3.0
+
+pragma solidity 0.6.12;
+pragma experimental ABIEncoderV2;
+
+import {
+    SafeERC20,
+    SafeMath,
+    IERC20,
+    Address
+} from "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
+import "@openzeppelin/contracts/math/Math.sol";
+import "./CachedHarvestTrigger.sol";
+import {IVault} from "./RouterStrategy.sol";
+
+// Routes the debt of a vault into several yVaults of the same token, split
+// by weight
+contract WeightedRouterStrategy is CachedHarvestTrigger {
+    using SafeERC20 for IERC20;
+    using Address for address;
+    using SafeMath for uint256;
+
+    uint256 internal constant DENOMINATOR = 10_000;
+    uint256 public constant MAX_DESTINATIONS = 10;
+    // gas kept for the last move of a rebalance
+    uint256 internal constant REBALANCE_GAS_RESERVE = 200_000;
+
+    string internal strategyName;
+    uint256 public maxLoss;
+    // Moves smaller than this share (bps) of the invested assets are not
+    // worth a rebalance
+    uint256 public rebalanceThreshold = 100;
+
+    IVault[] internal yVaults;
+    uint256[] internal weights; // in bps, they add up to DENOMINATOR
+
+    // Snapshot of one destination, read once and passed through the harvest
+    struct Destination {
+        IVault yVault;
+        uint256 yShares;
+        uint256 pricePerShare;
+        uint256 yUnit; // 10 ** yVault.decimals(), 0 if not loaded
+        uint256 value; // in want
+    }
+
+    constructor(
+        address _vault,
+        address[] memory _yVaults,
+        uint256[] memory _weights,
+        string memory _strategyName
+    ) public BaseStrategy(_vault) {
+        strategyName = _strategyName;
+        _initializeEthToWantCache();
+        _setDestinations(_yVaults, _weights);
+    }
+
+    function name() external view override returns (string memory) {
+        return strategyName;
+    }
+
+    function getDestinations()
+        external
+        view
+        returns (address[] memory _yVaults, uint256[] memory _weights)
+    {
+        _yVaults = new address[](yVaults.length);
+        for (uint256 i = 0; i < yVaults.length; i++) {
+            _yVaults[i] = address(yVaults[i]);
+        }
+        _weights = weights;
+    }
+
+    // A yVault can only be dropped once the strategy has no shares of it
+    function setDestinations(
+        address[] memory _yVaults,
+        uint256[] memory _weights
+    ) public onlyVaultManagers {
+        for (uint256 i = 0; i < yVaults.length; i++) {
+            if (!_contains(_yVaults, address(yVaults[i]))) {
+                require(yVaults[i].balanceOf(address(this)) == 0, "!empty");
+            }
+        }
+        _setDestinations(_yVaults, _weights);
+    }
+
+    function setMaxLoss(uint256 _maxLoss) public onlyVaultManagers {
+        require(_maxLoss <= DENOMINATOR, "!too high");
+        maxLoss = _maxLoss;
+    }
+
+    // At most the whole invested assets, which disables rebalance
+    function setRebalanceThreshold(uint256 _rebalanceThreshold)
+        external
+        onlyVaultManagers
+    {
+        require(_rebalanceThreshold <= DENOMINATOR, "!too high");
+        rebalanceThreshold = _rebalanceThreshold;
+    }
+
+    function _setDestinations(
+        address[] memory _yVaults,
+        uint256[] memory _weights
+    ) internal {
+        require(
+            _yVaults.length > 0 &&
+                _yVaults.length <= MAX_DESTINATIONS &&
+                _yVaults.length == _weights.length,
+            "!destinations"
+        );
+        for (uint256 i = 0; i < yVaults.length; i++) {
+            if (!_contains(_yVaults, address(yVaults[i]))) {
+                want.safeApprove(address(yVaults[i]), 0);
+            }
+        }
+        delete yVaults;
+        delete weights;
+
+        uint256 totalWeight;
+        for (uint256 i = 0; i < _yVaults.length; i++) {
+            require(IVault(_yVaults[i]).token() == address(want), "!want");
+            for (uint256 j = 0; j < i; j++) {
+                require(_yVaults[i] != _yVaults[j], "!duplicate");
+            }
+            // granted once, deposits do not check the allowance
+            if (want.allowance(address(this), _yVaults[i]) == 0) {
+                want.safeApprove(_yVaults[i], type(uint256).max);
+            }
+            totalWeight = totalWeight.add(_weights[i]);
+            yVaults.push(IVault(_yVaults[i]));
+            weights.push(_weights[i]);
+        }
+        require(totalWeight == DENOMINATOR, "!weights");
+    }
+
+    function estimatedTotalAssets() public view override returns (uint256) {
+        (, uint256 _invested) = _destinations();
+        return balanceOfWant().add(_invested);
+    }
+
+    function delegatedAssets() external view override returns (uint256) {
+        return vault.strategies(address(this)).totalDebt;
+    }
+
+    function balanceOfWant() public view returns (uint256) {
+        return want.balanceOf(address(this));
+    }
+
+    function prepareReturn(uint256 _debtOutstanding)
+        internal
+        override
+        returns (
+            uint256 _profit,
+            uint256 _loss,
+            uint256 _debtPayment
+        )
+    {
+        (Destination[] memory _dest, uint256 _invested) = _destinations();
+        uint256 _looseWant = balanceOfWant();
+        uint256 _totalDebt = vault.strategies(address(this)).totalDebt;
+        uint256 _totalAssets = _looseWant.add(_invested);
+
+        if (_totalDebt <= _totalAssets) {
+            _profit = _totalAssets.sub(_totalDebt);
+        }
+
+        uint256 _amountFreed;
+        (_amountFreed, _loss) = _liquidatePosition(
+            _debtOutstanding.add(_profit),
+            _looseWant,
+            _dest
+        );
+        _debtPayment = Math.min(_debtOutstanding, _amountFreed);
+
+        // same netting as RouterStrategy.prepareReturn
+        if (_loss > _profit) {
+            _loss = _loss.sub(_profit);
+            _profit = 0;
+        } else {
+            _profit = _profit.sub(_loss);
+            _loss = 0;
+        }
+    }
+
+    // Fills every destination up to its weight, then spreads what is left
+    // where the deposit limits leave room
+    function adjustPosition(uint256 _debtOutstanding) internal override {
+        if (emergencyExit) {
+            return;
+        }
+        _updateEthToWantCache();
+
+        uint256 _remaining = balanceOfWant();
+        if (_remaining == 0) {
+            return;
+        }
+
+        (Destination[] memory _dest, uint256 _invested) = _destinations();
+        uint256 _totalAssets = _remaining.add(_invested);
+        uint256[] memory _room = new uint256[](_dest.length);
+        uint256[] memory _amounts = new uint256[](_dest.length);
+
+        for (uint256 i = 0; i < _dest.length; i++) {
+            _room[i] = _dest[i].yVault.availableDepositLimit();
+            uint256 _target = _totalAssets.mul(weights[i]).div(DENOMINATOR);
+            if (_target > _dest[i].value) {
+                _amounts[i] = Math.min(
+                    Math.min(_target - _dest[i].value, _room[i]),
+                    _remaining
+                );
+                _room[i] = _room[i].sub(_amounts[i]);
+                _remaining = _remaining.sub(_amounts[i]);
+            }
+        }
+        for (uint256 i = 0; i < _dest.length && _remaining > 0; i++) {
+            uint256 _extra = Math.min(_room[i], _remaining);
+            _amounts[i] = _amounts[i].add(_extra);
+            _remaining = _remaining.sub(_extra);
+        }
+
+        for (uint256 i = 0; i < _dest.length; i++) {
+            _deposit(_dest[i], _amounts[i]);
+        }
+    }
+
+    function liquidatePosition(uint256 _amountNeeded)
+        internal
+        override
+        returns (uint256 _liquidatedAmount, uint256 _loss)
+    {
+        uint256 _looseWant = balanceOfWant();
+        if (_looseWant >= _amountNeeded) {
+            return (_amountNeeded, 0);
+        }
+
+        (Destination[] memory _dest, ) = _destinations();
+        return _liquidatePosition(_amountNeeded, _looseWant, _dest);
+    }
+
+    // Withdraws from the destinations holding the most idle want first, as
+    // those withdrawals do not touch the strategies of the yVault
+    function _liquidatePosition(
+        uint256 _amountNeeded,
+        uint256 _looseWant,
+        Destination[] memory _dest
+    ) internal returns (uint256 _liquidatedAmount, uint256 _loss) {
+        if (_looseWant >= _amountNeeded) {
+            return (_amountNeeded, 0);
+        }
+
+        uint256 _toWithdraw = _amountNeeded.sub(_looseWant);
+        uint256[] memory _order = _withdrawalOrder(_dest);
+        for (uint256 k = 0; k < _order.length && _toWithdraw > 0; k++) {
+            Destination memory _d = _dest[_order[k]];
+            uint256 _received =
+                _withdraw(_d, Math.min(_toWithdraw, _d.value));
+            _looseWant = _looseWant.add(_received);
+            _toWithdraw = _received >= _toWithdraw
+                ? 0
+                : _toWithdraw.sub(_received);
+        }
+
+        if (_amountNeeded > _looseWant) {
+            _liquidatedAmount = _looseWant;
+            _loss = _amountNeeded.sub(_looseWant);
+        } else {
+            _liquidatedAmount = _amountNeeded;
+        }
+    }
+
+    // Moves want from the most overweight to the most underweight
+    // destination, at most _maxMoves times and while there is gas left
+    function rebalance(uint256 _maxMoves) external onlyKeepers {
+        (Destination[] memory _dest, uint256 _invested) = _destinations();
+        uint256 _threshold =
+            _invested.mul(rebalanceThreshold).div(DENOMINATOR);
+
+        for (
+            uint256 m = 0;
+            m < _maxMoves && gasleft() > REBALANCE_GAS_RESERVE;
+            m++
+        ) {
+            (uint256 _from, uint256 _excess, uint256 _to, uint256 _deficit) =
+                _mostOffTarget(_dest, _invested);
+            uint256 _amount =
+                Math.min(
+                    Math.min(_excess, _deficit),
+                    _dest[_to].yVault.availableDepositLimit()
+                );
+            if (_amount == 0 || _amount <= _threshold) {
+                break;
+            }
+
+            _deposit(_dest[_to], _withdraw(_dest[_from], _amount));
+        }
+    }
+
+    function _mostOffTarget(Destination[] memory _dest, uint256 _invested)
+        internal
+        view
+        returns (
+            uint256 _from,
+            uint256 _excess,
+            uint256 _to,
+            uint256 _deficit
+        )
+    {
+        for (uint256 i = 0; i < _dest.length; i++) {
+            uint256 _target = _invested.mul(weights[i]).div(DENOMINATOR);
+            uint256 _value = _dest[i].value;
+            if (_value > _target && _value - _target > _excess) {
+                _from = i;
+                _excess = _value - _target;
+            } else if (_target > _value && _target - _value > _deficit) {
+                _to = i;
+                _deficit = _target - _value;
+            }
+        }
+    }
+
+    function liquidateAllPositions()
+        internal
+        override
+        returns (uint256 _amountFreed)
+    {
+        for (uint256 i = 0; i < yVaults.length; i++) {
+            uint256 _shares = yVaults[i].balanceOf(address(this));
+            if (_shares > 0) {
+                yVaults[i].withdraw(_shares, address(this), maxLoss);
+            }
+        }
+        return balanceOfWant();
+    }
+
+    function prepareMigration(address _newStrategy) internal override {
+        for (uint256 i = 0; i < yVaults.length; i++) {
+            IERC20(yVaults[i]).safeTransfer(
+                _newStrategy,
+                IERC20(yVaults[i]).balanceOf(address(this))
+            );
+            want.safeApprove(address(yVaults[i]), 0);
+        }
+    }
+
+    function protectedTokens()
+        internal
+        view
+        override
+        returns (address[] memory ret)
+    {
+        ret = new address[](yVaults.length);
+        for (uint256 i = 0; i < yVaults.length; i++) {
+            ret[i] = address(yVaults[i]);
+        }
+    }
+
+    // Reads every destination in one pass, _invested is their total value
+    function _destinations()
+        internal
+        view
+        returns (Destination[] memory _dest, uint256 _invested)
+    {
+        _dest = new Destination[](yVaults.length);
+        for (uint256 i = 0; i < _dest.length; i++) {
+            Destination memory _d = _dest[i];
+            _d.yVault = yVaults[i];
+            _d.yShares = _d.yVault.balanceOf(address(this));
+            if (_d.yShares > 0) {
+                _loadPrice(_d);
+                _d.value = _d.yShares.mul(_d.pricePerShare).div(_d.yUnit);
+                _invested = _invested.add(_d.value);
+            }
+        }
+    }
+
+    function _loadPrice(Destination memory _d) internal view {
+        _d.pricePerShare = _d.yVault.pricePerShare();
+        _d.yUnit = 10**_d.yVault.decimals();
+    }
+
+    // Destinations with shares, the one with the most idle want first
+    function _withdrawalOrder(Destination[] memory _dest)
+        internal
+        view
+        returns (uint256[] memory _order)
+    {
+        uint256[] memory _idle = new uint256[](_dest.length);
+        uint256 _count;
+        _order = new uint256[](_dest.length);
+        for (uint256 i = 0; i < _dest.length; i++) {
+            if (_dest[i].yShares == 0) {
+                continue;
+            }
+            uint256 _liquidity = want.balanceOf(address(_dest[i].yVault));
+            // insertion sort, there are at most MAX_DESTINATIONS
+            uint256 j = _count;
+            while (j > 0 && _idle[j - 1] < _liquidity) {
+                _idle[j] = _idle[j - 1];
+                _order[j] = _order[j - 1];
+                j--;
+            }
+            _idle[j] = _liquidity;
+            _order[j] = i;
+            _count++;
+        }
+        assembly {
+            mstore(_order, _count)
+        }
+    }
+
+    // Withdraws shares worth at least _amount (rounded up, capped at the
+    // balance) and returns the want received
+    function _withdraw(Destination memory _d, uint256 _amount)
+        internal
+        returns (uint256 _received)
+    {
+        if (_amount == 0 || _d.yShares == 0) {
+            return 0;
+        }
+
+        uint256 _shares =
+            Math.min(
+                _amount.mul(_d.yUnit).add(_d.pricePerShare).sub(1).div(
+                    _d.pricePerShare
+                ),
+                _d.yShares
+            );
+        _d.yShares = _d.yShares.sub(_shares);
+        _received = _d.yVault.withdraw(_shares, address(this), maxLoss);
+        _d.value = _d.value.sub(Math.min(_d.value, _received));
+    }
+
+    function _deposit(Destination memory _d, uint256 _amount) internal {
+        if (_amount == 0) {
+            return;
+        }
+
+        _d.yShares = _d.yShares.add(_d.yVault.deposit(_amount));
+        _d.value = _d.value.add(_amount);
+        if (_d.yUnit == 0) {
+            _loadPrice(_d);
+        }
+    }
+
+    function _contains(address[] memory _list, address _item)
+        internal
+        pure
+        returns (bool)
+    {
+        for (uint256 i = 0; i < _list.length; i++) {
+            if (_list[i] == _item) {
+                return true;
+            }
+        }
+        return false;
+    }
+}
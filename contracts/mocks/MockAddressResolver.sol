@@ -0,0 +1,30 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+contract MockAddressResolver {
+    mapping(bytes32 => address) public repository;
+
+    function importAddresses(
+        bytes32[] calldata _names,
+        address[] calldata _destinations
+    ) external {
+        require(_names.length == _destinations.length, "!length");
+        for (uint256 i = 0; i < _names.length; i++) {
+            repository[_names[i]] = _destinations[i];
+        }
+    }
+
+    function getAddress(bytes32 _name) external view returns (address) {
+        return repository[_name];
+    }
+
+    function requireAndGetAddress(bytes32 _name, string calldata _reason)
+        external
+        view
+        returns (address)
+    {
+        address _foundAddress = repository[_name];
+        require(_foundAddress != address(0), _reason);
+        return _foundAddress;
+    }
+}
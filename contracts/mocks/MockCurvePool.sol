@@ -0,0 +1,75 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+import {
+    SafeERC20,
+    SafeMath,
+    IERC20
+} from "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
+import "./MockExchangeRates.sol";
+
+// Two coin Curve pool trading at the oracle rate minus a fee, it has to be
+// funded with both coins
+contract MockCurvePool {
+    using SafeERC20 for IERC20;
+    using SafeMath for uint256;
+
+    uint256 internal constant FEE_DENOMINATOR = 1e10;
+
+    address[2] public coins;
+    bytes32[2] public currencyKeys;
+    MockExchangeRates public exchangeRates;
+    uint256 public fee;
+    // share of the quote actually paid, in bps (for slippage tests)
+    uint256 public payout = 10_000;
+
+    constructor(
+        address[2] memory _coins,
+        bytes32[2] memory _currencyKeys,
+        address _exchangeRates,
+        uint256 _fee
+    ) public {
+        coins = _coins;
+        currencyKeys = _currencyKeys;
+        exchangeRates = MockExchangeRates(_exchangeRates);
+        fee = _fee;
+    }
+
+    function setFee(uint256 _fee) external {
+        fee = _fee;
+    }
+
+    function setPayout(uint256 _payout) external {
+        payout = _payout;
+    }
+
+    function get_dy(
+        int128 i,
+        int128 j,
+        uint256 dx
+    ) public view returns (uint256) {
+        uint256 dy =
+            exchangeRates.effectiveValue(
+                currencyKeys[uint256(i)],
+                dx,
+                currencyKeys[uint256(j)]
+            );
+        return dy.sub(dy.mul(fee).div(FEE_DENOMINATOR));
+    }
+
+    function exchange(
+        int128 i,
+        int128 j,
+        uint256 dx,
+        uint256 min_dy
+    ) external {
+        uint256 dy = get_dy(i, j, dx).mul(payout).div(10_000);
+        require(dy >= min_dy, "Exchange resulted in fewer coins than expected");
+        IERC20(coins[uint256(i)]).safeTransferFrom(
+            msg.sender,
+            address(this),
+            dx
+        );
+        IERC20(coins[uint256(j)]).safeTransfer(msg.sender, dy);
+    }
+}
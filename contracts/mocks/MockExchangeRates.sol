@@ -0,0 +1,65 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+import "@openzeppelin/contracts/math/SafeMath.sol";
+
+contract MockExchangeRates {
+    using SafeMath for uint256;
+
+    bytes32 internal constant sUSD = "sUSD";
+
+    mapping(bytes32 => uint256) public rates;
+    mapping(bytes32 => bool) internal invalid;
+
+    constructor() public {
+        rates[sUSD] = 1e18;
+    }
+
+    function setRate(bytes32 _currencyKey, uint256 _rate) external {
+        rates[_currencyKey] = _rate;
+    }
+
+    function setRateInvalid(bytes32 _currencyKey, bool _invalid) external {
+        invalid[_currencyKey] = _invalid;
+    }
+
+    function rateIsInvalid(bytes32 _currencyKey) public view returns (bool) {
+        return invalid[_currencyKey] || rates[_currencyKey] == 0;
+    }
+
+    function rateAndInvalid(bytes32 _currencyKey)
+        external
+        view
+        returns (uint256 rate, bool isInvalid)
+    {
+        return (rates[_currencyKey], rateIsInvalid(_currencyKey));
+    }
+
+    function ratesAndInvalidForCurrencies(bytes32[] calldata _currencyKeys)
+        external
+        view
+        returns (uint256[] memory _rates, bool anyRateInvalid)
+    {
+        _rates = new uint256[](_currencyKeys.length);
+        for (uint256 i = 0; i < _currencyKeys.length; i++) {
+            _rates[i] = rates[_currencyKeys[i]];
+            anyRateInvalid = anyRateInvalid || rateIsInvalid(_currencyKeys[i]);
+        }
+    }
+
+    // multiplyDecimalRound then divideDecimalRound, as ExchangeRates does
+    function effectiveValue(
+        bytes32 _sourceCurrencyKey,
+        uint256 _sourceAmount,
+        bytes32 _destinationCurrencyKey
+    ) public view returns (uint256) {
+        if (_sourceCurrencyKey == _destinationCurrencyKey) {
+            return _sourceAmount;
+        }
+        uint256 valueTimesTen =
+            _sourceAmount.mul(rates[_sourceCurrencyKey]).div(1e17);
+        uint256 value = valueTimesTen.add(5).div(10);
+        valueTimesTen = value.mul(1e19).div(rates[_destinationCurrencyKey]);
+        return valueTimesTen.add(5).div(10);
+    }
+}
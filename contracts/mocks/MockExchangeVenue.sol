@@ -0,0 +1,61 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+pragma experimental ABIEncoderV2;
+
+import "@openzeppelin/contracts/math/SafeMath.sol";
+import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+import "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
+import "../Interfaces/venues/IExchangeVenue.sol";
+import "./MockExchangeRates.sol";
+import "./MockSynth.sol";
+
+// Venue paying the oracle rate without fee, that only pulls `pulled` (bps)
+// of the amount it was approved for
+contract MockExchangeVenue is IExchangeVenue {
+    using SafeMath for uint256;
+    using SafeERC20 for IERC20;
+
+    MockExchangeRates public exchangeRates;
+    mapping(address => bytes32) public currencyKeys;
+    uint256 public pulled = 10_000;
+
+    constructor(address _exchangeRates, MockSynth[] memory _synths) public {
+        exchangeRates = MockExchangeRates(_exchangeRates);
+        for (uint256 i = 0; i < _synths.length; i++) {
+            currencyKeys[address(_synths[i])] = _synths[i].currencyKey();
+        }
+    }
+
+    function setPulled(uint256 _pulled) external {
+        pulled = _pulled;
+    }
+
+    function quote(
+        address _from,
+        address _to,
+        uint256 _amount
+    ) public view override returns (uint256) {
+        return
+            exchangeRates.effectiveValue(
+                currencyKeys[_from],
+                _amount,
+                currencyKeys[_to]
+            );
+    }
+
+    function exchange(
+        address _from,
+        address _to,
+        uint256 _amount,
+        uint256,
+        address _recipient
+    ) external override returns (uint256 amountOut) {
+        amountOut = quote(_from, _to, _amount);
+        IERC20(_from).safeTransferFrom(
+            msg.sender,
+            address(this),
+            _amount.mul(pulled).div(10_000)
+        );
+        IERC20(_to).safeTransfer(_recipient, amountOut);
+    }
+}
@@ -0,0 +1,183 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+import "@openzeppelin/contracts/math/SafeMath.sol";
+import "./MockExchangeRates.sol";
+import "./MockSynth.sol";
+import "./MockVirtualSynth.sol";
+
+contract MockExchanger {
+    using SafeMath for uint256;
+
+    MockExchangeRates public exchangeRates;
+    address public synthetix;
+    address public owner;
+
+    uint256 public waitingPeriodSecs = 360;
+    // fee charged when exchanging into a currency, in base 1e18
+    mapping(bytes32 => uint256) public exchangeFeeRates;
+    mapping(bytes32 => MockSynth) public synths;
+    mapping(address => mapping(bytes32 => uint256)) public lastExchange;
+
+    constructor(address _exchangeRates) public {
+        exchangeRates = MockExchangeRates(_exchangeRates);
+        owner = msg.sender;
+    }
+
+    modifier onlyOwner() {
+        require(msg.sender == owner, "!owner");
+        _;
+    }
+
+    function setSynthetix(address _synthetix) external onlyOwner {
+        synthetix = _synthetix;
+    }
+
+    function addSynth(MockSynth _synth) external onlyOwner {
+        synths[_synth.currencyKey()] = _synth;
+    }
+
+    function setWaitingPeriodSecs(uint256 _waitingPeriodSecs)
+        external
+        onlyOwner
+    {
+        waitingPeriodSecs = _waitingPeriodSecs;
+    }
+
+    function setExchangeFeeRate(bytes32 _currencyKey, uint256 _feeRate)
+        external
+        onlyOwner
+    {
+        exchangeFeeRates[_currencyKey] = _feeRate;
+    }
+
+    function maxSecsLeftInWaitingPeriod(address _account, bytes32 _currencyKey)
+        public
+        view
+        returns (uint256)
+    {
+        uint256 end =
+            lastExchange[_account][_currencyKey].add(waitingPeriodSecs);
+        return end > block.timestamp ? end.sub(block.timestamp) : 0;
+    }
+
+    function hasWaitingPeriodOrSettlementOwing(
+        address _account,
+        bytes32 _currencyKey
+    ) external view returns (bool) {
+        return maxSecsLeftInWaitingPeriod(_account, _currencyKey) > 0;
+    }
+
+    function isSynthRateInvalid(bytes32 _currencyKey)
+        external
+        view
+        returns (bool)
+    {
+        return exchangeRates.rateIsInvalid(_currencyKey);
+    }
+
+    function feeRateForExchange(bytes32, bytes32 _destinationCurrencyKey)
+        external
+        view
+        returns (uint256)
+    {
+        return exchangeFeeRates[_destinationCurrencyKey];
+    }
+
+    function getAmountsForExchange(
+        uint256 _sourceAmount,
+        bytes32 _sourceCurrencyKey,
+        bytes32 _destinationCurrencyKey
+    )
+        public
+        view
+        returns (
+            uint256 amountReceived,
+            uint256 fee,
+            uint256 exchangeFeeRate
+        )
+    {
+        exchangeFeeRate = exchangeFeeRates[_destinationCurrencyKey];
+        uint256 destinationAmount =
+            exchangeRates.effectiveValue(
+                _sourceCurrencyKey,
+                _sourceAmount,
+                _destinationCurrencyKey
+            );
+        fee = destinationAmount.mul(exchangeFeeRate).div(1e18);
+        amountReceived = destinationAmount.sub(fee);
+    }
+
+    function exchange(
+        address _from,
+        bytes32 _sourceCurrencyKey,
+        uint256 _sourceAmount,
+        bytes32 _destinationCurrencyKey,
+        address _destinationAddress
+    ) public returns (uint256 amountReceived) {
+        require(msg.sender == synthetix, "!synthetix");
+        require(
+            maxSecsLeftInWaitingPeriod(_from, _sourceCurrencyKey) == 0,
+            "Cannot settle during waiting period"
+        );
+        require(
+            !exchangeRates.rateIsInvalid(_sourceCurrencyKey) &&
+                !exchangeRates.rateIsInvalid(_destinationCurrencyKey),
+            "Src/dest rate invalid or not found"
+        );
+
+        (amountReceived, , ) = getAmountsForExchange(
+            _sourceAmount,
+            _sourceCurrencyKey,
+            _destinationCurrencyKey
+        );
+        synths[_sourceCurrencyKey].burn(_from, _sourceAmount);
+        synths[_destinationCurrencyKey].issue(
+            _destinationAddress,
+            amountReceived
+        );
+        lastExchange[_destinationAddress][_destinationCurrencyKey] = block
+            .timestamp;
+    }
+
+    // The destination synth goes to a new virtual synth, which is the one in
+    // the waiting period
+    function exchangeWithVirtual(
+        address _from,
+        bytes32 _sourceCurrencyKey,
+        uint256 _sourceAmount,
+        bytes32 _destinationCurrencyKey,
+        address _destinationAddress
+    ) external returns (uint256 amountReceived, MockVirtualSynth vSynth) {
+        (amountReceived, , ) = getAmountsForExchange(
+            _sourceAmount,
+            _sourceCurrencyKey,
+            _destinationCurrencyKey
+        );
+        vSynth = new MockVirtualSynth(
+            synths[_destinationCurrencyKey],
+            address(this),
+            _destinationAddress,
+            amountReceived
+        );
+        exchange(
+            _from,
+            _sourceCurrencyKey,
+            _sourceAmount,
+            _destinationCurrencyKey,
+            address(vSynth)
+        );
+    }
+
+    function settle(address, bytes32)
+        external
+        pure
+        returns (
+            uint256 reclaimed,
+            uint256 refunded,
+            uint256 numEntries
+        )
+    {
+        return (0, 0, 0);
+    }
+}
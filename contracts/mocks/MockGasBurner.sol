@@ -0,0 +1,13 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+// Strategy stand-in whose harvest runs out of gas
+contract MockGasBurner {
+    uint256 public counter;
+
+    function harvest() external {
+        while (true) {
+            counter++;
+        }
+    }
+}
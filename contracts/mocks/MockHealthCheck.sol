@@ -0,0 +1,21 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+// Rejects reports with a profit above profitLimit
+contract MockHealthCheck {
+    uint256 public profitLimit = type(uint256).max;
+
+    function setProfitLimit(uint256 _profitLimit) external {
+        profitLimit = _profitLimit;
+    }
+
+    function check(
+        uint256 _profit,
+        uint256,
+        uint256,
+        uint256,
+        uint256
+    ) external view returns (bool) {
+        return _profit <= profitLimit;
+    }
+}
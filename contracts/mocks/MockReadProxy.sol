@@ -0,0 +1,14 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+contract MockReadProxy {
+    address public target;
+
+    constructor(address _target) public {
+        target = _target;
+    }
+
+    function setTarget(address _target) external {
+        target = _target;
+    }
+}
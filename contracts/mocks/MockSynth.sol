@@ -0,0 +1,78 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+import "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+
+interface IMockExchanger {
+    function maxSecsLeftInWaitingPeriod(address account, bytes32 currencyKey)
+        external
+        view
+        returns (uint256);
+}
+
+// Synth that is also its own proxy (target() returns itself)
+contract MockSynth is ERC20 {
+    bytes32 public currencyKey;
+    address public exchanger;
+    address public owner;
+
+    constructor(
+        string memory _name,
+        string memory _symbol,
+        bytes32 _currencyKey,
+        address _exchanger
+    ) public ERC20(_name, _symbol) {
+        currencyKey = _currencyKey;
+        exchanger = _exchanger;
+        owner = msg.sender;
+    }
+
+    modifier onlyIssuer() {
+        require(msg.sender == exchanger || msg.sender == owner, "!issuer");
+        _;
+    }
+
+    function target() external view returns (address) {
+        return address(this);
+    }
+
+    function issue(address _account, uint256 _amount) external onlyIssuer {
+        _mint(_account, _amount);
+    }
+
+    function burn(address _account, uint256 _amount) external onlyIssuer {
+        _burn(_account, _amount);
+    }
+
+    function transferAndSettle(address _to, uint256 _value)
+        external
+        returns (bool)
+    {
+        return transfer(_to, _value);
+    }
+
+    function transferFromAndSettle(
+        address _from,
+        address _to,
+        uint256 _value
+    ) external returns (bool) {
+        return transferFrom(_from, _to, _value);
+    }
+
+    function _beforeTokenTransfer(
+        address _from,
+        address _to,
+        uint256
+    ) internal override {
+        if (_from == address(0) || _to == address(0)) {
+            return;
+        }
+        require(
+            IMockExchanger(exchanger).maxSecsLeftInWaitingPeriod(
+                _from,
+                currencyKey
+            ) == 0,
+            "Cannot transfer during waiting period"
+        );
+    }
+}
@@ -0,0 +1,68 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+import "./MockExchanger.sol";
+
+contract MockSynthetix {
+    MockExchanger public exchanger;
+
+    event SynthExchange(
+        address indexed account,
+        bytes32 fromCurrencyKey,
+        uint256 fromAmount,
+        bytes32 toCurrencyKey,
+        uint256 toAmount,
+        address toAddress
+    );
+
+    constructor(address _exchanger) public {
+        exchanger = MockExchanger(_exchanger);
+    }
+
+    function exchangeWithTracking(
+        bytes32 _sourceCurrencyKey,
+        uint256 _sourceAmount,
+        bytes32 _destinationCurrencyKey,
+        address,
+        bytes32
+    ) external returns (uint256 amountReceived) {
+        amountReceived = exchanger.exchange(
+            msg.sender,
+            _sourceCurrencyKey,
+            _sourceAmount,
+            _destinationCurrencyKey,
+            msg.sender
+        );
+        emit SynthExchange(
+            msg.sender,
+            _sourceCurrencyKey,
+            _sourceAmount,
+            _destinationCurrencyKey,
+            amountReceived,
+            msg.sender
+        );
+    }
+
+    function exchangeWithVirtual(
+        bytes32 _sourceCurrencyKey,
+        uint256 _sourceAmount,
+        bytes32 _destinationCurrencyKey,
+        bytes32
+    ) external returns (uint256 amountReceived, MockVirtualSynth vSynth) {
+        (amountReceived, vSynth) = exchanger.exchangeWithVirtual(
+            msg.sender,
+            _sourceCurrencyKey,
+            _sourceAmount,
+            _destinationCurrencyKey,
+            msg.sender
+        );
+        emit SynthExchange(
+            msg.sender,
+            _sourceCurrencyKey,
+            _sourceAmount,
+            _destinationCurrencyKey,
+            amountReceived,
+            address(vSynth)
+        );
+    }
+}
@@ -0,0 +1,33 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+import "@openzeppelin/contracts/math/SafeMath.sol";
+
+// Quotes every path at a fixed rate, in output tokens per 1e18 input
+contract MockUniswapRouter {
+    using SafeMath for uint256;
+
+    uint256 public rate;
+    bool public broken;
+
+    function setRate(uint256 _rate) external {
+        rate = _rate;
+    }
+
+    function setBroken(bool _broken) external {
+        broken = _broken;
+    }
+
+    function getAmountsOut(uint256 _amountIn, address[] calldata _path)
+        external
+        view
+        returns (uint256[] memory amounts)
+    {
+        require(!broken, "!quote");
+        amounts = new uint256[](_path.length);
+        amounts[0] = _amountIn;
+        for (uint256 i = 1; i < _path.length; i++) {
+            amounts[i] = amounts[i - 1].mul(rate).div(1e18);
+        }
+    }
+}
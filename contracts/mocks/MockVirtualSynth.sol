@@ -0,0 +1,61 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+import "@openzeppelin/contracts/math/SafeMath.sol";
+import "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+import "./MockSynth.sol";
+
+// Holds the synth of one exchange until its waiting period is over, like
+// Synthetix's VirtualSynth
+contract MockVirtualSynth is ERC20 {
+    using SafeMath for uint256;
+
+    MockSynth public synth;
+    IMockExchanger public exchanger;
+    bool public settled;
+
+    constructor(
+        MockSynth _synth,
+        address _exchanger,
+        address _recipient,
+        uint256 _amount
+    ) public ERC20("Virtual Synth", "vSynth") {
+        synth = _synth;
+        exchanger = IMockExchanger(_exchanger);
+        _mint(_recipient, _amount);
+    }
+
+    function balanceOfUnderlying(address _account)
+        public
+        view
+        returns (uint256)
+    {
+        if (totalSupply() == 0) {
+            return 0;
+        }
+        return
+            synth.balanceOf(address(this)).mul(balanceOf(_account)).div(
+                totalSupply()
+            );
+    }
+
+    function secsLeftInWaitingPeriod() public view returns (uint256) {
+        return
+            exchanger.maxSecsLeftInWaitingPeriod(
+                address(this),
+                synth.currencyKey()
+            );
+    }
+
+    function readyToSettle() external view returns (bool) {
+        return !settled && secsLeftInWaitingPeriod() == 0;
+    }
+
+    function settle(address _account) external {
+        require(secsLeftInWaitingPeriod() == 0, "not ready");
+        settled = true;
+        uint256 amount = balanceOfUnderlying(_account);
+        _burn(_account, balanceOf(_account));
+        synth.transfer(_account, amount);
+    }
+}
@@ -0,0 +1,92 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+import "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+import "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
+import "@openzeppelin/contracts/math/Math.sol";
+
+// Minimal yVault: shares are priced from the tokens it holds, so sending
+// tokens to it raises pricePerShare and takeAssets lowers it.
+contract MockYVault is ERC20 {
+    using SafeERC20 for IERC20;
+    using SafeMath for uint256;
+
+    address public token;
+    address public owner;
+    uint256 public depositLimit = type(uint256).max;
+    bool public broken;
+
+    constructor(address _token)
+        public
+        ERC20("Mock yVault", "yvMOCK")
+    {
+        token = _token;
+        owner = msg.sender;
+        _setupDecimals(ERC20(_token).decimals());
+    }
+
+    function setDepositLimit(uint256 _depositLimit) external {
+        require(msg.sender == owner, "!owner");
+        depositLimit = _depositLimit;
+    }
+
+    // pricePerShare reverts while broken
+    function setBroken(bool _broken) external {
+        require(msg.sender == owner, "!owner");
+        broken = _broken;
+    }
+
+    // simulates a loss of the yVault strategies
+    function takeAssets(uint256 _amount) external {
+        require(msg.sender == owner, "!owner");
+        IERC20(token).safeTransfer(owner, _amount);
+    }
+
+    function totalAssets() public view returns (uint256) {
+        return IERC20(token).balanceOf(address(this));
+    }
+
+    function availableDepositLimit() public view returns (uint256) {
+        uint256 _totalAssets = totalAssets();
+        return depositLimit > _totalAssets ? depositLimit - _totalAssets : 0;
+    }
+
+    function pricePerShare() external view returns (uint256) {
+        require(!broken, "!broken");
+        return _shareValue(10**uint256(decimals()));
+    }
+
+    function deposit() external returns (uint256) {
+        return deposit(IERC20(token).balanceOf(msg.sender));
+    }
+
+    function deposit(uint256 _amount) public returns (uint256 shares) {
+        _amount = Math.min(_amount, availableDepositLimit());
+        require(_amount > 0, "!amount");
+
+        uint256 _totalAssets = totalAssets();
+        shares = totalSupply() == 0
+            ? _amount
+            : _amount.mul(totalSupply()).div(_totalAssets);
+        IERC20(token).safeTransferFrom(msg.sender, address(this), _amount);
+        _mint(msg.sender, shares);
+    }
+
+    function withdraw(
+        uint256 _maxShares,
+        address _recipient,
+        uint256
+    ) external returns (uint256 value) {
+        uint256 shares = Math.min(_maxShares, balanceOf(msg.sender));
+        value = _shareValue(shares);
+        _burn(msg.sender, shares);
+        IERC20(token).safeTransfer(_recipient, value);
+    }
+
+    function _shareValue(uint256 _shares) internal view returns (uint256) {
+        if (totalSupply() == 0) {
+            return _shares;
+        }
+        return _shares.mul(totalAssets()).div(totalSupply());
+    }
+}
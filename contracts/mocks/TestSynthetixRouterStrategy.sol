@@ -0,0 +1,87 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+pragma experimental ABIEncoderV2;
+
+import "../SynthetixRouterStrategy.sol";
+
+// SynthetixRouterStrategy reading Synthetix from an injected ReadProxy
+// instead of the mainnet one. Only meant for the offline test suite.
+contract TestSynthetixRouterStrategy is SynthetixRouterStrategy {
+    IReadProxy internal testReadProxy;
+
+    constructor(
+        address _vault,
+        address _yVault,
+        string memory _strategyName,
+        bytes32 _synth,
+        uint256 _susdBuffer,
+        address _readProxy
+    )
+        public
+        SynthetixRouterStrategy(
+            _vault,
+            _yVault,
+            _strategyName,
+            _setReadProxy(_synth, _readProxy),
+            _susdBuffer
+        )
+    {}
+
+    // Evaluated before the SynthetixRouterStrategy constructor runs, which
+    // already resolves the Synthetix addresses
+    function _setReadProxy(bytes32 _synth, address _readProxy)
+        private
+        returns (bytes32)
+    {
+        testReadProxy = IReadProxy(_readProxy);
+        return _synth;
+    }
+
+    // Clones carry the ReadProxy of their original after the synth router
+    // arguments, so they resolve the same local Synthetix
+    function immutableArgs(address _yVault, bytes32 _synth)
+        public
+        view
+        override
+        returns (bytes memory)
+    {
+        return
+            abi.encodePacked(
+                super.immutableArgs(_yVault, _synth),
+                address(_readProxy())
+            );
+    }
+
+    // Only the original has testReadProxy set. ORIGINAL can't tell them apart
+    // here, since the constructor resolves Synthetix through this function
+    function _readProxy() internal view override returns (IReadProxy) {
+        if (address(testReadProxy) != address(0)) {
+            return testReadProxy;
+        }
+        return IReadProxy(ClonesWithImmutableArgs.argAddress(84));
+    }
+
+    function synthPricing(bool _toSynth)
+        external
+        view
+        returns (SynthPricing memory)
+    {
+        return _synthPricing(_toSynth);
+    }
+
+    function sUSDFromSynth(uint256 _amountToReceive)
+        external
+        view
+        returns (uint256)
+    {
+        return _sUSDFromSynth(_amountToReceive);
+    }
+
+    function synthFromSUSD(uint256 _amountToReceive)
+        external
+        view
+        returns (uint256)
+    {
+        return _synthFromSUSD(_amountToReceive);
+    }
+}
@@ -0,0 +1,2 @@
+from .proxy import CachingProxy, RpcError, make_server
+from .store import AbiCache, RpcCache
@@ -0,0 +1,65 @@
+"""
+Caches the mainnet state a forked test run reads, keyed by fork block:
+
+    python -m forkcache serve --upstream $ARCHIVE_RPC --block 12900000
+    python -m forkcache serve --block 12900000 --offline  # replay only
+    python -m forkcache stats --block 12900000
+"""
+import argparse
+import logging
+
+from .proxy import CachingProxy, make_server
+from .store import AbiCache, RpcCache
+
+
+def _serve(args):
+    proxy = CachingProxy(
+        args.upstream, RpcCache(args.cache, args.block), args.block, offline=args.offline
+    )
+    server = make_server(proxy, args.host, args.port)
+    mode = "offline" if args.offline else f"forwarding to {args.upstream}"
+    logging.info("serving block %s on %s:%s, %s", args.block, args.host, args.port, mode)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        logging.info("hits %(hits)s, misses %(misses)s, forwarded %(forwarded)s", proxy.counts)
+
+
+def _stats(args):
+    stats = RpcCache(args.cache, args.block).stats()
+    for method, count in stats.items():
+        print(f"{method:<32} {count:>8}")
+    abis = AbiCache(args.cache, args.block).path
+    print(f"{'abis':<32} {len(list(abis.glob('*.json'))) if abis.exists() else 0:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="proxy the fork node through the cache")
+    serve.add_argument("--upstream", help="archive node to fill the cache from")
+    serve.add_argument("--block", type=int, required=True, help="fork block")
+    serve.add_argument("--cache", default=".fork-cache")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8546)
+    serve.add_argument("--offline", action="store_true", help="fail on a miss")
+    serve.set_defaults(func=_serve)
+
+    stats = commands.add_parser("stats", help="print the cached entries per method")
+    stats.add_argument("--block", type=int, required=True)
+    stats.add_argument("--cache", default=".fork-cache")
+    stats.set_defaults(func=_stats)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    args = parser.parse_args()
+    if args.command == "serve" and not (args.upstream or args.offline):
+        parser.error("serve needs --upstream or --offline")
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+JSON-RPC proxy between ganache and the node it forks from. Reads pinned to the
+fork block are answered from an RpcCache and stored on a miss. With
+``offline=True`` nothing is forwarded and a miss is an error, so a run that
+passes offline read nothing outside the cache.
+"""
+import json
+import logging
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from jsonrpc import RpcError, post
+
+logger = logging.getLogger(__name__)
+
+# position of the block parameter, missing means "latest"
+BLOCK_PARAM = {
+    "eth_getBalance": 1,
+    "eth_getCode": 1,
+    "eth_getTransactionCount": 1,
+    "eth_getStorageAt": 2,
+    "eth_call": 1,
+    "eth_getBlockByNumber": 0,
+}
+# results that do not depend on the block they are read at
+STATIC = {
+    "eth_chainId",
+    "net_version",
+    "eth_getBlockByHash",
+    "eth_getTransactionByHash",
+    "eth_getTransactionReceipt",
+}
+TAGS = {"latest", "pending", "safe", "finalized"}
+
+
+class CachingProxy:
+    def __init__(self, upstream, cache, block, offline=False, timeout=60):
+        assert upstream or offline, "an upstream is needed to fill the cache"
+        self.upstream = upstream
+        self.cache = cache
+        self.block = block
+        self.offline = offline
+        self.timeout = timeout
+        self.counts = Counter()
+        self._lock = threading.Lock()
+
+    def handle(self, call):
+        response = {"jsonrpc": "2.0", "id": call.get("id")}
+        try:
+            response["result"] = self.resolve(call.get("method"), list(call.get("params") or []))
+        except RpcError as error:
+            response["error"] = error.error
+        return response
+
+    def resolve(self, method, params):
+        if method == "eth_blockNumber":
+            return hex(self.block)
+
+        params, cacheable = self._pin(method, params)
+        if not cacheable:
+            self._count("forwarded")
+            return self._forward(method, params)
+
+        result = self.cache.get(method, params)
+        if result is not None:
+            self._count("hits")
+            return result
+        self._count("misses")
+        result = self._forward(method, params)
+        self.cache.put(method, params, result)
+        return result
+
+    def _pin(self, method, params):
+        """Rewrites block tags to the fork block, returns (params, cacheable)."""
+        if method in STATIC:
+            return params, True
+        if method not in BLOCK_PARAM:
+            return params, False
+
+        index = BLOCK_PARAM[method]
+        if len(params) <= index:
+            params = params + [hex(self.block)]
+        elif params[index] in TAGS:
+            params = params[:index] + [hex(self.block)] + params[index + 1 :]
+        elif params[index] == "earliest":
+            return params, True
+
+        # ganache never asks for blocks after the fork, but a node shared
+        # with other tools might
+        return params, int(params[index], 16) <= self.block
+
+    def _forward(self, method, params):
+        if self.offline:
+            raise RpcError({"code": -32000, "message": f"forkcache miss: {method} {params}"})
+
+        response = post(
+            self.upstream,
+            {"jsonrpc": "2.0", "id": 1, "method": method, "params": params},
+            self.timeout,
+        )
+        if "error" in response:
+            raise RpcError(response["error"])
+        return response["result"]
+
+    def _count(self, key):
+        with self._lock:
+            self.counts[key] += 1
+
+
+def make_server(proxy, host="127.0.0.1", port=8546):
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            if isinstance(payload, list):
+                body = [proxy.handle(call) for call in payload]
+            else:
+                body = proxy.handle(payload)
+
+            data = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            logger.debug(format, *args)
+
+    return ThreadingHTTPServer((host, port), Handler)
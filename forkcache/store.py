@@ -0,0 +1,75 @@
+"""
+On-disk cache of the mainnet state a forked run reads, one directory per fork
+block:
+
+    <root>/<block>/rpc.sqlite   JSON-RPC results keyed by method and params
+    <root>/<block>/abis/        verified ABIs, one JSON file per address
+"""
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    method TEXT NOT NULL,
+    result TEXT NOT NULL
+);
+"""
+
+
+def request_key(method, params):
+    # addresses and quantities come in mixed case from different clients
+    return json.dumps([method, params], sort_keys=True, separators=(",", ":")).lower()
+
+
+class RpcCache:
+    def __init__(self, root, block):
+        self.path = Path(root) / str(block)
+        self.path.mkdir(parents=True, exist_ok=True)
+        # shared by the threads of the proxy, writes are serialized below
+        self.conn = sqlite3.connect(str(self.path / "rpc.sqlite"), check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def get(self, method, params):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT result FROM responses WHERE key = ?", (request_key(method, params),)
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def put(self, method, params, result):
+        # null means "not found" (unknown receipt, future block), not a value
+        if result is None:
+            return
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, method, result) VALUES (?, ?, ?)",
+                (request_key(method, params), method, json.dumps(result)),
+            )
+
+    def stats(self):
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT method, COUNT(*) FROM responses GROUP BY method ORDER BY method"
+            ).fetchall()
+        return dict(rows)
+
+
+class AbiCache:
+    def __init__(self, root, block):
+        self.path = Path(root) / str(block) / "abis"
+
+    def get(self, address):
+        path = self.path / f"{address.lower()}.json"
+        if not path.exists():
+            return None
+        return json.loads(path.read_text())
+
+    def put(self, address, name, abi):
+        self.path.mkdir(parents=True, exist_ok=True)
+        (self.path / f"{address.lower()}.json").write_text(
+            json.dumps({"name": name, "abi": abi}, indent=2) + "\n"
+        )
@@ -0,0 +1,104 @@
+"""
+Minimal JSON-RPC client on top of urllib: ``post`` sends one payload, and
+``JsonRpcClient`` adds asyncio, batching and retries on top of it.
+"""
+import asyncio
+import itertools
+import json
+import urllib.error
+import urllib.request
+
+
+class RpcError(Exception):
+    def __init__(self, error):
+        super().__init__(error.get("message", error))
+        self.error = error
+
+
+def post(url, payload, timeout=30):
+    """Sends a call or a batch of calls and returns the decoded response."""
+    request = urllib.request.Request(
+        url, data=json.dumps(payload).encode(), headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+class JsonRpcClient:
+    def __init__(self, url, max_concurrency=8, timeout=30, retries=3):
+        self.url = url
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self._ids = itertools.count(1)
+        self._semaphore = None
+        self._loop = None
+
+    async def request(self, method, params):
+        (result,) = await self.batch([(method, params)])
+        return result
+
+    async def batch(self, calls, raise_errors=True):
+        """
+        Sends ``(method, params)`` calls in one JSON-RPC batch. With
+        ``raise_errors=False`` failed calls come back as ``RpcError`` instances
+        instead of raising.
+        """
+        if not calls:
+            return []
+        payload = [
+            {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params}
+            for method, params in calls
+        ]
+        async with self._limit():
+            responses = await self._post(payload)
+        if isinstance(responses, dict):
+            responses = [responses]
+
+        by_id = {response.get("id"): response for response in responses}
+        results = []
+        for call in payload:
+            response = by_id.get(call["id"], {"error": {"message": "missing response"}})
+            if "error" in response:
+                error = RpcError(response["error"])
+                if raise_errors:
+                    raise error
+                results.append(error)
+            else:
+                results.append(response["result"])
+        return results
+
+    async def block_number(self):
+        return int(await self.request("eth_blockNumber", []), 16)
+
+    async def get_logs(self, from_block, to_block, address, topics):
+        return await self.request(
+            "eth_getLogs",
+            [
+                {
+                    "fromBlock": hex(from_block),
+                    "toBlock": hex(to_block),
+                    "address": address,
+                    "topics": topics,
+                }
+            ],
+        )
+
+    def _limit(self):
+        # the semaphore belongs to the running loop, so the client can be
+        # reused across asyncio.run calls
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _post(self, payload):
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.retries):
+            try:
+                return await loop.run_in_executor(None, post, self.url, payload, self.timeout)
+            except (urllib.error.URLError, OSError):
+                if attempt == self.retries - 1:
+                    raise
+                await asyncio.sleep(0.5 * 2 ** attempt)
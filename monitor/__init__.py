@@ -0,0 +1,5 @@
+from jsonrpc import JsonRpcClient, RpcError
+
+from .indexer import Indexer
+from .lens import RouterLens
+from .store import Store
@@ -0,0 +1,91 @@
+"""
+Indexes a router fleet into SQLite and reports per router PnL:
+
+    python -m monitor run --rpc http://localhost:8545 --db routers.db \\
+        --source <router original or factory> --synthetix <Synthetix proxy>
+    python -m monitor report --db routers.db
+"""
+import argparse
+import asyncio
+import logging
+
+from jsonrpc import JsonRpcClient
+
+from .indexer import Indexer
+from .lens import RouterLens
+from .store import Store
+
+WEI = 10 ** 18
+
+
+def _run(args):
+    client = JsonRpcClient(args.rpc, max_concurrency=args.concurrency)
+    indexer = Indexer(
+        client,
+        Store(args.db),
+        sources=args.source,
+        routers=args.router,
+        synthetix=args.synthetix,
+        start_block=args.start_block,
+        chunk_size=args.chunk_size,
+        confirmations=args.confirmations,
+        lens=RouterLens(client, args.lens, page_size=args.page_size) if args.lens else None,
+    )
+    if args.once:
+        asyncio.run(_once(indexer))
+    else:
+        asyncio.run(indexer.run(args.poll_interval))
+
+
+async def _once(indexer):
+    await indexer.refresh_state(await indexer.sync())
+
+
+def _report(args):
+    def amount(value):
+        return "-" if value is None else f"{value / WEI:,.4f}"
+
+    print(
+        f"{'router':<42} {'harvests':>8} {'pnl':>16} {'unrealized':>16} "
+        f"{'loose synth':>14} {'settled':>8}"
+    )
+    for row in Store(args.db).report():
+        settled = row["waiting_period_finished"]
+        print(
+            f"{row['router']:<42} {row['harvests']:>8} {amount(row['pnl']):>16} "
+            f"{amount(row['unrealized']):>16} {amount(row['loose_synth']):>14} "
+            f"{'-' if settled is None else settled!s:>8}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="index new blocks and refresh router state")
+    run.add_argument("--rpc", required=True)
+    run.add_argument("--db", required=True)
+    run.add_argument("--source", action="append", default=[], help="contract emitting Cloned")
+    run.add_argument("--router", action="append", default=[], help="router to track from the start")
+    run.add_argument("--synthetix", help="contract emitting SynthExchange")
+    run.add_argument("--start-block", type=int, default=0)
+    run.add_argument("--chunk-size", type=int, default=2_000)
+    run.add_argument("--confirmations", type=int, default=5)
+    run.add_argument("--concurrency", type=int, default=8)
+    run.add_argument("--lens", help="RouterLens to read the fleet state with")
+    run.add_argument("--page-size", type=int, default=100, help="routers per RouterLens call")
+    run.add_argument("--poll-interval", type=float, default=12)
+    run.add_argument("--once", action="store_true", help="catch up once and exit")
+    run.set_defaults(func=_run)
+
+    report = commands.add_parser("report", help="print per router PnL and state")
+    report.add_argument("--db", required=True)
+    report.set_defaults(func=_report)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
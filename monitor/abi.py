@@ -0,0 +1,63 @@
+"""
+Topics and selectors used by the monitor, precomputed so it only needs the
+standard library. tests/offline/test_monitor.py checks them against keccak.
+"""
+
+# Cloned(address)
+CLONED = "0x783540fb4221a3238720dc7038937d0d79982bcf895274aa6ad179f82cf0d53c"
+# Harvested(uint256,uint256,uint256,uint256)
+HARVESTED = "0x4c0f499ffe6befa0ca7c826b0916cf87bea98de658013e76938489368d60d509"
+# SynthExchange(address,bytes32,uint256,bytes32,uint256,address)
+SYNTH_EXCHANGE = "0x65b6972c94204d84cffd3a95615743e31270f04fdf251f3dccc705cfbad44776"
+
+SELECTORS = {
+    "vault()": "0xfbfa77cf",
+    "estimatedTotalAssets()": "0xefbb5cb0",
+    "balanceOfWant()": "0xc1a3d44c",
+    "balanceOfSynth()": "0x0c142424",
+    "isWaitingPeriodFinished()": "0xd775f68f",
+    "strategies(address)": "0x39ebf823",
+    "getStates(address[])": "0x6e505263",
+}
+
+# StrategyParams of the 0.4.3 vault
+STRATEGY_PARAMS_TOTAL_DEBT = 6
+
+
+def words(data):
+    """Splits ABI encoded data into 32 bytes words, as ints."""
+    data = data[2:] if data.startswith("0x") else data
+    return [int(data[i : i + 64], 16) for i in range(0, len(data), 64)]
+
+
+def word_to_address(word):
+    return "0x" + format(word, "040x")[-40:]
+
+
+def topic_to_address(topic):
+    return word_to_address(int(topic, 16))
+
+
+def address_to_topic(address):
+    return "0x" + address[2:].lower().rjust(64, "0")
+
+
+def word_to_key(word):
+    """bytes32 currency key (e.g. sBTC) as a string."""
+    return word.to_bytes(32, "big").rstrip(b"\0").decode(errors="replace")
+
+
+def encode_address_array(signature, addresses):
+    """Calldata for a function taking a single address[]."""
+    return (
+        SELECTORS[signature]
+        + format(32, "064x")
+        + format(len(addresses), "064x")
+        + "".join(address[2:].lower().rjust(64, "0") for address in addresses)
+    )
+
+
+def encode_call(signature, *addresses):
+    return SELECTORS[signature] + "".join(
+        address[2:].lower().rjust(64, "0") for address in addresses
+    )
@@ -0,0 +1,207 @@
+"""
+Tails Cloned, Harvested and SynthExchange logs into the Store. Logs are read
+in block chunks and every chunk is written with its checkpoint in a single
+transaction, so a restart resumes where the last run stopped.
+"""
+import asyncio
+import logging
+
+from jsonrpc import RpcError
+
+from . import abi
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT = "logs"
+
+
+class Indexer:
+    def __init__(
+        self,
+        client,
+        store,
+        sources=(),
+        routers=(),
+        synthetix=None,
+        start_block=0,
+        chunk_size=2_000,
+        confirmations=0,
+        address_batch=100,
+        lens=None,
+    ):
+        """
+        ``sources`` emit ``Cloned`` (router originals and factories),
+        ``routers`` are known routers to seed the index with and ``synthetix``
+        is the contract emitting ``SynthExchange``. With a ``RouterLens`` the
+        state of the fleet is read a page of routers per call.
+        """
+        self.client = client
+        self.store = store
+        self.sources = [address.lower() for address in sources]
+        self.synthetix = synthetix.lower() if synthetix else None
+        self.start_block = start_block
+        self.chunk_size = chunk_size
+        self.confirmations = confirmations
+        self.address_batch = address_batch
+        self.lens = lens
+        with store.transaction():
+            store.add_routers([(address, None, None) for address in routers])
+
+    async def sync(self):
+        """Indexes every confirmed block since the checkpoint, returns the last one."""
+        head = await self.client.block_number() - self.confirmations
+        checkpoint = self.store.checkpoint(CHECKPOINT)
+        start = self.start_block if checkpoint is None else checkpoint + 1
+        while start <= head:
+            end = min(start + self.chunk_size - 1, head)
+            await self._index_range(start, end)
+            logger.info("indexed blocks %d-%d", start, end)
+            start = end + 1
+        return head
+
+    async def run(self, poll_interval=12):
+        while True:
+            block = await self.sync()
+            await self.refresh_state(block)
+            await asyncio.sleep(poll_interval)
+
+    async def refresh_state(self, block=None):
+        """Reads assets, debt, loose want/synth and the waiting period of every router."""
+        if block is None:
+            block = await self.client.block_number()
+        routers = self.store.routers()
+        if self.lens is not None:
+            await self._refresh_state_with_lens(routers, block)
+            return
+        vaults = self.store.vaults()
+        states = await asyncio.gather(
+            *(self._read_state(router, vaults.get(router), block) for router in routers)
+        )
+        with self.store.transaction():
+            for router, vault in zip(routers, (state[0] for state in states)):
+                if vault and router not in vaults:
+                    self.store.set_vault(router, vault)
+            self.store.set_states([state[1] for state in states])
+
+    async def _refresh_state_with_lens(self, routers, block):
+        states = await self.lens.states(routers, block)
+        vaults = self.store.vaults()
+        # a router with a reverted read keeps its last stored state
+        states = [state for state in states if state["is_router"] and state["valid"]]
+        with self.store.transaction():
+            for state in states:
+                if state["strategy"] not in vaults:
+                    self.store.set_vault(state["strategy"], state["vault"])
+            self.store.set_states(
+                [
+                    (
+                        state["strategy"],
+                        block,
+                        state["estimated_total_assets"],
+                        state["total_debt"],
+                        state["balance_of_want"],
+                        state["balance_of_synth"] if state["is_synth"] else None,
+                        state["waiting_period_finished"] if state["is_synth"] else None,
+                    )
+                    for state in states
+                ]
+            )
+
+    async def _index_range(self, start, end):
+        cloned = []
+        if self.sources:
+            cloned = await self.client.get_logs(start, end, self.sources, [abi.CLONED])
+        new_routers = [
+            (abi.topic_to_address(log["topics"][1]), log["address"].lower(), int(log["blockNumber"], 16))
+            for log in cloned
+        ]
+        routers = self.store.routers() + [router for router, _, _ in new_routers]
+        batches = [
+            routers[i : i + self.address_batch]
+            for i in range(0, len(routers), self.address_batch)
+        ]
+
+        requests = [
+            self.client.get_logs(start, end, batch, [abi.HARVESTED]) for batch in batches
+        ]
+        if self.synthetix:
+            requests += [
+                self.client.get_logs(
+                    start,
+                    end,
+                    self.synthetix,
+                    [abi.SYNTH_EXCHANGE, [abi.address_to_topic(router) for router in batch]],
+                )
+                for batch in batches
+            ]
+        results = await asyncio.gather(*requests)
+        harvest_logs = [log for logs in results[: len(batches)] for log in logs]
+        exchange_logs = [log for logs in results[len(batches) :] for log in logs]
+
+        with self.store.transaction():
+            self.store.add_routers(new_routers)
+            self.store.add_harvests([_harvest(log) for log in harvest_logs])
+            self.store.add_exchanges([_exchange(log) for log in exchange_logs])
+            self.store.set_checkpoint(CHECKPOINT, end)
+
+    async def _read_state(self, router, vault, block):
+        tag = hex(block)
+        calls = [
+            ("estimatedTotalAssets()", router),
+            ("balanceOfWant()", router),
+            ("balanceOfSynth()", router),
+            ("isWaitingPeriodFinished()", router),
+        ]
+        if vault is None:
+            calls.append(("vault()", router))
+        results = await self.client.batch(
+            [
+                ("eth_call", [{"to": to, "data": abi.encode_call(signature)}, tag])
+                for signature, to in calls
+            ],
+            raise_errors=False,
+        )
+        # plain routers have no synth, their calls revert
+        values = [
+            None if isinstance(result, RpcError) or result in (None, "0x") else abi.words(result)[0]
+            for result in results
+        ]
+        total_assets, loose_want, loose_synth, finished = values[:4]
+        if vault is None and values[4] is not None:
+            vault = abi.word_to_address(values[4])
+
+        total_debt = None
+        if vault is not None:
+            params = await self.client.request(
+                "eth_call",
+                [{"to": vault, "data": abi.encode_call("strategies(address)", router)}, tag],
+            )
+            total_debt = abi.words(params)[abi.STRATEGY_PARAMS_TOTAL_DEBT]
+
+        finished = None if finished is None else bool(finished)
+        return vault, (router, block, total_assets, total_debt, loose_want, loose_synth, finished)
+
+
+def _position(log):
+    return (
+        log["address"].lower(),
+        int(log["blockNumber"], 16),
+        log["transactionHash"],
+        int(log["logIndex"], 16),
+    )
+
+
+def _harvest(log):
+    profit, loss, debt_payment, debt_outstanding = abi.words(log["data"])[:4]
+    return _position(log) + (profit, loss, debt_payment, debt_outstanding)
+
+
+def _exchange(log):
+    from_key, from_amount, to_key, to_amount = abi.words(log["data"])[:4]
+    router = abi.topic_to_address(log["topics"][1])
+    return (router,) + _position(log)[1:] + (
+        abi.word_to_key(from_key),
+        from_amount,
+        abi.word_to_key(to_key),
+        to_amount,
+    )
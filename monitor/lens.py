@@ -0,0 +1,84 @@
+"""
+Client for contracts/RouterLens.sol: reads the state of a whole fleet with
+one eth_call per page of routers, with a bounded number of calls in flight.
+"""
+import asyncio
+
+from . import abi
+
+# RouterLens.RouterState, in declaration order
+FIELDS = (
+    "strategy",
+    "vault",
+    "y_vault",
+    "is_router",
+    "valid",
+    "is_synth",
+    "waiting_period_finished",
+    "estimated_total_assets",
+    "value_of_investment",
+    "balance_of_want",
+    "balance_of_synth",
+    "susd_buffer",
+    "max_loss",
+    "debt_ratio",
+    "total_debt",
+    "last_report",
+)
+ADDRESSES = {"strategy", "vault", "y_vault"}
+BOOLS = {"is_router", "valid", "is_synth", "waiting_period_finished"}
+
+
+class RouterLens:
+    def __init__(self, client, address, page_size=100, max_concurrency=4):
+        """
+        ``page_size`` routers are read per eth_call; keep it low enough for
+        the node's eth_call gas cap (a synth router costs the most to read).
+        """
+        self.client = client
+        self.address = address
+        self.page_size = page_size
+        self.max_concurrency = max_concurrency
+
+    async def states(self, routers, block="latest"):
+        """Returns one dict per router, in the order given."""
+        tag = block if isinstance(block, str) else hex(block)
+        pages = [
+            routers[i : i + self.page_size]
+            for i in range(0, len(routers), self.page_size)
+        ]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def read(page):
+            async with semaphore:
+                return await self.client.request(
+                    "eth_call",
+                    [
+                        {
+                            "to": self.address,
+                            "data": abi.encode_address_array("getStates(address[])", page),
+                        },
+                        tag,
+                    ],
+                )
+
+        results = await asyncio.gather(*(read(page) for page in pages))
+        return [state for result in results for state in decode_states(result)]
+
+
+def decode_states(data):
+    words = abi.words(data)
+    # words[0] is the offset of the array, words[1] its length
+    count = words[1]
+    states = []
+    for i in range(count):
+        values = words[2 + i * len(FIELDS) : 2 + (i + 1) * len(FIELDS)]
+        state = {}
+        for name, value in zip(FIELDS, values):
+            if name in ADDRESSES:
+                value = abi.word_to_address(value)
+            elif name in BOOLS:
+                value = bool(value)
+            state[name] = value
+        states.append(state)
+    return states
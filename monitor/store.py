@@ -0,0 +1,172 @@
+"""
+SQLite index of the router fleet. uint256 amounts are stored as decimal text
+(they do not fit SQLite integers) and summed in Python.
+"""
+import sqlite3
+from contextlib import contextmanager
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    name TEXT PRIMARY KEY,
+    block INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS routers (
+    address TEXT PRIMARY KEY,
+    source TEXT,
+    block INTEGER,
+    vault TEXT
+);
+CREATE TABLE IF NOT EXISTS harvests (
+    router TEXT NOT NULL,
+    block INTEGER NOT NULL,
+    tx TEXT NOT NULL,
+    log_index INTEGER NOT NULL,
+    profit TEXT NOT NULL,
+    loss TEXT NOT NULL,
+    debt_payment TEXT NOT NULL,
+    debt_outstanding TEXT NOT NULL,
+    PRIMARY KEY (tx, log_index)
+);
+CREATE INDEX IF NOT EXISTS harvests_router ON harvests (router);
+CREATE TABLE IF NOT EXISTS exchanges (
+    router TEXT NOT NULL,
+    block INTEGER NOT NULL,
+    tx TEXT NOT NULL,
+    log_index INTEGER NOT NULL,
+    from_key TEXT NOT NULL,
+    from_amount TEXT NOT NULL,
+    to_key TEXT NOT NULL,
+    to_amount TEXT NOT NULL,
+    PRIMARY KEY (tx, log_index)
+);
+CREATE INDEX IF NOT EXISTS exchanges_router ON exchanges (router);
+CREATE TABLE IF NOT EXISTS router_state (
+    router TEXT PRIMARY KEY,
+    block INTEGER NOT NULL,
+    total_assets TEXT,
+    total_debt TEXT,
+    loose_want TEXT,
+    loose_synth TEXT,
+    waiting_period_finished INTEGER
+);
+"""
+
+
+class Store:
+    def __init__(self, path):
+        self.conn = sqlite3.connect(str(path))
+        self.conn.executescript(SCHEMA)
+
+    @contextmanager
+    def transaction(self):
+        with self.conn:
+            yield self
+
+    def checkpoint(self, name):
+        row = self.conn.execute(
+            "SELECT block FROM checkpoints WHERE name = ?", (name,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_checkpoint(self, name, block):
+        self.conn.execute(
+            "INSERT INTO checkpoints (name, block) VALUES (?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET block = excluded.block",
+            (name, block),
+        )
+
+    def add_routers(self, routers):
+        """``routers`` are (address, source, block) tuples, known ones are kept."""
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO routers (address, source, block) VALUES (?, ?, ?)",
+            [(address.lower(), source, block) for address, source, block in routers],
+        )
+
+    def routers(self):
+        return [row[0] for row in self.conn.execute("SELECT address FROM routers ORDER BY rowid")]
+
+    def vaults(self):
+        return dict(self.conn.execute("SELECT address, vault FROM routers WHERE vault IS NOT NULL"))
+
+    def set_vault(self, router, vault):
+        self.conn.execute("UPDATE routers SET vault = ? WHERE address = ?", (vault, router))
+
+    def add_harvests(self, rows):
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO harvests VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [row[:4] + tuple(str(value) for value in row[4:]) for row in rows],
+        )
+
+    def add_exchanges(self, rows):
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO exchanges VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                row[:4] + (row[4], str(row[5]), row[6], str(row[7]))
+                for row in rows
+            ],
+        )
+
+    def set_states(self, rows):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO router_state VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    router,
+                    block,
+                    *(None if value is None else str(value) for value in amounts),
+                    None if finished is None else int(finished),
+                )
+                for router, block, *amounts, finished in rows
+            ],
+        )
+
+    def report(self):
+        """Per router: realized PnL from Harvested events and the last state read."""
+        rows = {
+            router: {
+                "router": router,
+                "harvests": 0,
+                "profit": 0,
+                "loss": 0,
+                "exchanges": 0,
+                "total_assets": None,
+                "total_debt": None,
+                "unrealized": None,
+                "loose_synth": None,
+                "waiting_period_finished": None,
+            }
+            for router in self.routers()
+        }
+        for router, profit, loss in self.conn.execute(
+            "SELECT router, profit, loss FROM harvests"
+        ):
+            if router not in rows:
+                continue
+            row = rows[router]
+            row["harvests"] += 1
+            row["profit"] += int(profit)
+            row["loss"] += int(loss)
+        for router, count in self.conn.execute(
+            "SELECT router, COUNT(*) FROM exchanges GROUP BY router"
+        ):
+            if router in rows:
+                rows[router]["exchanges"] = count
+        for router, _, total_assets, total_debt, _, loose_synth, finished in self.conn.execute(
+            "SELECT * FROM router_state"
+        ):
+            if router not in rows:
+                continue
+            row = rows[router]
+            row["total_assets"] = _int(total_assets)
+            row["total_debt"] = _int(total_debt)
+            if total_assets is not None and total_debt is not None:
+                row["unrealized"] = int(total_assets) - int(total_debt)
+            row["loose_synth"] = _int(loose_synth)
+            row["waiting_period_finished"] = None if finished is None else bool(finished)
+        for row in rows.values():
+            row["pnl"] = row["profit"] - row["loss"]
+        return list(rows.values())
+
+
+def _int(value):
+    return None if value is None else int(value)
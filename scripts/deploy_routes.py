@@ -0,0 +1,200 @@
+"""
+Deploys the routes listed in a YAML manifest (see config/routes.example.yml).
+
+The first plain route and the first synth route are deployed as originals,
+every other route is cloned from them with cloneRouter / cloneSynthetixRouter.
+Transactions are sent back to back with locally tracked nonces and only waited
+for at the end of each stage.
+
+    # estimate the whole plan on a fork, nothing is broadcast
+    brownie run deploy_routes main config/routes.yml true --network mainnet-fork
+    # deploy, the keystore password is read from DEPLOYER_PASSWORD
+    brownie run deploy_routes main config/routes.yml --network mainnet
+"""
+import json
+import os
+from pathlib import Path
+
+import yaml
+from brownie import (
+    RouterStrategy,
+    SynthetixRouterStrategy,
+    accounts,
+    chain,
+    network,
+    web3,
+)
+from eth_abi import encode_single
+
+GAS_MARGIN = 1.2
+
+
+def to_bytes32(name):
+    return encode_single("bytes32", name.encode())
+
+
+def load_manifest(path):
+    manifest = yaml.safe_load(Path(path).read_text())
+    for key in ["deployer", "strategist", "rewards", "keeper", "routes"]:
+        assert key in manifest, f"manifest is missing '{key}'"
+
+    names = set()
+    for route in manifest["routes"]:
+        for key in ["name", "vault", "yvault"]:
+            assert key in route, f"route {route} is missing '{key}'"
+        assert route["name"] not in names, f"duplicated route {route['name']}"
+        names.add(route["name"])
+        if "synth" in route:
+            route.setdefault("susd_buffer", 100)
+        else:
+            assert (
+                "susd_buffer" not in route
+            ), f"{route['name']}: susd_buffer without synth"
+    return manifest
+
+
+class Pipeline:
+    """Sends transactions without waiting for them, nonces are tracked here."""
+
+    def __init__(self, account, gas_price_gwei=None):
+        self.account = account
+        self.gas_price = (
+            None if gas_price_gwei is None else int(gas_price_gwei * 10 ** 9)
+        )
+        self.nonce = account.nonce
+        self.pending = []
+
+    def send(self, label, fn, *args):
+        params = {"from": self.account, "nonce": self.nonce, "required_confs": 0}
+        if self.gas_price is not None:
+            params["gas_price"] = self.gas_price
+        # estimated against the current state, every stage only depends on
+        # the previous ones
+        gas = fn.estimate_gas(*args, {"from": self.account})
+        params["gas_limit"] = int(gas * GAS_MARGIN)
+        self.pending.append((label, fn(*args, params)))
+        self.nonce += 1
+
+    def wait(self):
+        done = []
+        for label, tx in self.pending:
+            tx.wait(1)
+            assert tx.status == 1, f"{label} reverted: {tx.txid}"
+            done.append((label, tx))
+        self.pending = []
+        return done
+
+
+def deploy(manifest, account):
+    pipeline = Pipeline(account, manifest.get("gas_price_gwei"))
+    plain = [route for route in manifest["routes"] if "synth" not in route]
+    synth = [route for route in manifest["routes"] if "synth" in route]
+
+    # stage 1: originals
+    if plain:
+        route = plain[0]
+        pipeline.send(
+            route["name"],
+            RouterStrategy.deploy,
+            route["vault"],
+            route["yvault"],
+            route["name"],
+        )
+    if synth:
+        route = synth[0]
+        pipeline.send(
+            route["name"],
+            SynthetixRouterStrategy.deploy,
+            route["vault"],
+            route["yvault"],
+            route["name"],
+            to_bytes32(route["synth"]),
+            route["susd_buffer"],
+        )
+    receipts = pipeline.wait()
+    originals = {
+        label: contract.at(tx.contract_address)
+        for (label, tx), contract in zip(
+            receipts,
+            [RouterStrategy] * bool(plain) + [SynthetixRouterStrategy] * bool(synth),
+        )
+    }
+
+    # stage 2: roles of the originals and clones
+    roles = [manifest["strategist"], manifest["rewards"], manifest["keeper"]]
+    for original in originals.values():
+        pipeline.send("setKeeper", original.setKeeper, manifest["keeper"])
+        pipeline.send("setRewards", original.setRewards, manifest["rewards"])
+        if manifest["strategist"].lower() != account.address.lower():
+            # last, the deployer can't change anything afterwards
+            pipeline.send(
+                "setStrategist", original.setStrategist, manifest["strategist"]
+            )
+    for route in plain[1:]:
+        original = originals[plain[0]["name"]]
+        pipeline.send(
+            route["name"],
+            original.cloneRouter,
+            route["vault"],
+            *roles,
+            route["yvault"],
+            route["name"],
+        )
+    for route in synth[1:]:
+        original = originals[synth[0]["name"]]
+        pipeline.send(
+            route["name"],
+            original.cloneSynthetixRouter,
+            route["vault"],
+            *roles,
+            route["yvault"],
+            route["name"],
+            to_bytes32(route["synth"]),
+            route["susd_buffer"],
+        )
+    receipts += pipeline.wait()
+
+    deployed = {name: original.address for name, original in originals.items()}
+    for label, tx in receipts:
+        if "Cloned" in tx.events:
+            deployed[label] = tx.events["Cloned"]["clone"]
+    return deployed, receipts
+
+
+def main(manifest_path="config/routes.yml", dry_run="false"):
+    dry_run = str(dry_run).lower() in ["1", "true", "yes"]
+    manifest = load_manifest(manifest_path)
+    print(f"You are using the '{network.show_active()}' network")
+
+    if dry_run:
+        assert (
+            network.show_active().endswith("fork") or chain.id == 1337
+        ), "dry runs only on a local fork"
+        account = accounts.at(manifest["deployer"], force=True)
+    else:
+        account = accounts.load(
+            manifest["account"], os.environ.get("DEPLOYER_PASSWORD")
+        )
+        assert account.address == web3.toChecksumAddress(manifest["deployer"])
+
+    deployed, receipts = deploy(manifest, account)
+
+    total = sum(tx.gas_used for _, tx in receipts)
+    print(f"\n{'step':<40} {'gas used':>12}")
+    for label, tx in receipts:
+        print(f"{label:<40} {tx.gas_used:>12,}")
+    print(f"{'total':<40} {total:>12,}")
+    gas_price = manifest.get("gas_price_gwei") or web3.eth.gas_price / 10 ** 9
+    print(f"cost at {gas_price:.0f} gwei: {total * gas_price / 10 ** 9:.4f} ETH")
+
+    if dry_run:
+        print("\ndry run, nothing was broadcast")
+        return deployed
+
+    print()
+    for name, address in deployed.items():
+        print(f"{name:<40} {address}")
+    output = Path(manifest_path).with_suffix(f".{network.show_active()}.json")
+    output.write_text(json.dumps(deployed, indent=2))
+    print(f"\naddresses written to {output}")
+    return deployed
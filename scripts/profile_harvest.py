@@ -0,0 +1,240 @@
+"""
+Profiles the gas of the harvest path. Runs a scenario on a local fork, folds
+the call trace of every transaction it sends and aggregates the gas by
+internal function and by external callee:
+
+    brownie run profile_harvest main synth 5 --network mainnet-fork
+    brownie run profile_harvest main router 5 30 --network mainnet-fork
+
+The folded stacks are written to reports/profile_<scenario>.folded, one
+"frame;frame;frame gas" line per stack, for flamegraph.pl, inferno or
+speedscope:
+
+    flamegraph.pl --countname gas reports/profile_synth.folded > synth.svg
+"""
+from collections import Counter
+from pathlib import Path
+
+from brownie import (
+    RouterStrategy,
+    SynthetixRouterStrategy,
+    Contract,
+    Wei,
+    ZERO_ADDRESS,
+    accounts,
+    chain,
+    config,
+    network,
+    project,
+)
+from eth_abi import encode_single
+
+REPORTS = Path(__file__).parent.parent / "reports"
+
+# same mainnet contracts as the fork tests
+GOV = "0xFEB4acf3df3cDEA7399794D0869ef76A6EfAff52"
+YVWETH_032 = "0xa9fE4601811213c340e850ea305481afF02f5b28"
+YVWETH_042 = "0xa258C4606Ca8206D8aA700cE2143D7db854D168c"
+WETH = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+WETH_WHALE = "0xc1aae9d18bbe386b102435a8632c8063d31e747c"
+HEALTH_CHECK = "0xddcea799ff1699e98edf118e0629a974df7df012"
+RESOLVER = "0x823bE81bbF96BEc0e25CA13170F5AaCb5B79ba83"
+SBTC_VAULT = "0x8472E9914C0813C4b465927f82E213EA34839173"
+SUSD_WHALE = "0xa5407eae9ba41422680e2e00537571bcc53efbfd"
+SBTC_WHALE = "0x7fc77b5c7614e1533320ea6ddc2eb61fa00a9714"
+
+
+def step_costs(trace):
+    """
+    Gas of every step of a brownie trace. A step costs the gas left before it
+    minus the gas left at the next step of the same frame, so a call is only
+    charged what its callee did not use (access, memory expansion, value
+    transfer) and the callee steps carry the rest.
+    """
+    costs = []
+    calls = []  # index of the call steps waiting for their callee to return
+    for i, step in enumerate(trace):
+        following = trace[i + 1] if i + 1 < len(trace) else None
+        if following is None or following["depth"] < step["depth"]:
+            costs.append(step["gasCost"])
+        elif following["depth"] == step["depth"]:
+            costs.append(step["gas"] - following["gas"])
+        else:
+            costs.append(0)
+            calls.append(i)
+
+        if following is not None and following["depth"] < step["depth"] and calls:
+            call = calls.pop()
+            callee = sum(costs[call + 1 :])
+            costs[call] = trace[call]["gas"] - following["gas"] - callee
+    return costs
+
+
+class Profile:
+    def __init__(self):
+        self.stacks = Counter()
+        self.callees = Counter()
+        self.gas_used = 0
+        self.traced = 0
+        self.transactions = 0
+
+    def add(self, tx):
+        self.add_trace(tx.trace, tx.gas_used)
+
+    def add_trace(self, trace, gas_used):
+        frames = []  # (depth, jumpDepth, fn, entered from another contract)
+        for step, cost in zip(trace, step_costs(trace)):
+            level = (step["depth"], step.get("jumpDepth", 0))
+            while frames and frames[-1][:2] > level:
+                frames.pop()
+            if frames and frames[-1][:2] == level:
+                frames[-1] = (*level, step["fn"], frames[-1][3])
+            else:
+                external = not frames or frames[-1][0] < level[0]
+                frames.append((*level, step["fn"], external))
+
+            self.stacks[";".join(frame[2] for frame in frames)] += cost
+            # the transaction target is the root of every stack, skip it
+            for fn in {frame[2] for frame in frames[1:] if frame[3]}:
+                self.callees[fn] += cost
+            self.traced += cost
+
+        self.gas_used += gas_used
+        self.transactions += 1
+
+    def self_gas(self):
+        totals = Counter()
+        for stack, gas in self.stacks.items():
+            totals[stack.split(";")[-1]] += gas
+        return totals
+
+    def inclusive_gas(self):
+        totals = Counter()
+        for stack, gas in self.stacks.items():
+            for fn in set(stack.split(";")):
+                totals[fn] += gas
+        return totals
+
+    def write_folded(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lines = [f"{stack} {gas}" for stack, gas in sorted(self.stacks.items()) if gas]
+        path.write_text("\n".join(lines) + "\n")
+
+    def print_tables(self, top):
+        for title, totals in [
+            ("self gas by function", self.self_gas()),
+            ("inclusive gas by function", self.inclusive_gas()),
+            ("inclusive gas by external callee", self.callees),
+        ]:
+            print(f"\n{title:<64} {'gas':>12} {'%':>6} {'per tx':>10}")
+            for fn, gas in totals.most_common(top):
+                print(
+                    f"{fn[:64]:<64} {gas:>12,} {100 * gas / self.traced:>6.1f} "
+                    f"{gas // self.transactions:>10,}"
+                )
+        print(f"\n{'traced':<64} {self.traced:>12,}")
+        print(f"{'gas used, with intrinsic gas and refunds':<64} {self.gas_used:>12,}")
+        print(f"{'transactions':<64} {self.transactions:>12}")
+
+
+def wait_settlement():
+    chain.sleep(360 + 1)
+    chain.mine(1)
+
+
+def zero_debt_ratios(vault, gov):
+    for i in range(0, 20):
+        strat_address = vault.withdrawalQueue(i)
+        if ZERO_ADDRESS == strat_address:
+            break
+        vault.updateStrategyDebtRatio(strat_address, 0, {"from": gov})
+
+
+def router_scenario(rounds):
+    gov = accounts.at(GOV, force=True)
+    strategist, keeper = accounts[4], accounts[5]
+    yvweth_032, yvweth_042 = Contract(YVWETH_032), Contract(YVWETH_042)
+    weth, weth_whale = Contract(WETH), accounts.at(WETH_WHALE, force=True)
+
+    strategy = strategist.deploy(
+        RouterStrategy, yvweth_032, yvweth_042, "Route yvWETH 042"
+    )
+    strategy.setKeeper(keeper, {"from": strategist})
+    strategy.setHealthCheck(HEALTH_CHECK, {"from": yvweth_032.governance()})
+    zero_debt_ratios(yvweth_032, gov)
+    yvweth_032.addStrategy(strategy, 10_000, 0, 2 ** 256 - 1, 0, {"from": gov})
+
+    txs = [strategy.harvest({"from": keeper})]
+    for i in range(rounds):
+        weth.transfer(yvweth_042, Wei("10 ether"), {"from": weth_whale})
+        chain.sleep(3600)
+        chain.mine(1)
+        txs.append(strategy.harvest({"from": keeper}))
+    return txs
+
+
+def synth_scenario(rounds):
+    gov = accounts.at(GOV, force=True)
+    rewards, guardian, management, strategist, keeper = accounts[1:6]
+    resolver = Contract(RESOLVER)
+    susd = Contract(resolver.getAddress(encode_single("bytes32", b"ProxyERC20sUSD")))
+    sbtc = Contract(resolver.getAddress(encode_single("bytes32", b"ProxysBTC")))
+    sbtc_vault = Contract(SBTC_VAULT)
+    susd_whale = accounts.at(SUSD_WHALE, force=True)
+    sbtc_whale = accounts.at(SBTC_WHALE, force=True)
+
+    Vault = project.load(
+        Path.home() / ".brownie" / "packages" / config["dependencies"][0]
+    ).Vault
+    susd_vault = guardian.deploy(Vault)
+    susd_vault.initialize(susd, gov, rewards, "", "", guardian, management)
+    susd_vault.setDepositLimit(2 ** 256 - 1, {"from": gov})
+
+    strategy = strategist.deploy(
+        SynthetixRouterStrategy,
+        susd_vault,
+        sbtc_vault,
+        "RoutersUSDtosBTC",
+        encode_single("bytes32", b"ProxysBTC"),
+        100,
+    )
+    strategy.setKeeper(keeper, {"from": strategist})
+    susd_vault.addStrategy(strategy, 10_000, 0, 2 ** 256 - 1, 0, {"from": gov})
+
+    susd.approve(susd_vault, 2 ** 256 - 1, {"from": susd_whale})
+    susd_vault.deposit(susd.balanceOf(susd_whale) // 2, {"from": susd_whale})
+    wait_settlement()
+
+    # invest, then one profit harvest and deposit of the settled synth per round
+    txs = [strategy.harvest({"from": keeper})]
+    wait_settlement()
+    txs.append(strategy.depositInVault({"from": keeper}))
+    for i in range(rounds):
+        profit = sbtc.balanceOf(sbtc_whale) // 100
+        sbtc.transfer(sbtc_vault, profit, {"from": sbtc_whale})
+        chain.sleep(3600)
+        chain.mine(1)
+        txs.append(strategy.harvest({"from": keeper}))
+        wait_settlement()
+        if strategy.balanceOfSynth() > 0:
+            txs.append(strategy.depositInVault({"from": keeper}))
+    return txs
+
+
+SCENARIOS = {"router": router_scenario, "synth": synth_scenario}
+
+
+def main(scenario="synth", rounds=5, top=25):
+    assert network.show_active() != "mainnet", "profile on a local fork"
+    print(f"You are using the '{network.show_active()}' network")
+
+    txs = SCENARIOS[scenario](int(rounds))
+    profile = Profile()
+    for tx in txs:
+        profile.add(tx)
+
+    output = REPORTS / f"profile_{scenario}.folded"
+    profile.write_folded(output)
+    profile.print_tables(int(top))
+    print(f"\nfolded stacks written to {output}")
+    return profile
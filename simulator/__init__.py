@@ -0,0 +1,2 @@
+from .paths import fee_schedules, gbm_prices, user_flows
+from .policy import BufferSimulation, SimulationResult
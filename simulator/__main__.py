@@ -0,0 +1,60 @@
+"""
+Sweeps susdBuffer values over random price paths and user flows:
+
+    python -m simulator --buffers 0,50,100,200,500 --paths 5000 --steps 365
+"""
+import argparse
+import time
+
+from .paths import fee_schedules, gbm_prices, user_flows
+from .policy import BufferSimulation
+
+WEI = 10 ** 18
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--buffers", default="0,50,100,200,500,1000")
+    parser.add_argument("--paths", type=int, default=5_000)
+    parser.add_argument("--steps", type=int, default=365)
+    parser.add_argument("--harvest-interval", type=int, default=86_400)
+    parser.add_argument("--price", type=float, default=50_000.0)
+    parser.add_argument("--volatility", type=float, default=0.8)
+    parser.add_argument("--apr", type=float, default=0.05, help="yVault yield")
+    parser.add_argument("--tvl", type=float, default=1_000_000.0, help="initial deposit in sUSD")
+    parser.add_argument("--fees", default="0.001,0.003,0.005", help="synth exchange fees to draw from")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    buffers = [int(b) for b in args.buffers.split(",")]
+    dt = args.harvest_interval / (365 * 86_400)
+    started = time.perf_counter()
+
+    prices = gbm_prices(args.paths, args.steps, args.price, volatility=args.volatility, dt=dt, seed=args.seed)
+    deposits, withdrawals = user_flows(args.paths, args.steps, args.tvl * WEI, seed=args.seed + 1)
+    fees = fee_schedules(args.paths, [float(f) for f in args.fees.split(",")], seed=args.seed + 2)
+
+    simulation = BufferSimulation(buffers, args.paths, harvest_interval=args.harvest_interval)
+    result = simulation.run(
+        prices,
+        deposits=deposits,
+        withdrawals=withdrawals,
+        yields=args.apr * dt,
+        fee_to_synth=fees,
+    )
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"{len(buffers)} buffers x {args.paths} paths x {args.steps} harvests in {elapsed:.2f}s\n"
+    )
+    print(f"{'buffer':>7} {'fees (sUSD)':>14} {'idle %':>8} {'unmet %':>8} {'unmet p95 %':>12} {'reverts':>8}")
+    for row in result.summary():
+        print(
+            f"{row['buffer']:>7} {row['fees_paid_mean'] / WEI:>14,.2f} "
+            f"{row['idle_fraction_mean'] * 100:>8.3f} {row['unmet_fraction_mean'] * 100:>8.3f} "
+            f"{row['unmet_fraction_p95'] * 100:>12.3f} {row['reverted_harvests_mean']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
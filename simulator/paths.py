@@ -0,0 +1,44 @@
+"""Random inputs for BufferSimulation.run, all shaped (n_paths, n_steps)."""
+import numpy as np
+
+SECONDS_PER_YEAR = 365 * 86_400
+
+
+def gbm_prices(n_paths, n_steps, price, drift=0.0, volatility=0.8, dt=1 / 365, seed=None):
+    """Geometric brownian motion of the synth price in sUSD."""
+    rng = np.random.default_rng(seed)
+    shocks = rng.standard_normal((n_paths, n_steps))
+    log_returns = (drift - volatility ** 2 / 2) * dt + volatility * np.sqrt(dt) * shocks
+    return price * np.exp(np.cumsum(log_returns, axis=1))
+
+
+def user_flows(
+    n_paths,
+    n_steps,
+    initial_deposit,
+    deposit_rate=0.01,
+    withdraw_rate=0.01,
+    size=0.005,
+    seed=None,
+):
+    """
+    Deposits and withdrawals in sUSD. The first step deposits
+    ``initial_deposit``; afterwards each step has a deposit with probability
+    ``deposit_rate`` and a withdrawal with probability ``withdraw_rate``, both
+    exponentially sized with mean ``size * initial_deposit``.
+    """
+    rng = np.random.default_rng(seed)
+    mean = size * initial_deposit
+    deposits = rng.exponential(mean, (n_paths, n_steps))
+    deposits *= rng.random((n_paths, n_steps)) < deposit_rate
+    withdrawals = rng.exponential(mean, (n_paths, n_steps))
+    withdrawals *= rng.random((n_paths, n_steps)) < withdraw_rate
+    deposits[:, 0] = initial_deposit
+    withdrawals[:, 0] = 0
+    return deposits, withdrawals
+
+
+def fee_schedules(n_paths, fees, seed=None):
+    """Draws a constant fee per path from ``fees``, shaped (n_paths, 1)."""
+    rng = np.random.default_rng(seed)
+    return rng.choice(np.asarray(fees, dtype=np.float64), size=(n_paths, 1))
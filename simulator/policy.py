@@ -0,0 +1,376 @@
+"""
+Vectorized model of the SynthetixRouterStrategy buffer policy.
+
+Every scenario is one (buffer, path) pair and the whole grid is stepped at
+once: state is kept in ``(n_buffers, n_paths)`` arrays and each harvest is a
+handful of masked NumPy operations. The accounting mirrors the contracts:
+
+* ``BaseStrategy.harvest`` / ``Vault.report`` (0.4.3) for debt, credit and
+  losses, with a single strategy in the vault.
+* ``SynthetixRouterStrategy.prepareReturn``, ``adjustPosition`` and
+  ``_withdrawSomeWant`` for the buffer, exchanges and yVault withdrawals.
+* ``Exchanger`` fees and waiting period. A harvest that would exchange sUSD
+  while sUSD is still in its waiting period reverts on chain, here it is
+  rolled back and counted in ``reverted_harvests``.
+
+Amounts are in wei (as floats) so ``DUST_THRESHOLD`` keeps its meaning.
+Vault withdrawals are never liquidated through the yVault
+(``liquidatePosition`` does not exchange), so anything above the vault idle
+plus the loose sUSD is counted as unmet instead of being booked as a loss.
+"""
+from dataclasses import dataclass, fields, replace
+
+import numpy as np
+
+DENOMINATOR = 10_000
+DUST_THRESHOLD = 10_000
+MAX_BPS = 10_000
+
+
+@dataclass
+class State:
+    vault_idle: np.ndarray
+    debt: np.ndarray  # strategy totalDebt
+    debt_ratio: np.ndarray
+    susd: np.ndarray  # loose sUSD in the strategy
+    synth: np.ndarray  # loose synth in the strategy
+    invested: np.ndarray  # synth held by the yVault for the strategy
+    last_to_synth: np.ndarray  # last exchange into synth (start of its waiting period)
+    last_to_susd: np.ndarray  # last exchange into sUSD
+
+    def where(self, mask, other):
+        return State(
+            **{
+                f.name: np.where(mask, getattr(self, f.name), getattr(other, f.name))
+                for f in fields(self)
+            }
+        )
+
+
+@dataclass
+class Market:
+    price: np.ndarray  # sUSD per synth
+    fee_to_synth: np.ndarray  # exchange fee sUSD => synth, as a fraction
+    fee_to_susd: np.ndarray  # exchange fee synth => sUSD, as a fraction
+    rate_invalid: np.ndarray
+
+    def susd_from_synth(self, amount):
+        # Synthetix._sUSDFromSynth, priced with the sUSD => synth fee
+        return amount * self.price / (1 - self.fee_to_synth)
+
+    def synth_from_susd(self, amount):
+        # Synthetix._synthFromSUSD, priced with the synth => sUSD fee
+        return amount / self.price / (1 - self.fee_to_susd)
+
+    def synth_to_susd(self, amount):
+        # Synthetix._synthToSUSD (Exchanger.getAmountsForExchange)
+        return amount * self.price * (1 - self.fee_to_susd)
+
+
+@dataclass
+class SimulationResult:
+    buffers: np.ndarray
+    steps: int
+    fees_paid: np.ndarray  # sUSD paid in exchange fees
+    idle_capital: np.ndarray  # time average of loose sUSD and loose synth, in sUSD
+    idle_fraction: np.ndarray  # idle_capital over the average estimated assets
+    requested_withdrawals: np.ndarray
+    unmet_withdrawals: np.ndarray
+    reverted_harvests: np.ndarray
+    final_assets: np.ndarray  # estimatedTotalAssets after the last step
+
+    def summary(self, percentiles=(5, 50, 95)):
+        """Per buffer value, the mean and percentiles of every metric over the paths."""
+        metrics = {
+            "fees_paid": self.fees_paid,
+            "idle_capital": self.idle_capital,
+            "idle_fraction": self.idle_fraction,
+            "unmet_withdrawals": self.unmet_withdrawals,
+            "unmet_fraction": np.divide(
+                self.unmet_withdrawals,
+                self.requested_withdrawals,
+                out=np.zeros_like(self.unmet_withdrawals),
+                where=self.requested_withdrawals > 0,
+            ),
+            "reverted_harvests": self.reverted_harvests,
+            "final_assets": self.final_assets,
+        }
+        rows = []
+        for i, buffer in enumerate(self.buffers):
+            row = {"buffer": int(buffer)}
+            for name, values in metrics.items():
+                row[f"{name}_mean"] = float(values[i].mean())
+                for q, value in zip(percentiles, np.percentile(values[i], percentiles)):
+                    row[f"{name}_p{q}"] = float(value)
+            rows.append(row)
+        return rows
+
+
+class BufferSimulation:
+    """
+    Steps a grid of ``len(buffers)`` x ``n_paths`` strategies through harvests.
+
+    ``step`` takes per-path arrays (or scalars) for one harvest interval, so a
+    single path can be driven side by side with a chain; ``run`` feeds whole
+    ``(n_paths, n_steps)`` arrays.
+    """
+
+    def __init__(
+        self,
+        buffers,
+        n_paths,
+        harvest_interval=86_400,
+        waiting_period=360,
+        keeper_deposits=True,
+        debt_ratio=MAX_BPS,
+    ):
+        self.buffers = np.asarray(buffers, dtype=np.float64)
+        self.n_paths = n_paths
+        self.harvest_interval = harvest_interval
+        self.waiting_period = waiting_period
+        self.keeper_deposits = keeper_deposits
+        self.now = 0.0
+
+        shape = (len(self.buffers), n_paths)
+        never = np.full(shape, -np.inf)
+        self.state = State(
+            vault_idle=np.zeros(shape),
+            debt=np.zeros(shape),
+            debt_ratio=np.full(shape, float(debt_ratio)),
+            susd=np.zeros(shape),
+            synth=np.zeros(shape),
+            invested=np.zeros(shape),
+            last_to_synth=never,
+            last_to_susd=never.copy(),
+        )
+        self.fees_paid = np.zeros(shape)
+        self.idle_time = np.zeros(shape)
+        self.assets_time = np.zeros(shape)
+        self.requested = np.zeros(shape)
+        self.unmet = np.zeros(shape)
+        self.reverted = np.zeros(shape, dtype=np.int64)
+        self.market = None
+        self.steps = 0
+
+    def run(
+        self,
+        prices,
+        deposits=0.0,
+        withdrawals=0.0,
+        yields=0.0,
+        fee_to_synth=0.0,
+        fee_to_susd=0.0,
+        rate_invalid=False,
+    ):
+        """
+        Runs every step of ``prices`` (shape ``(n_paths, n_steps)``). The other
+        inputs broadcast against it, e.g. a ``(n_paths, 1)`` fee schedule.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        inputs = np.broadcast_arrays(
+            prices, deposits, withdrawals, yields, fee_to_synth, fee_to_susd, rate_invalid
+        )
+        for t in range(prices.shape[1]):
+            self.step(*(x[:, t] for x in inputs))
+        return self.result()
+
+    def step(
+        self,
+        price,
+        deposit=0.0,
+        withdrawal=0.0,
+        yield_=0.0,
+        fee_to_synth=0.0,
+        fee_to_susd=0.0,
+        rate_invalid=False,
+    ):
+        """
+        One harvest interval: the yVault accrues ``yield_`` (as a fraction),
+        users deposit and withdraw sUSD, the strategy is harvested and, with
+        ``keeper_deposits``, a keeper tends the strategy once the waiting
+        period is over.
+        """
+        market = Market(
+            price=np.asarray(price, dtype=np.float64),
+            fee_to_synth=np.asarray(fee_to_synth, dtype=np.float64),
+            fee_to_susd=np.asarray(fee_to_susd, dtype=np.float64),
+            rate_invalid=np.asarray(rate_invalid, dtype=bool),
+        )
+        s = self.state
+        s.invested = s.invested * (1 + np.asarray(yield_, dtype=np.float64))
+
+        self._flows(
+            np.asarray(deposit, dtype=np.float64),
+            np.asarray(withdrawal, dtype=np.float64),
+        )
+        self._harvest(market)
+
+        if self.keeper_deposits:
+            self._deposit_in_vault(
+                self.state, self.now + self.waiting_period, self.state.synth > 0
+            )
+
+        s = self.state
+        loose = s.susd + market.susd_from_synth(s.synth)
+        self.idle_time += loose
+        self.assets_time += loose + market.susd_from_synth(s.invested)
+        self.market = market
+        self.now += self.harvest_interval
+        self.steps += 1
+
+    def estimated_total_assets(self):
+        s = self.state
+        if self.market is None:
+            return s.susd.copy()
+        return s.susd + self.market.susd_from_synth(s.synth + s.invested)
+
+    def result(self):
+        steps = max(self.steps, 1)
+        return SimulationResult(
+            buffers=self.buffers,
+            steps=self.steps,
+            fees_paid=self.fees_paid,
+            idle_capital=self.idle_time / steps,
+            idle_fraction=np.divide(
+                self.idle_time,
+                self.assets_time,
+                out=np.zeros_like(self.idle_time),
+                where=self.assets_time > 0,
+            ),
+            requested_withdrawals=self.requested,
+            unmet_withdrawals=self.unmet,
+            reverted_harvests=self.reverted,
+            final_assets=self.estimated_total_assets(),
+        )
+
+    def _flows(self, deposit, withdrawal):
+        # Vault.deposit / Vault.withdraw, the strategy only pays from its loose sUSD
+        s = self.state
+        s.vault_idle = s.vault_idle + deposit
+
+        servable = s.vault_idle + np.minimum(s.susd, s.debt)
+        served = np.minimum(withdrawal, servable)
+        from_strategy = np.maximum(served - s.vault_idle, 0)
+
+        s.vault_idle = s.vault_idle - (served - from_strategy)
+        s.susd = s.susd - from_strategy
+        s.debt = s.debt - from_strategy
+        self.requested += withdrawal
+        self.unmet += withdrawal - served
+
+    def _harvest(self, market):
+        before = self.state
+        s = replace(before)
+        fees = np.zeros_like(s.susd)
+
+        debt_outstanding = self._debt_outstanding(s)
+
+        # prepareReturn
+        assets = s.susd + market.susd_from_synth(s.synth + s.invested)
+        debt_payment = np.minimum(debt_outstanding, s.susd)
+        in_profit = s.debt <= assets
+        profit = np.where(in_profit, s.susd - debt_payment, 0)
+        loss = np.where(in_profit, 0, s.debt - assets)
+
+        # Vault.report
+        ratio_change = np.minimum(
+            np.divide(
+                loss * s.debt_ratio,
+                s.debt,
+                out=np.zeros_like(loss),
+                where=s.debt > 0,
+            ),
+            s.debt_ratio,
+        )
+        s.debt_ratio = s.debt_ratio - ratio_change
+        s.debt = s.debt - loss
+        debt_payment = np.minimum(debt_payment, self._debt_outstanding(s))
+        s.debt = s.debt - debt_payment
+        credit = self._credit_available(s)
+        s.debt = s.debt + credit
+        to_strategy = credit - (profit + debt_payment)
+        s.susd = s.susd + to_strategy
+        s.vault_idle = s.vault_idle - to_strategy
+
+        # adjustPosition
+        loose_synth = s.synth
+        buffer = s.debt * self.buffers[:, None] / DENOMINATOR
+        susd_to_invest = np.maximum(s.susd - buffer, 0)
+        susd_needed = np.where(susd_to_invest == 0, buffer - s.susd, 0)
+        # an invalid rate can't price the refill, only loose synth is deposited
+        synth_to_sell = np.where(
+            market.rate_invalid, 0, market.synth_from_susd(susd_needed)
+        )
+        synth_unlocked = self.now >= s.last_to_synth + self.waiting_period
+
+        self._deposit_in_vault(s, self.now, synth_to_sell == 0)
+        exchange = (synth_to_sell == 0) & (susd_to_invest > 0) & ~market.rate_invalid
+        # the exchange out of sUSD reverts during its waiting period
+        reverted = exchange & (self.now < s.last_to_susd + self.waiting_period)
+        received = susd_to_invest / market.price * (1 - market.fee_to_synth)
+        s.susd = np.where(exchange, s.susd - susd_to_invest, s.susd)
+        s.synth = np.where(exchange, s.synth + received, s.synth)
+        s.last_to_synth = np.where(exchange, self.now, s.last_to_synth)
+        fees += np.where(exchange, susd_to_invest * market.fee_to_synth, 0)
+
+        refill = synth_to_sell >= DUST_THRESHOLD
+        available = market.synth_to_susd(loose_synth)
+        susd_to_withdraw = np.where(
+            refill & (susd_needed > available), susd_needed - available, 0
+        )
+        fees += self._withdraw_some_want(
+            s, market, susd_to_withdraw, synth_unlocked
+        )
+
+        self.state = before.where(reverted, s)
+        self.fees_paid += np.where(reverted, 0, fees)
+        self.reverted += reverted
+
+    def _withdraw_some_want(self, s, market, amount, synth_unlocked):
+        # SynthetixRouterStrategy._withdrawSomeWant with performExchanges,
+        # which returns before touching the yVault when the rate is invalid
+        active = (s.susd < amount) & ~market.rate_invalid
+        synth_amount = market.synth_from_susd(amount - s.susd)
+        can_exchange = active & synth_unlocked
+
+        from_loose = can_exchange & (synth_amount <= s.synth)
+        fees = self._exchange_to_susd(
+            s, market, np.where(from_loose, synth_amount, 0)
+        )
+
+        from_vault = active & ~from_loose
+        synth_amount = np.where(can_exchange, synth_amount - s.synth, synth_amount)
+        withdrawn = np.where(from_vault, np.minimum(synth_amount, s.invested), 0)
+        s.invested = s.invested - withdrawn
+        s.synth = s.synth + withdrawn
+
+        sell_all = from_vault & can_exchange & (s.synth > DUST_THRESHOLD)
+        fees += self._exchange_to_susd(s, market, np.where(sell_all, s.synth, 0))
+        return fees
+
+    def _exchange_to_susd(self, s, market, amount):
+        value = amount * market.price
+        s.synth = s.synth - amount
+        s.susd = s.susd + value * (1 - market.fee_to_susd)
+        s.last_to_susd = np.where(amount > 0, self.now, s.last_to_susd)
+        return value * market.fee_to_susd
+
+    def _deposit_in_vault(self, s, now, mask):
+        # depositInVault
+        mask = (
+            mask
+            & (s.synth > DUST_THRESHOLD)
+            & (now >= s.last_to_synth + self.waiting_period)
+        )
+        s.invested = np.where(mask, s.invested + s.synth, s.invested)
+        s.synth = np.where(mask, 0, s.synth)
+
+    @staticmethod
+    def _debt_outstanding(s):
+        limit = s.debt_ratio * (s.vault_idle + s.debt) / MAX_BPS
+        return np.where(s.debt_ratio == 0, s.debt, np.maximum(s.debt - limit, 0))
+
+    @staticmethod
+    def _credit_available(s):
+        limit = s.debt_ratio * (s.vault_idle + s.debt) / MAX_BPS
+        return np.clip(limit - s.debt, 0, s.vault_idle)
@@ -3,12 +3,7 @@ from brownie import config, Contract, ZERO_ADDRESS
 from eth_abi import encode_single
 
 
-@pytest.fixture(scope="function", autouse=True)
-def isolate(fn_isolation):
-    pass
-
-
-@pytest.fixture
+@pytest.fixture(scope="session")
 def susd_vault(pm, gov, rewards, guardian, management, susd):
     Vault = pm(config["dependencies"][0]).Vault
     vault = guardian.deploy(Vault)
@@ -19,12 +14,12 @@ def susd_vault(pm, gov, rewards, guardian, management, susd):
     # yield Contract("0xa5cA62D95D24A4a350983D5B8ac4EB8638887396")
 
 
-@pytest.fixture
-def sbtc_vault():
-    yield Contract("0x8472E9914C0813C4b465927f82E213EA34839173")
+@pytest.fixture(scope="session")
+def sbtc_vault(load_contract):
+    yield load_contract("0x8472E9914C0813C4b465927f82E213EA34839173")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def synth_strategy(
     strategist, keeper, susd_vault, sbtc_vault, SynthetixRouterStrategy, gov
 ):
@@ -50,36 +45,38 @@ def synth_strategy(
     yield strategy
 
 
-@pytest.fixture
-def resolver():
-    yield Contract("0x823bE81bbF96BEc0e25CA13170F5AaCb5B79ba83")
+@pytest.fixture(scope="session")
+def resolver(load_contract):
+    yield load_contract("0x823bE81bbF96BEc0e25CA13170F5AaCb5B79ba83")
 
 
-@pytest.fixture
-def susd(resolver):
-    yield Contract(resolver.getAddress(encode_single("bytes32", b"ProxyERC20sUSD")))
+@pytest.fixture(scope="session")
+def susd(load_contract, resolver):
+    yield load_contract(
+        resolver.getAddress(encode_single("bytes32", b"ProxyERC20sUSD"))
+    )
 
 
-@pytest.fixture
-def sbtc(resolver):
-    yield Contract(resolver.getAddress(encode_single("bytes32", b"ProxysBTC")))
+@pytest.fixture(scope="session")
+def sbtc(load_contract, resolver):
+    yield load_contract(resolver.getAddress(encode_single("bytes32", b"ProxysBTC")))
 
 
-@pytest.fixture
-def wbtc():
-    yield Contract("0x2260fac5e5542a773aa44fbcfedf7c193bc2c599")
+@pytest.fixture(scope="session")
+def wbtc(load_contract):
+    yield load_contract("0x2260fac5e5542a773aa44fbcfedf7c193bc2c599")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def susd_whale(accounts):
     yield accounts.at("0xa5407eae9ba41422680e2e00537571bcc53efbfd", force=True)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sbtc_whale(accounts):
     yield accounts.at("0x7fc77b5c7614e1533320ea6ddc2eb61fa00a9714", force=True)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def wbtc_whale(accounts):
     yield accounts.at("0x7fc77b5c7614e1533320ea6ddc2eb61fa00a9714", force=True)
@@ -0,0 +1,93 @@
+import pytest
+from brownie import chain
+
+
+def wait_settlement():
+    chain.sleep(360 + 1)
+    chain.mine(1)
+
+
+@pytest.fixture
+def invested(synth_strategy, susd_vault, susd, susd_whale, gov):
+    susd.approve(susd_vault, 2 ** 256 - 1, {"from": susd_whale})
+    susd_vault.deposit(susd.balanceOf(susd_whale) // 2, {"from": susd_whale})
+    wait_settlement()
+    tx = synth_strategy.harvest({"from": gov})
+    yield tx
+
+
+def test_gas_harvest_invest(synth_strategy, invested, sbtc, gas_recorder):
+    assert sbtc.balanceOf(synth_strategy) > 0
+
+    gas_recorder.record("SynthetixRouterStrategy.harvest", "invest", invested)
+
+
+def test_gas_harvest_noop(synth_strategy, invested, gov, gas_recorder):
+    wait_settlement()
+    tx = synth_strategy.harvest({"from": gov})
+
+    gas_recorder.record("SynthetixRouterStrategy.harvest", "noop", tx)
+
+
+def test_gas_deposit_in_vault(synth_strategy, invested, gov, sbtc, gas_recorder):
+    wait_settlement()
+    tx = synth_strategy.depositInVault({"from": gov})
+    assert sbtc.balanceOf(synth_strategy) == 0
+
+    gas_recorder.record("SynthetixRouterStrategy.depositInVault", "deposit", tx)
+
+
+def test_gas_harvest_deposit_loose_synth(
+    synth_strategy, invested, susd_vault, susd_whale, gov, sbtc, gas_recorder
+):
+    wait_settlement()
+    susd_vault.deposit({"from": susd_whale})
+    wait_settlement()
+
+    tx = synth_strategy.harvest({"from": gov})
+    assert synth_strategy.valueOfInvestment() > 0
+
+    gas_recorder.record("SynthetixRouterStrategy.harvest", "deposit_loose_synth", tx)
+
+
+def test_gas_harvest_refill_buffer(synth_strategy, invested, gov, gas_recorder):
+    wait_settlement()
+    synth_strategy.depositInVault({"from": gov})
+    synth_strategy.updateSUSDBuffer(5_000, {"from": gov})
+    wait_settlement()
+
+    before = synth_strategy.balanceOfWant()
+    tx = synth_strategy.harvest({"from": gov})
+    assert synth_strategy.balanceOfWant() > before
+
+    gas_recorder.record("SynthetixRouterStrategy.harvest", "refill_buffer", tx)
+
+
+def test_gas_withdraw_exchange(synth_strategy, invested, gov, gas_recorder):
+    wait_settlement()
+    synth_strategy.depositInVault({"from": gov})
+    wait_settlement()
+
+    amount = synth_strategy.estimatedTotalAssets() // 10
+    tx = synth_strategy.manualRemoveLiquidity(amount, {"from": gov})
+
+    gas_recorder.record("SynthetixRouterStrategy.withdrawSomeWant", "exchange", tx)
+
+
+def test_gas_withdraw_no_exchange(
+    synth_strategy, invested, susd_vault, susd_whale, gas_recorder
+):
+    # asks for more than the loose sUSD, liquidatePosition does not exchange
+    shares = synth_strategy.balanceOfWant() * 2
+    tx = susd_vault.withdraw(shares, susd_whale, 10_000, {"from": susd_whale})
+
+    gas_recorder.record("SynthetixRouterStrategy.withdrawSomeWant", "no_exchange", tx)
+
+
+def test_gas_tend_deposit(synth_strategy, invested, keeper, sbtc, gas_recorder):
+    wait_settlement()
+    assert synth_strategy.tendTrigger(0)
+    tx = synth_strategy.tend({"from": keeper})
+    assert sbtc.balanceOf(synth_strategy) == 0
+
+    gas_recorder.record("SynthetixRouterStrategy.tend", "deposit", tx)
@@ -6,11 +6,11 @@ DUST_THRESHOLD = 10_000
 
 
 def test_sbtc_router_deploy_with_profit(
-    SynthetixRouterStrategy, strategist, sbtc, sbtc_whale
+    SynthetixRouterStrategy, strategist, sbtc, sbtc_whale, load_contract
 ):
 
-    hedging_vault = Contract("0xcE0F1Ef5aAAB82547acc699d3Ab93c069bb6e547")
-    sbtc_vault = Contract("0x8472E9914C0813C4b465927f82E213EA34839173")
+    hedging_vault = load_contract("0xcE0F1Ef5aAAB82547acc699d3Ab93c069bb6e547")
+    sbtc_vault = load_contract("0x8472E9914C0813C4b465927f82E213EA34839173")
     gov = accounts.at(hedging_vault.governance(), True)
 
     strategy = strategist.deploy(
@@ -22,7 +22,7 @@ def test_sbtc_router_deploy_with_profit(
         100,
     )
 
-    susd_router = Contract(hedging_vault.withdrawalQueue(0))
+    susd_router = load_contract(hedging_vault.withdrawalQueue(0))
     hedging_vault.updateStrategyDebtRatio(susd_router, 8_000, {"from": gov})
 
     susd_router.setMaxLoss(10_000, {"from": gov})
@@ -103,11 +103,17 @@ def test_sbtc_router_deploy_with_profit(
 
 
 def test_sbtc_router_deploy_with_loss(
-    SynthetixRouterStrategy, strategist, sbtc, sbtc_whale, susd, susd_whale
+    SynthetixRouterStrategy,
+    strategist,
+    sbtc,
+    sbtc_whale,
+    susd,
+    susd_whale,
+    load_contract,
 ):
 
-    hedging_vault = Contract("0xcE0F1Ef5aAAB82547acc699d3Ab93c069bb6e547")
-    sbtc_vault = Contract("0x8472E9914C0813C4b465927f82E213EA34839173")
+    hedging_vault = load_contract("0xcE0F1Ef5aAAB82547acc699d3Ab93c069bb6e547")
+    sbtc_vault = load_contract("0x8472E9914C0813C4b465927f82E213EA34839173")
     gov = accounts.at(hedging_vault.governance(), True)
 
     strategy = strategist.deploy(
@@ -120,7 +126,7 @@ def test_sbtc_router_deploy_with_loss(
     )
 
     susd.approve(hedging_vault, 2 ** 256 - 1, {"from": susd_whale})
-    susd_router = Contract(hedging_vault.withdrawalQueue(0))
+    susd_router = load_contract(hedging_vault.withdrawalQueue(0))
     hedging_vault.updateStrategyDebtRatio(susd_router, 8_000, {"from": gov})
 
     susd_router.setMaxLoss(10_000, {"from": gov})
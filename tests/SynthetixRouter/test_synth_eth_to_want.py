@@ -0,0 +1,21 @@
+import pytest
+from brownie import chain, Contract, Wei
+
+
+def test_eth_to_want_synth(synth_strategy, susd, gov, keeper, load_contract):
+    uniswap = load_contract(synth_strategy.uniswapRouter())
+    call_cost = Wei("0.01 ether")
+    live = uniswap.getAmountsOut(Wei("1 ether"), [synth_strategy.weth(), susd])[-1]
+
+    assert synth_strategy.ethToWant(call_cost) == call_cost * live // 10 ** 18
+
+    synth_strategy.updateEthToWantCache({"from": keeper})
+    assert synth_strategy.cachedEthToWant() == live
+    assert synth_strategy.ethToWant(call_cost) == call_cost * live // 10 ** 18
+
+    # refreshed once the interval passes
+    synth_strategy.setEthToWantCacheInterval(3600, {"from": gov})
+    chain.sleep(3601)
+    chain.mine(1)
+    synth_strategy.updateEthToWantCache({"from": keeper})
+    assert synth_strategy.ethToWantCachedAt() == chain[-1].timestamp
@@ -0,0 +1,52 @@
+import pytest
+from brownie import chain, Wei
+
+
+def test_synth_harvest_trigger(
+    susd_vault, sbtc_vault, synth_strategy, gov, susd, sbtc, susd_whale, sbtc_whale
+):
+    susd.approve(susd_vault, 2 ** 256 - 1, {"from": susd_whale})
+    susd_vault.deposit(susd.balanceOf(susd_whale) // 2, {"from": susd_whale})
+    chain.sleep(360 + 1)
+    chain.mine(1)
+
+    call_cost = Wei("0.01 ether")
+    # rounding in the synth valuation is not a loss worth a harvest
+    synth_strategy.setDebtThreshold(Wei("1 ether"), {"from": gov})
+
+    # exchange susd to sbtc
+    synth_strategy.harvest({"from": gov})
+    assert not synth_strategy.isWaitingPeriodFinished()
+
+    # the report delay still triggers a harvest during the waiting period
+    synth_strategy.setMaxReportDelay(0, {"from": gov})
+    assert synth_strategy.harvestTrigger(call_cost)
+    synth_strategy.setMaxReportDelay(86400, {"from": gov})
+
+    # new credit is worth the call, but investing it waits for the settlement
+    susd_vault.deposit({"from": susd_whale})
+    assert not synth_strategy.harvestTrigger(call_cost)
+
+    chain.sleep(360 + 1)
+    chain.mine(1)
+    assert synth_strategy.harvestTrigger(call_cost)
+
+    synth_strategy.harvest({"from": gov})
+    chain.sleep(360 + 1)
+    chain.mine(1)
+    synth_strategy.depositInVault({"from": gov})
+
+    # produce gains, only the sUSD buffer is reported as profit
+    sbtc.transfer(sbtc_vault, sbtc.balanceOf(sbtc_whale), {"from": sbtc_whale})
+    total_debt = susd_vault.strategies(synth_strategy).dict()["totalDebt"]
+    gain = synth_strategy.estimatedTotalAssets() - total_debt
+    buffer = synth_strategy.balanceOfWant()
+    cost_in_want = synth_strategy.ethToWant(call_cost)
+    assert gain > buffer
+
+    synth_strategy.setProfitFactor(buffer // cost_in_want - 1, {"from": gov})
+    assert synth_strategy.harvestTrigger(call_cost)
+
+    synth_strategy.setProfitFactor(buffer // cost_in_want + 1, {"from": gov})
+    assert gain > (buffer // cost_in_want + 1) * cost_in_want
+    assert not synth_strategy.harvestTrigger(call_cost)
@@ -0,0 +1,24 @@
+import pytest
+from brownie import reverts
+from eth_abi import encode_single
+
+
+def test_resolver_cache_filled_on_deploy(synth_strategy, resolver):
+    assert synth_strategy.isResolverCached()
+
+    required = synth_strategy.resolverAddressesRequired()
+    assert encode_single("bytes32", b"Exchanger") in required
+    assert encode_single("bytes32", b"ProxysBTC") in required
+
+
+def test_rebuild_cache(synth_strategy, gov, keeper, user):
+    tx = synth_strategy.rebuildCache({"from": keeper})
+    assert len(tx.events["CacheUpdated"]) == len(
+        synth_strategy.resolverAddressesRequired()
+    )
+    assert synth_strategy.isResolverCached()
+
+    synth_strategy.rebuildCache({"from": gov})
+
+    with reverts("!authorized"):
+        synth_strategy.rebuildCache({"from": user})
@@ -0,0 +1,44 @@
+import pytest
+from brownie import chain, reverts
+
+DUST_THRESHOLD = 10_000
+
+
+def test_tend_deposits_settled_synth(
+    susd_vault, sbtc_vault, synth_strategy, keeper, gov, susd, sbtc, susd_whale, user
+):
+    susd.approve(susd_vault, 2 ** 256 - 1, {"from": susd_whale})
+    susd_vault.deposit({"from": susd_whale})
+    chain.sleep(360 + 1)
+    chain.mine(1)
+
+    synth_strategy.harvest({"from": gov})
+    assert sbtc.balanceOf(synth_strategy) > DUST_THRESHOLD
+    assert not synth_strategy.tendTrigger(0)
+
+    chain.sleep(360 + 1)
+    chain.mine(1)
+    assert synth_strategy.isWaitingPeriodFinished()
+    assert synth_strategy.tendTrigger(0)
+
+    with reverts("!authorized"):
+        synth_strategy.tend({"from": user})
+
+    buffer = synth_strategy.balanceOfWant()
+    synth_strategy.tend({"from": keeper})
+    assert sbtc.balanceOf(synth_strategy) == 0
+    assert sbtc_vault.balanceOf(synth_strategy) > 0
+    assert synth_strategy.balanceOfWant() == buffer
+    assert not synth_strategy.tendTrigger(0)
+
+
+def test_tend_trigger_emergency_exit(susd_vault, synth_strategy, gov, susd, susd_whale):
+    susd.approve(susd_vault, 2 ** 256 - 1, {"from": susd_whale})
+    susd_vault.deposit({"from": susd_whale})
+    synth_strategy.harvest({"from": gov})
+    chain.sleep(360 + 1)
+    chain.mine(1)
+    assert synth_strategy.tendTrigger(0)
+
+    synth_strategy.setEmergencyExit({"from": gov})
+    assert not synth_strategy.tendTrigger(0)
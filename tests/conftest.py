@@ -1,91 +1,124 @@
+import json
+import os
+import time
+import warnings
+from pathlib import Path
+
 import pytest
 from brownie import config, Contract, ZERO_ADDRESS
 from eth_abi import encode_single
 
+from forkcache import AbiCache
+
+GAS_BASELINE_PATH = Path(__file__).parent / "gas_baseline.json"
+GAS_REPORT_PATH = Path(__file__).parent.parent / "reports" / "gas_benchmark.json"
+SETUP_REPORT_PATH = Path(__file__).parent.parent / "reports" / "fixture_setup.json"
+
 
 @pytest.fixture(scope="function", autouse=True)
-def isolate(fn_isolation):
-    pass
+def isolate(chain):
+    # Session fixtures (vaults, strategies) are set up before this snapshot,
+    # so they survive the revert and every test starts from the same wired
+    # deployment. brownie's fn_isolation is not used because its
+    # module_isolation resets the chain, dropping them at every module.
+    chain.snapshot()
+    yield
+    chain.revert()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def load_contract():
+    """
+    Contract(address) with the ABIs cached under FORK_CACHE_DIR (default
+    .fork-cache) for FORK_BLOCK, see forkcache. With FORK_CACHE_OFFLINE=1 a
+    missing ABI fails instead of being fetched from the explorer.
+    """
+    if not os.getenv("FORK_BLOCK"):
+        return Contract
+
+    cache = AbiCache(
+        os.getenv("FORK_CACHE_DIR", ".fork-cache"), int(os.getenv("FORK_BLOCK"))
+    )
+    offline = os.getenv("FORK_CACHE_OFFLINE", "") not in ("", "0")
+
+    def load(address):
+        cached = cache.get(address)
+        if cached is not None:
+            return Contract.from_abi(cached["name"], address, cached["abi"])
+        assert not offline, f"no cached ABI for {address}"
+        contract = Contract(address)
+        cache.put(address, contract._name, contract.abi)
+        return contract
+
+    return load
+
+
+@pytest.fixture(scope="session")
 def gov(accounts):
     yield accounts.at("0xFEB4acf3df3cDEA7399794D0869ef76A6EfAff52", force=True)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def user(accounts):
     yield accounts[0]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def rewards(accounts):
     yield accounts[1]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def guardian(accounts):
     yield accounts[2]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def management(accounts):
     yield accounts[3]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def strategist(accounts):
     yield accounts[4]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def keeper(accounts):
     yield accounts[5]
 
 
-@pytest.fixture
-def yvweth_032():
-    yield Contract("0xa9fE4601811213c340e850ea305481afF02f5b28")
-
-
-@pytest.fixture
-def yvweth_042():
-    yield Contract("0xa258C4606Ca8206D8aA700cE2143D7db854D168c")
-
-
-@pytest.fixture
-def origin_vault():
-    # origin vault of the route
-    yield Contract("0xa9fE4601811213c340e850ea305481afF02f5b28")
+@pytest.fixture(scope="session")
+def yvweth_032(load_contract):
+    yield load_contract("0xa9fE4601811213c340e850ea305481afF02f5b28")
 
 
-@pytest.fixture
-def destination_vault():
-    # destination vault of the route
-    yield Contract("0xa258C4606Ca8206D8aA700cE2143D7db854D168c")
+@pytest.fixture(scope="session")
+def yvweth_042(load_contract):
+    yield load_contract("0xa258C4606Ca8206D8aA700cE2143D7db854D168c")
 
 
-@pytest.fixture
-def origin_vault():
+@pytest.fixture(scope="session")
+def origin_vault(load_contract):
     # origin vault of the route
-    yield Contract("0xa9fE4601811213c340e850ea305481afF02f5b28")
+    yield load_contract("0xa9fE4601811213c340e850ea305481afF02f5b28")
 
 
-@pytest.fixture
-def destination_vault():
+@pytest.fixture(scope="session")
+def destination_vault(load_contract):
     # destination vault of the route
-    yield Contract("0xa258C4606Ca8206D8aA700cE2143D7db854D168c")
+    yield load_contract("0xa258C4606Ca8206D8aA700cE2143D7db854D168c")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def weth_whale(accounts):
     yield accounts.at("0xc1aae9d18bbe386b102435a8632c8063d31e747c", True)
 
 
-@pytest.fixture
-def token():
+@pytest.fixture(scope="session")
+def token(load_contract):
     token_address = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"  # this should be the address of the ERC-20 used by the strategy/vault (DAI)
-    yield Contract(token_address)
+    yield load_contract(token_address)
 
 
 @pytest.fixture
@@ -98,9 +131,9 @@ def amount(accounts, token, user):
     yield amount
 
 
-@pytest.fixture
-def weth():
-    yield Contract("0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2")
+@pytest.fixture(scope="session")
+def weth(load_contract):
+    yield load_contract("0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2")
 
 
 @pytest.fixture
@@ -110,9 +143,9 @@ def weth_amout(user, weth):
     yield weth_amout
 
 
-@pytest.fixture
-def health_check():
-    yield Contract("0xddcea799ff1699e98edf118e0629a974df7df012")
+@pytest.fixture(scope="session")
+def health_check(load_contract):
+    yield load_contract("0xddcea799ff1699e98edf118e0629a974df7df012")
 
 
 @pytest.fixture
@@ -126,7 +159,7 @@ def vault(pm, gov, rewards, guardian, management, token):
     yield Contract("0xa9fE4601811213c340e850ea305481afF02f5b28")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def strategy(
     strategist,
     keeper,
@@ -154,6 +187,8 @@ def strategy(
     yield strategy
 
 
+# function scoped: it zeroes the debt ratio of `strategy` when both are used
+# and changes the fees and deposit limit of yvweth_032
 @pytest.fixture
 def unique_strategy(
     strategist, keeper, yvweth_032, yvweth_042, RouterStrategy, gov, health_check
@@ -182,3 +217,140 @@ def unique_strategy(
 @pytest.fixture(scope="session")
 def RELATIVE_APPROX():
     yield 1e-5
+
+
+class GasRecorder:
+    """
+    Records gas_used per entry point and branch and compares it against the
+    stored baseline. A branch missing from the baseline only warns, so the
+    suite stays green until a baseline is recorded on the fork. Set
+    GAS_REGRESSION_THRESHOLD (default 0.05) to change the allowed increase and
+    UPDATE_GAS_BASELINE=1 to overwrite the baseline.
+    """
+
+    def __init__(self, baseline_path, report_path, threshold, update_baseline):
+        self.baseline_path = baseline_path
+        self.report_path = report_path
+        self.threshold = threshold
+        self.update_baseline = update_baseline
+        self.baseline = {}
+        if baseline_path.exists():
+            self.baseline = json.loads(baseline_path.read_text())
+        self.results = {}
+
+    def record(self, entry_point, branch, tx):
+        key = f"{entry_point}:{branch}"
+        gas_used = tx.gas_used
+        self.results[key] = gas_used
+
+        if self.update_baseline:
+            return gas_used
+
+        baseline = self.baseline.get(key)
+        if baseline is None:
+            warnings.warn(
+                f"no gas baseline for {key}, record it with UPDATE_GAS_BASELINE=1"
+            )
+            return gas_used
+        limit = int(baseline * (1 + self.threshold))
+        assert (
+            gas_used <= limit
+        ), f"{key} used {gas_used} gas, baseline {baseline} (limit {limit})"
+        return gas_used
+
+    def report(self):
+        return {
+            key: {"gas_used": gas_used, "baseline": self.baseline.get(key)}
+            for key, gas_used in sorted(self.results.items())
+        }
+
+    def write(self):
+        if not self.results:
+            return
+        self.report_path.parent.mkdir(parents=True, exist_ok=True)
+        self.report_path.write_text(json.dumps(self.report(), indent=2) + "\n")
+        if self.update_baseline:
+            baseline = {**self.baseline, **self.results}
+            self.baseline_path.write_text(
+                json.dumps(dict(sorted(baseline.items())), indent=2) + "\n"
+            )
+
+
+@pytest.fixture(scope="session")
+def gas_recorder():
+    recorder = GasRecorder(
+        GAS_BASELINE_PATH,
+        GAS_REPORT_PATH,
+        float(os.getenv("GAS_REGRESSION_THRESHOLD", "0.05")),
+        os.getenv("UPDATE_GAS_BASELINE", "") not in ("", "0"),
+    )
+    yield recorder
+    recorder.write()
+
+
+class SetupTimer:
+    """
+    Times the setup of the session fixtures defined in these conftests and
+    counts the tests using them. Run as function fixtures, every one of those
+    tests would have paid the setup again, which is what the summary reports
+    as saved.
+    """
+
+    def __init__(self):
+        self.durations = {}
+        self.uses = {}
+
+    def record(self, name, duration):
+        self.durations[name] = duration
+
+    def used_by(self, fixturenames):
+        for name in fixturenames:
+            if name in self.durations:
+                self.uses[name] = self.uses.get(name, 0) + 1
+
+    def report(self):
+        rows = []
+        for name, duration in sorted(self.durations.items(), key=lambda item: -item[1]):
+            uses = self.uses.get(name, 0)
+            rows.append((name, duration, uses, duration * max(uses - 1, 0)))
+        return rows
+
+
+setup_timer = SetupTimer()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    start = time.perf_counter()
+    yield
+    # baseid is empty for the fixtures of brownie and other plugins
+    if fixturedef.scope == "session" and fixturedef.baseid:
+        setup_timer.record(fixturedef.argname, time.perf_counter() - start)
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_runtest_setup(item):
+    setup_timer.used_by(item.fixturenames)
+
+
+def pytest_terminal_summary(terminalreporter):
+    rows = [row for row in setup_timer.report() if row[1] >= 0.01]
+    if not rows:
+        return
+    terminalreporter.write_sep("-", "session fixture setup")
+    terminalreporter.write_line(
+        f"{'fixture':<24} {'setup (s)':>10} {'tests':>6} {'saved (s)':>10}"
+    )
+    for name, duration, uses, saved in rows:
+        terminalreporter.write_line(
+            f"{name:<24} {duration:>10.2f} {uses:>6} {saved:>10.2f}"
+        )
+    total = sum(row[3] for row in rows)
+    terminalreporter.write_line(f"{'total':<24} {'':>10} {'':>6} {total:>10.2f}")
+
+    SETUP_REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    report = {
+        name: {"setup": round(duration, 3), "tests": uses, "saved": round(saved, 3)}
+        for name, duration, uses, saved in rows
+    }
+    SETUP_REPORT_PATH.write_text(json.dumps(report, indent=2) + "\n")
@@ -0,0 +1,193 @@
+import pytest
+from brownie import config, Wei, ZERO_ADDRESS
+from eth_abi import encode_single
+
+# Local stand-ins for the mainnet contracts used by the fork fixtures, so the
+# scenarios run on a plain development chain:
+#   brownie test tests/offline --network development
+
+SBTC_RATE = 50_000 * 10 ** 18  # sUSD per sBTC
+SBTC_FEE_RATE = 3 * 10 ** 15  # 0.3%
+
+
+def to_bytes32(name):
+    return encode_single("bytes32", name.encode())
+
+
+@pytest.fixture
+def gov(accounts):
+    yield accounts[6]
+
+
+@pytest.fixture
+def weth(gov, MockERC20):
+    yield gov.deploy(MockERC20, "Wrapped Ether", "WETH", 18)
+
+
+@pytest.fixture
+def token(weth):
+    yield weth
+
+
+@pytest.fixture
+def weth_whale(accounts, weth):
+    weth.mint(accounts[7], 1_000 * 10 ** 18)
+    yield accounts[7]
+
+
+@pytest.fixture
+def origin_vault(pm, gov, rewards, guardian, management, weth, weth_whale):
+    Vault = pm(config["dependencies"][0]).Vault
+    vault = guardian.deploy(Vault)
+    vault.initialize(weth, gov, rewards, "", "", guardian, management)
+    vault.setDepositLimit(2 ** 256 - 1, {"from": gov})
+    vault.setManagement(management, {"from": gov})
+    vault.setPerformanceFee(0, {"from": gov})
+    vault.setManagementFee(0, {"from": gov})
+
+    weth.approve(vault, 2 ** 256 - 1, {"from": weth_whale})
+    vault.deposit(Wei("100 ether"), {"from": weth_whale})
+    yield vault
+
+
+@pytest.fixture
+def destination_vault(gov, MockYVault, weth):
+    yield gov.deploy(MockYVault, weth)
+
+
+@pytest.fixture
+def yvweth_032(origin_vault):
+    yield origin_vault
+
+
+@pytest.fixture
+def yvweth_042(destination_vault):
+    yield destination_vault
+
+
+@pytest.fixture
+def strategy(strategist, keeper, origin_vault, destination_vault, RouterStrategy, gov):
+    strategy = strategist.deploy(
+        RouterStrategy, origin_vault, destination_vault, "Route yvWETH 042"
+    )
+    strategy.setKeeper(keeper)
+    origin_vault.addStrategy(strategy, 10_000, 0, 2 ** 256 - 1, 0, {"from": gov})
+    yield strategy
+
+
+@pytest.fixture
+def unique_strategy(strategy):
+    yield strategy
+
+
+@pytest.fixture
+def exchange_rates(gov, MockExchangeRates):
+    exchange_rates = gov.deploy(MockExchangeRates)
+    exchange_rates.setRate(to_bytes32("sBTC"), SBTC_RATE, {"from": gov})
+    yield exchange_rates
+
+
+@pytest.fixture
+def exchanger(gov, MockExchanger, exchange_rates):
+    exchanger = gov.deploy(MockExchanger, exchange_rates)
+    exchanger.setExchangeFeeRate(to_bytes32("sBTC"), SBTC_FEE_RATE, {"from": gov})
+    yield exchanger
+
+
+@pytest.fixture
+def susd(gov, MockSynth, exchanger):
+    susd = gov.deploy(MockSynth, "Synth sUSD", "sUSD", to_bytes32("sUSD"), exchanger)
+    exchanger.addSynth(susd, {"from": gov})
+    yield susd
+
+
+@pytest.fixture
+def sbtc(gov, MockSynth, exchanger):
+    sbtc = gov.deploy(MockSynth, "Synth sBTC", "sBTC", to_bytes32("sBTC"), exchanger)
+    exchanger.addSynth(sbtc, {"from": gov})
+    yield sbtc
+
+
+@pytest.fixture
+def synthetix(gov, MockSynthetix, exchanger):
+    synthetix = gov.deploy(MockSynthetix, exchanger)
+    exchanger.setSynthetix(synthetix, {"from": gov})
+    yield synthetix
+
+
+@pytest.fixture
+def resolver(
+    gov, MockAddressResolver, synthetix, exchanger, exchange_rates, susd, sbtc
+):
+    resolver = gov.deploy(MockAddressResolver)
+    resolver.importAddresses(
+        [
+            to_bytes32(name)
+            for name in [
+                "Synthetix",
+                "Exchanger",
+                "ExchangeRates",
+                "ProxyERC20sUSD",
+                "ProxysBTC",
+            ]
+        ],
+        [synthetix, exchanger, exchange_rates, susd, sbtc],
+        {"from": gov},
+    )
+    yield resolver
+
+
+@pytest.fixture
+def read_proxy(gov, MockReadProxy, resolver):
+    yield gov.deploy(MockReadProxy, resolver)
+
+
+@pytest.fixture
+def susd_whale(accounts, susd, gov):
+    susd.issue(accounts[8], 1_000_000 * 10 ** 18, {"from": gov})
+    yield accounts[8]
+
+
+@pytest.fixture
+def sbtc_whale(accounts, sbtc, gov):
+    sbtc.issue(accounts[9], Wei("10 ether"), {"from": gov})
+    yield accounts[9]
+
+
+@pytest.fixture
+def susd_vault(pm, gov, rewards, guardian, management, susd):
+    Vault = pm(config["dependencies"][0]).Vault
+    vault = guardian.deploy(Vault)
+    vault.initialize(susd, gov, rewards, "", "", guardian, management)
+    vault.setDepositLimit(2 ** 256 - 1, {"from": gov})
+    vault.setManagement(management, {"from": gov})
+    yield vault
+
+
+@pytest.fixture
+def sbtc_vault(gov, MockYVault, sbtc):
+    yield gov.deploy(MockYVault, sbtc)
+
+
+@pytest.fixture
+def synth_strategy(
+    strategist,
+    keeper,
+    susd_vault,
+    sbtc_vault,
+    read_proxy,
+    TestSynthetixRouterStrategy,
+    gov,
+):
+    strategy = strategist.deploy(
+        TestSynthetixRouterStrategy,
+        susd_vault,
+        sbtc_vault,
+        "RoutersUSDtosBTC",
+        to_bytes32("ProxysBTC"),
+        100,
+        read_proxy,
+    )
+    strategy.setKeeper(keeper)
+    susd_vault.addStrategy(strategy, 10_000, 0, 2 ** 256 - 1, 0, {"from": gov})
+    yield strategy
@@ -0,0 +1,45 @@
+import pytest
+from brownie import RouterStrategy
+
+from scripts.deploy_routes import deploy, load_manifest
+
+pytestmark = pytest.mark.require_network("development")
+
+
+def test_example_manifest():
+    manifest = load_manifest("config/routes.example.yml")
+    synth_route = [route for route in manifest["routes"] if "synth" in route][0]
+    assert synth_route["susd_buffer"] == 100
+
+
+def test_deploy_routes(
+    accounts, origin_vault, destination_vault, strategist, rewards, keeper
+):
+    deployer = accounts[0]
+    manifest = {
+        "strategist": strategist.address,
+        "rewards": rewards.address,
+        "keeper": keeper.address,
+        "routes": [
+            {
+                "name": f"Route{i}",
+                "vault": origin_vault.address,
+                "yvault": destination_vault.address,
+            }
+            for i in range(3)
+        ],
+    }
+    nonce = deployer.nonce
+
+    deployed, receipts = deploy(manifest, deployer)
+
+    assert list(deployed) == ["Route0", "Route1", "Route2"]
+    assert [tx.nonce for _, tx in receipts] == list(range(nonce, nonce + len(receipts)))
+    for name, address in deployed.items():
+        router = RouterStrategy.at(address)
+        assert router.name() == name
+        assert router.vault() == origin_vault
+        assert router.yVault() == destination_vault
+        assert router.strategist() == strategist
+        assert router.rewards() == rewards
+        assert router.keeper() == keeper
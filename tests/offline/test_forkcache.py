@@ -0,0 +1,122 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from forkcache import AbiCache, CachingProxy, RpcCache, make_server
+from jsonrpc import JsonRpcClient, RpcError, post
+
+pytestmark = pytest.mark.require_network("development")
+
+BLOCK = 12_900_000
+
+
+@pytest.fixture
+def upstream():
+    calls = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            call = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            calls.append((call["method"], call["params"]))
+            response = {"jsonrpc": "2.0", "id": call["id"]}
+            if call["method"] == "eth_getBlockByNumber":
+                response["result"] = None
+            elif call["method"] == "eth_getCode":
+                response["result"] = "0x6080"
+            else:
+                response["error"] = {"message": "nope"}
+            data = json.dumps(response).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", calls
+    server.shutdown()
+
+
+def test_proxy_records_and_replays(upstream, tmp_path):
+    url, calls = upstream
+    address = "0xa258C4606Ca8206D8aA700cE2143D7db854D168c"
+
+    proxy = CachingProxy(url, RpcCache(tmp_path, BLOCK), BLOCK)
+    assert proxy.resolve("eth_getCode", [address, "latest"]) == "0x6080"
+    # "latest" is pinned to the fork block, and the key ignores case
+    assert calls == [("eth_getCode", [address, hex(BLOCK)])]
+    assert proxy.resolve("eth_getCode", [address.lower(), hex(BLOCK)]) == "0x6080"
+    assert len(calls) == 1
+    assert proxy.resolve("eth_blockNumber", []) == hex(BLOCK)
+
+    # nothing after the fork block or "not found" is stored
+    assert proxy.resolve("eth_getBlockByNumber", [hex(BLOCK + 1), False]) is None
+    assert proxy.resolve("eth_getBlockByNumber", [hex(BLOCK + 1), False]) is None
+    assert len(calls) == 3
+    assert RpcCache(tmp_path, BLOCK).stats() == {"eth_getCode": 1}
+
+    # upstream errors are passed through and not cached
+    response = proxy.handle(
+        {"id": 7, "method": "eth_getStorageAt", "params": [address, "0x0"]}
+    )
+    assert response["error"] == {"message": "nope"}
+    assert RpcCache(tmp_path, BLOCK).stats() == {"eth_getCode": 1}
+
+    offline = CachingProxy(None, RpcCache(tmp_path, BLOCK), BLOCK, offline=True)
+    assert offline.resolve("eth_getCode", [address]) == "0x6080"
+    response = offline.handle(
+        {"id": 1, "method": "eth_getCode", "params": [url[:42], "latest"]}
+    )
+    assert "forkcache miss" in response["error"]["message"]
+    assert offline.counts == {"hits": 1, "misses": 1}
+    assert len(calls) == 4
+
+    # a second block does not see the first one's entries
+    assert RpcCache(tmp_path, BLOCK + 1).stats() == {}
+
+
+def test_proxy_server_batches(upstream, tmp_path):
+    url, calls = upstream
+    proxy = CachingProxy(url, RpcCache(tmp_path, BLOCK), BLOCK)
+    server = make_server(proxy, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        address = f"http://127.0.0.1:{server.server_port}"
+        response = post(
+            address,
+            [
+                {"jsonrpc": "2.0", "id": 1, "method": "eth_blockNumber", "params": []},
+                {"jsonrpc": "2.0", "id": 2, "method": "eth_getCode", "params": ["0x0"]},
+            ],
+        )
+        assert [r["result"] for r in response] == [hex(BLOCK), "0x6080"]
+        response = post(
+            address, {"jsonrpc": "2.0", "id": 3, "method": "web3_sha3", "params": []}
+        )
+        assert response == {"jsonrpc": "2.0", "id": 3, "error": {"message": "nope"}}
+
+        # the monitor client reads through the proxy with the same error type
+        client = JsonRpcClient(address)
+        assert asyncio.run(client.block_number()) == BLOCK
+        with pytest.raises(RpcError, match="nope"):
+            asyncio.run(client.request("web3_sha3", []))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_abi_cache(tmp_path):
+    cache = AbiCache(tmp_path, BLOCK)
+    address = "0xa258C4606Ca8206D8aA700cE2143D7db854D168c"
+    assert cache.get(address) is None
+
+    abi = [{"type": "function", "name": "token", "inputs": [], "outputs": []}]
+    cache.put(address, "Vault", abi)
+    assert cache.get(address.lower()) == {"name": "Vault", "abi": abi}
+    assert AbiCache(tmp_path, BLOCK + 1).get(address) is None
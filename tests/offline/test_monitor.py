@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+from brownie import chain, web3, Contract
+
+from monitor import Indexer, JsonRpcClient, Store
+from monitor import abi
+
+pytestmark = pytest.mark.require_network("development")
+
+
+def test_abi_constants():
+    assert abi.CLONED == web3.keccak(text="Cloned(address)").hex()
+    assert (
+        abi.HARVESTED
+        == web3.keccak(text="Harvested(uint256,uint256,uint256,uint256)").hex()
+    )
+    assert (
+        abi.SYNTH_EXCHANGE
+        == web3.keccak(
+            text="SynthExchange(address,bytes32,uint256,bytes32,uint256,address)"
+        ).hex()
+    )
+    for signature, selector in abi.SELECTORS.items():
+        assert selector == web3.keccak(text=signature)[:4].hex()
+
+
+def test_indexer(
+    strategy,
+    origin_vault,
+    destination_vault,
+    synth_strategy,
+    susd_vault,
+    synthetix,
+    susd,
+    susd_whale,
+    strategist,
+    rewards,
+    keeper,
+    gov,
+    tmp_path,
+):
+    start_block = chain.height
+    clone = strategy.cloneRouter(
+        origin_vault, strategist, rewards, keeper, destination_vault, "Clone"
+    ).events["Cloned"]["clone"]
+    strategy.harvest({"from": gov})
+    susd.approve(susd_vault, 2 ** 256 - 1, {"from": susd_whale})
+    susd_vault.deposit({"from": susd_whale})
+    synth_strategy.harvest({"from": gov})
+
+    store = Store(tmp_path / "monitor.db")
+    indexer = Indexer(
+        JsonRpcClient(web3.provider.endpoint_uri),
+        store,
+        sources=[strategy.address],
+        routers=[strategy.address, synth_strategy.address],
+        synthetix=synthetix.address,
+        start_block=start_block,
+        chunk_size=3,
+    )
+
+    async def sync():
+        await indexer.refresh_state(await indexer.sync())
+
+    asyncio.run(sync())
+    assert store.checkpoint("logs") == chain.height
+    report = {row["router"]: row for row in store.report()}
+    assert set(report) == {
+        r.lower() for r in [strategy.address, synth_strategy.address, clone]
+    }
+
+    row = report[strategy.address.lower()]
+    assert row["harvests"] == 1
+    assert row["total_debt"] == origin_vault.strategies(strategy).dict()["totalDebt"]
+    assert row["loose_synth"] is None
+
+    row = report[synth_strategy.address.lower()]
+    assert row["exchanges"] == 1
+    assert row["loose_synth"] > 0
+    assert row["waiting_period_finished"] is False
+
+    # resumes from the checkpoint, nothing is indexed twice
+    chain.sleep(360 + 1)
+    strategy.harvest({"from": gov})
+    asyncio.run(sync())
+    report = {row["router"]: row for row in store.report()}
+    assert report[strategy.address.lower()]["harvests"] == 2
+    assert report[synth_strategy.address.lower()]["exchanges"] == 1
+    assert report[synth_strategy.address.lower()]["waiting_period_finished"] is True
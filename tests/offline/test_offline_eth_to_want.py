@@ -0,0 +1,79 @@
+import pytest
+from brownie import chain, Wei, ZERO_ADDRESS
+
+pytestmark = pytest.mark.require_network("development")
+
+# the offline weth is not the mainnet WETH, so the router prices it
+WANT_PER_ETH = Wei("2000 ether")
+
+
+@pytest.fixture
+def uniswap(gov, MockUniswapRouter):
+    uniswap = gov.deploy(MockUniswapRouter)
+    uniswap.setRate(WANT_PER_ETH, {"from": gov})
+    yield uniswap
+
+
+def test_eth_to_want_cache(strategy, uniswap, keeper, gov):
+    call_cost = Wei("0.01 ether")
+    strategy.setEthToWantRouter(uniswap, {"from": gov})
+
+    # nothing cached yet, live quote
+    assert strategy.ethToWant(call_cost) == call_cost * 2000
+
+    strategy.harvest({"from": gov})
+    assert strategy.cachedEthToWant() == WANT_PER_ETH
+    assert strategy.ethToWantCachedAt() == chain[-1].timestamp
+
+    # the cached quote is used until the interval passes
+    uniswap.setRate(WANT_PER_ETH * 2, {"from": gov})
+    strategy.updateEthToWantCache({"from": keeper})
+    assert strategy.cachedEthToWant() == WANT_PER_ETH
+    assert strategy.ethToWant(call_cost) == call_cost * 2000
+
+    chain.sleep(strategy.ethToWantCacheInterval())
+    chain.mine(1)
+    assert strategy.ethToWant(call_cost) == call_cost * 4000
+
+    strategy.updateEthToWantCache({"from": keeper})
+    assert strategy.cachedEthToWant() == WANT_PER_ETH * 2
+
+
+def test_eth_to_want_fallback(strategy, uniswap, keeper, gov):
+    call_cost = Wei("0.01 ether")
+    strategy.setEthToWantRouter(uniswap, {"from": gov})
+    strategy.updateEthToWantCache({"from": keeper})
+
+    # stale cache and a failing router, the last quote is kept
+    uniswap.setBroken(True, {"from": gov})
+    chain.sleep(strategy.ethToWantCacheInterval())
+    chain.mine(1)
+    assert strategy.ethToWant(call_cost) == call_cost * 2000
+
+    strategy.updateEthToWantCache({"from": keeper})
+    assert strategy.cachedEthToWant() == WANT_PER_ETH
+
+    strategy.setEthToWantRouter(ZERO_ADDRESS, {"from": gov})
+    assert strategy.ethToWant(call_cost) == call_cost * 2000
+
+
+def test_eth_to_want_without_quote(strategy, uniswap, weth, gov):
+    call_cost = Wei("0.01 ether")
+    uniswap.setBroken(True, {"from": gov})
+    strategy.setEthToWantRouter(uniswap, {"from": gov})
+    assert strategy.cachedEthToWant() == 0
+
+    # no cache and a failing router, the call cost is unknown. ethToWant
+    # reports 0 and harvestTrigger does not take it as a free call
+    assert strategy.ethToWant(call_cost) == 0
+
+    strategy.harvest({"from": gov})
+    chain.sleep(3600)
+    chain.mine(1)
+    weth.mint(strategy.yVault(), Wei("10 ether"))
+    assert not strategy.harvestTrigger(call_cost)
+
+    # the report delay still triggers it
+    chain.sleep(strategy.maxReportDelay())
+    chain.mine(1)
+    assert strategy.harvestTrigger(call_cost)
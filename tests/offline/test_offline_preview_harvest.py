@@ -0,0 +1,129 @@
+import pytest
+from brownie import chain, reverts, Wei
+
+pytestmark = pytest.mark.require_network("development")
+
+
+def wait_settlement():
+    chain.sleep(360 + 1)
+    chain.mine(1)
+
+
+def assert_matches(preview, tx):
+    event = tx.events["Harvested"]
+    assert preview["revertReason"] == ""
+    assert preview["profit"] == pytest.approx(event["profit"], rel=1e-6)
+    assert preview["loss"] == pytest.approx(event["loss"], rel=1e-6)
+    assert preview["debtPayment"] == pytest.approx(event["debtPayment"], rel=1e-6)
+
+
+def test_preview_router(
+    strategy, origin_vault, destination_vault, weth, weth_whale, gov
+):
+    preview = strategy.previewHarvest().dict()
+    assert preview["deposit"] and not preview["exchange"]
+    assert preview["credit"] == origin_vault.creditAvailable(strategy)
+    assert_matches(preview, strategy.harvest({"from": gov}))
+
+    weth.transfer(destination_vault, Wei("10 ether"), {"from": weth_whale})
+    chain.sleep(3600)
+    chain.mine(1)
+    preview = strategy.previewHarvest().dict()
+    assert preview["profit"] > 0
+    assert_matches(preview, strategy.harvest({"from": gov}))
+
+    origin_vault.revokeStrategy(strategy, {"from": gov})
+    preview = strategy.previewHarvest().dict()
+    assert preview["debtPayment"] > 0
+    assert_matches(preview, strategy.harvest({"from": gov}))
+
+
+def test_preview_synth_router(synth_strategy, susd_vault, susd, susd_whale, gov):
+    susd.approve(susd_vault, 2 ** 256 - 1, {"from": susd_whale})
+    susd_vault.deposit(100_000 * 10 ** 18, {"from": susd_whale})
+
+    preview = synth_strategy.previewHarvest().dict()
+    assert preview["exchange"] and not preview["deposit"]
+    assert_matches(preview, synth_strategy.harvest({"from": gov}))
+
+    # the settled synth would be deposited
+    wait_settlement()
+    preview = synth_strategy.previewHarvest().dict()
+    assert preview["deposit"]
+    assert_matches(preview, synth_strategy.harvest({"from": gov}))
+
+    # a larger buffer is refilled from the yVault
+    wait_settlement()
+    synth_strategy.updateSUSDBuffer(5_000, {"from": gov})
+    preview = synth_strategy.previewHarvest().dict()
+    assert preview["refillBuffer"] and not preview["exchange"]
+
+
+def test_preview_synth_router_reverts(
+    synth_strategy, susd_vault, susd, susd_whale, gov
+):
+    susd.approve(susd_vault, 2 ** 256 - 1, {"from": susd_whale})
+    susd_vault.deposit(100_000 * 10 ** 18, {"from": susd_whale})
+    synth_strategy.harvest({"from": gov})
+
+    synth_strategy.setEmergencyExit({"from": gov})
+    assert synth_strategy.previewHarvest().dict()["revertReason"] == "settlement period"
+
+    wait_settlement()
+    synth_strategy.depositInVault({"from": gov})
+    assert (
+        synth_strategy.previewHarvest().dict()["revertReason"]
+        == "remove liquidity first"
+    )
+
+    # the sUSD from the exchange back is locked for the waiting period
+    synth_strategy.manualRemoveFullLiquidity({"from": gov})
+    preview = synth_strategy.previewHarvest().dict()
+    assert preview["revertReason"] == "Cannot transfer during waiting period"
+
+    wait_settlement()
+    preview = synth_strategy.previewHarvest().dict()
+    assert_matches(preview, synth_strategy.harvest({"from": gov}))
+
+
+def test_preview_health_check(
+    strategy,
+    synth_strategy,
+    destination_vault,
+    weth,
+    susd,
+    susd_whale,
+    gov,
+    MockHealthCheck,
+):
+    health_check = gov.deploy(MockHealthCheck)
+    for router in [strategy, synth_strategy]:
+        router.setHealthCheck(health_check, {"from": gov})
+        # the first harvest skips the check
+        assert not router.doHealthCheck()
+        assert router.previewHarvest().dict()["healthCheckPassed"]
+
+    strategy.harvest({"from": gov})
+    weth.mint(destination_vault, Wei("1 ether"))
+    chain.sleep(3600)
+    chain.mine(1)
+
+    health_check.setProfitLimit(Wei("0.1 ether"), {"from": gov})
+    preview = strategy.previewHarvest().dict()
+    assert not preview["healthCheckPassed"]
+    assert preview["revertReason"] == "!healthcheck"
+    with reverts("!healthcheck"):
+        strategy.harvest({"from": gov})
+
+    health_check.setProfitLimit(Wei("1 ether"), {"from": gov})
+    preview = strategy.previewHarvest().dict()
+    assert preview["healthCheckPassed"]
+    assert_matches(preview, strategy.harvest({"from": gov}))
+
+    # the synth router previews through the same check
+    synth_strategy.setDoHealthCheck(True, {"from": gov})
+    susd.transfer(synth_strategy, 1_000 * 10 ** 18, {"from": susd_whale})
+    health_check.setProfitLimit(0, {"from": gov})
+    preview = synth_strategy.previewHarvest().dict()
+    assert preview["profit"] > 0 and not preview["healthCheckPassed"]
+    assert preview["revertReason"] == "!healthcheck"
@@ -0,0 +1,144 @@
+import pytest
+from brownie import chain, reverts, Contract, Wei
+
+pytestmark = pytest.mark.require_network("development")
+
+
+def move_funds(vault, dest_vault, strategy, gov, weth):
+    strategy.harvest({"from": gov})
+    assert strategy.balanceOfWant() == 0
+    assert strategy.valueOfInvestment() > 0
+
+    prev_value = strategy.valueOfInvestment()
+    weth.mint(dest_vault, Wei("10 ether"))
+    assert strategy.valueOfInvestment() > prev_value
+
+    strategy.harvest({"from": gov})
+    chain.sleep(3600 * 11)
+    chain.mine(1)
+
+    total_gain = vault.strategies(strategy).dict()["totalGain"]
+    assert total_gain > 0
+    assert vault.strategies(strategy).dict()["totalLoss"] == 0
+
+    vault.revokeStrategy(strategy, {"from": gov})
+    tx = strategy.harvest({"from": gov})
+    total_gain += tx.events["Harvested"]["profit"]
+
+    assert vault.strategies(strategy).dict()["totalGain"] == total_gain
+    assert vault.strategies(strategy).dict()["totalLoss"] == 0
+    assert vault.strategies(strategy).dict()["totalDebt"] == 0
+
+
+def test_original_strategy(origin_vault, destination_vault, strategy, gov, weth):
+    move_funds(origin_vault, destination_vault, strategy, gov, weth)
+
+
+def test_cloned_strategy(
+    origin_vault, destination_vault, strategy, strategist, rewards, keeper, gov, weth
+):
+    clone_tx = strategy.cloneRouter(
+        origin_vault, strategist, rewards, keeper, destination_vault, "ClonedStrategy"
+    )
+    cloned_strategy = Contract.from_abi(
+        "Strategy", clone_tx.events["Cloned"]["clone"], strategy.abi
+    )
+
+    origin_vault.revokeStrategy(strategy, {"from": gov})
+    strategy.harvest({"from": gov})
+    origin_vault.addStrategy(cloned_strategy, 10_000, 0, 2 ** 256 - 1, 0, {"from": gov})
+
+    move_funds(origin_vault, destination_vault, cloned_strategy, gov, weth)
+
+
+def test_loss(origin_vault, destination_vault, strategy, gov):
+    strategy.harvest({"from": gov})
+    destination_vault.takeAssets(Wei("1 ether"), {"from": gov})
+
+    origin_vault.revokeStrategy(strategy, {"from": gov})
+    tx = strategy.harvest({"from": gov})
+
+    assert tx.events["Harvested"]["loss"] > 0
+    assert origin_vault.strategies(strategy).dict()["totalDebt"] == 0
+
+
+def test_exact_withdraw(
+    origin_vault, destination_vault, strategy, gov, weth, weth_whale
+):
+    strategy.harvest({"from": gov})
+    # price per share that does not divide evenly
+    weth.mint(destination_vault, Wei("1 ether") // 3)
+
+    before = weth.balanceOf(weth_whale)
+    shares = origin_vault.balanceOf(weth_whale) // 10
+    expected = shares * origin_vault.pricePerShare() // 10 ** 18
+    origin_vault.withdraw(shares, weth_whale, 0, {"from": weth_whale})
+
+    assert weth.balanceOf(weth_whale) - before >= expected
+    assert origin_vault.strategies(strategy).dict()["totalLoss"] == 0
+
+
+def test_approvals_granted_once(
+    origin_vault,
+    destination_vault,
+    strategy,
+    strategist,
+    rewards,
+    keeper,
+    gov,
+    weth,
+    RouterStrategy,
+):
+    clone = strategy.cloneRouter(
+        origin_vault, strategist, rewards, keeper, destination_vault, "Clone"
+    ).events["Cloned"]["clone"]
+    for router in [strategy, clone]:
+        assert weth.allowance(router, destination_vault) == 2 ** 256 - 1
+
+    strategy.harvest({"from": gov})
+    new_strategy = strategist.deploy(
+        RouterStrategy, origin_vault, destination_vault, "New"
+    )
+    origin_vault.migrateStrategy(strategy, new_strategy, {"from": gov})
+    assert weth.allowance(strategy, destination_vault) == 0
+    assert destination_vault.balanceOf(new_strategy) > 0
+
+
+def test_clone_immutable_args(
+    origin_vault, destination_vault, strategy, strategist, rewards, keeper, web3
+):
+    clone = strategy.cloneRouter(
+        origin_vault, strategist, rewards, keeper, destination_vault, "Clone"
+    ).events["Cloned"]["clone"]
+    clone = Contract.from_abi("RouterStrategy", clone, strategy.abi)
+
+    # 0x37 bytes of proxy, the yVault and the length of the args
+    code = web3.eth.get_code(clone.address)
+    assert len(code) == 0x37 + 20 + 2
+    assert code[0x37:] == bytes.fromhex(destination_vault.address[2:]) + b"\x00\x14"
+    assert clone.yVault() == destination_vault
+
+    with reverts("!synth"):
+        strategy.immutableArgs(destination_vault, "0x" + "11" * 32)
+    # clones can't be cloned
+    with reverts():
+        clone.cloneRouter(
+            origin_vault, strategist, rewards, keeper, destination_vault, "Clone"
+        )
+
+
+def test_packed_config_setters(strategy, gov):
+    strategy.setMaxLoss(10_000, {"from": gov})
+    tx = strategy.setProfitReserveFactor(10_000, {"from": gov})
+    assert tx.events["UpdatedProfitReserveFactor"]["profitReserveFactor"] == 10_000
+    strategy.setEthToWantCacheInterval(3600, {"from": gov})
+    assert strategy.maxLoss() == 10_000
+    assert strategy.profitReserveFactor() == 10_000
+    assert strategy.ethToWantCacheInterval() == 3600
+    assert strategy.creditFactor() == 10_000
+
+    with reverts():
+        strategy.setMaxLoss(2 ** 16, {"from": gov})
+    # more than the whole last profit can't be held back
+    with reverts("!too high"):
+        strategy.setProfitReserveFactor(10_001, {"from": gov})
@@ -0,0 +1,219 @@
+import pytest
+from brownie import chain, reverts, Contract
+from eth_abi import encode_single
+
+pytestmark = pytest.mark.require_network("development")
+
+DUST_THRESHOLD = 10_000
+
+
+def wait_settlement():
+    chain.sleep(360 + 1)
+    chain.mine(1)
+
+
+def test_route_susd_sbtc(
+    susd_vault, sbtc_vault, synth_strategy, gov, susd, sbtc, susd_whale, sbtc_whale
+):
+    susd.approve(susd_vault, 2 ** 256 - 1, {"from": susd_whale})
+    susd_vault.deposit({"from": susd_whale})
+
+    # exchange susd to sbtc
+    synth_strategy.harvest({"from": gov})
+    assert synth_strategy.valueOfInvestment() == 0
+    assert synth_strategy.balanceOfWant() > 0
+    assert sbtc.balanceOf(synth_strategy) > 0
+
+    # waiting period blocks the deposit
+    synth_strategy.depositInVault({"from": gov})
+    assert sbtc_vault.balanceOf(synth_strategy) == 0
+
+    wait_settlement()
+    synth_strategy.depositInVault({"from": gov})
+    assert sbtc.balanceOf(synth_strategy) == 0
+    assert sbtc_vault.balanceOf(synth_strategy) > 0
+
+    # produce gains
+    prev_value = synth_strategy.valueOfInvestment()
+    sbtc.transfer(sbtc_vault, sbtc.balanceOf(sbtc_whale), {"from": sbtc_whale})
+    assert synth_strategy.valueOfInvestment() > prev_value
+
+    susd_vault.revokeStrategy(synth_strategy, {"from": gov})
+    synth_strategy.manualRemoveFullLiquidity({"from": gov})
+    assert sbtc.balanceOf(synth_strategy) < DUST_THRESHOLD
+    assert sbtc_vault.balanceOf(synth_strategy) < DUST_THRESHOLD
+
+    wait_settlement()
+    tx = synth_strategy.harvest({"from": gov})
+    assert tx.events["Harvested"]["profit"] > 0
+    assert susd_vault.strategies(synth_strategy).dict()["totalDebt"] == 0
+
+
+def test_emergency_exit_requires_settlement(
+    susd_vault, synth_strategy, gov, susd, susd_whale
+):
+    susd.approve(susd_vault, 2 ** 256 - 1, {"from": susd_whale})
+    susd_vault.deposit({"from": susd_whale})
+    synth_strategy.harvest({"from": gov})
+
+    synth_strategy.setEmergencyExit({"from": gov})
+    with reverts("settlement period"):
+        synth_strategy.harvest({"from": gov})
+
+
+def test_invalid_rate_skips_exchange(
+    susd_vault, synth_strategy, exchange_rates, gov, susd, sbtc, susd_whale
+):
+    susd.approve(susd_vault, 2 ** 256 - 1, {"from": susd_whale})
+    susd_vault.deposit({"from": susd_whale})
+    exchange_rates.setRateInvalid(
+        encode_single("bytes32", b"sBTC"), True, {"from": gov}
+    )
+
+    synth_strategy.harvest({"from": gov})
+    assert sbtc.balanceOf(synth_strategy) == 0
+
+    exchange_rates.setRateInvalid(
+        encode_single("bytes32", b"sBTC"), False, {"from": gov}
+    )
+    wait_settlement()
+    synth_strategy.harvest({"from": gov})
+    assert sbtc.balanceOf(synth_strategy) > 0
+
+
+def effective_value(amount, source_rate, destination_rate):
+    # multiplyDecimalRound then divideDecimalRound
+    value = (amount * source_rate // 10 ** 17 + 5) // 10
+    return (value * 10 ** 19 // destination_rate + 5) // 10
+
+
+def test_synth_pricing(synth_strategy, exchange_rates, exchanger, gov):
+    sbtc_key = encode_single("bytes32", b"sBTC")
+    susd_key = encode_single("bytes32", b"sUSD")
+    exchanger.setExchangeFeeRate(susd_key, 5 * 10 ** 15, {"from": gov})
+    sbtc_rate = exchange_rates.rates(sbtc_key)
+    to_sbtc_fee = exchanger.exchangeFeeRates(sbtc_key)
+    to_susd_fee = exchanger.exchangeFeeRates(susd_key)
+
+    assert synth_strategy.synthPricing(True) == (
+        sbtc_rate,
+        10 ** 18,
+        to_sbtc_fee,
+        False,
+    )
+    assert synth_strategy.synthPricing(False) == (
+        sbtc_rate,
+        10 ** 18,
+        to_susd_fee,
+        False,
+    )
+
+    # sUSD to send to receive an amount of sBTC, and the other way around
+    amount = 123_456_789_012_345_678
+    susd_to_send = synth_strategy.sUSDFromSynth(amount)
+    assert susd_to_send == effective_value(amount, sbtc_rate, 10 ** 18) * 10 ** 18 // (
+        10 ** 18 - to_sbtc_fee
+    )
+    received = exchanger.getAmountsForExchange(susd_to_send, susd_key, sbtc_key)[0]
+    assert abs(received - amount) <= 1
+
+    sbtc_to_send = synth_strategy.synthFromSUSD(amount)
+    assert sbtc_to_send == effective_value(amount, 10 ** 18, sbtc_rate) * 10 ** 18 // (
+        10 ** 18 - to_susd_fee
+    )
+    received = exchanger.getAmountsForExchange(sbtc_to_send, sbtc_key, susd_key)[0]
+    # within the sUSD value of 1 wei of sBTC
+    assert abs(received - amount) <= sbtc_rate // 10 ** 18
+
+    assert synth_strategy.sUSDFromSynth(0) == 0
+    assert synth_strategy.synthFromSUSD(2 ** 256 - 1) == 2 ** 256 - 1
+
+    exchange_rates.setRate(sbtc_key, 0, {"from": gov})
+    assert synth_strategy.synthPricing(False)[3]
+
+
+def test_invalid_rate_skips_withdraw(
+    susd_vault, sbtc_vault, synth_strategy, exchange_rates, gov, susd, sbtc, susd_whale
+):
+    susd.approve(susd_vault, 2 ** 256 - 1, {"from": susd_whale})
+    susd_vault.deposit({"from": susd_whale})
+    synth_strategy.harvest({"from": gov})
+    wait_settlement()
+    synth_strategy.depositInVault({"from": gov})
+    shares = sbtc_vault.balanceOf(synth_strategy)
+    assert shares > 0
+
+    exchange_rates.setRateInvalid(
+        encode_single("bytes32", b"sBTC"), True, {"from": gov}
+    )
+    want = synth_strategy.balanceOfWant()
+    tx = synth_strategy.manualRemoveLiquidity(want * 10, {"from": gov})
+    assert tx.return_value == (want, want * 9)
+    assert sbtc_vault.balanceOf(synth_strategy) == shares
+    assert susd.balanceOf(synth_strategy) == want
+
+
+def test_resolver_cache_staleness(
+    synth_strategy, resolver, exchanger, keeper, gov, MockExchanger, exchange_rates
+):
+    assert synth_strategy.isResolverCached()
+
+    new_exchanger = gov.deploy(MockExchanger, exchange_rates)
+    resolver.importAddresses(
+        [encode_single("bytes32", b"Exchanger")], [new_exchanger], {"from": gov}
+    )
+    assert not synth_strategy.isResolverCached()
+
+    synth_strategy.rebuildCache({"from": keeper})
+    assert synth_strategy.isResolverCached()
+
+
+def test_cloned_synth_router(
+    susd_vault,
+    sbtc_vault,
+    synth_strategy,
+    strategist,
+    rewards,
+    keeper,
+    gov,
+    susd,
+    sbtc,
+    susd_whale,
+):
+    clone_tx = synth_strategy.cloneSynthetixRouter(
+        susd_vault,
+        strategist,
+        rewards,
+        keeper,
+        sbtc_vault,
+        "ClonedSynthStrategy",
+        encode_single("bytes32", b"ProxysBTC"),
+        100,
+        {"from": strategist},
+    )
+    clone = Contract.from_abi(
+        "Strategy", clone_tx.events["Cloned"]["clone"], synth_strategy.abi
+    )
+    # resolved through the ReadProxy of the original
+    assert clone.isResolverCached()
+    assert clone.synthCurrencyKey() == encode_single("bytes32", b"sBTC")
+
+    susd_vault.revokeStrategy(synth_strategy, {"from": gov})
+    susd_vault.addStrategy(clone, 10_000, 0, 2 ** 256 - 1, 0, {"from": gov})
+    susd.approve(susd_vault, 2 ** 256 - 1, {"from": susd_whale})
+    susd_vault.deposit({"from": susd_whale})
+
+    clone.harvest({"from": gov})
+    assert sbtc.balanceOf(clone) > 0
+
+    wait_settlement()
+    clone.depositInVault({"from": gov})
+    assert sbtc.balanceOf(clone) == 0
+    assert sbtc_vault.balanceOf(clone) > 0
+
+
+def test_profit_reserve_factor_disabled(synth_strategy, gov):
+    # the sUSD buffer holds the profit back instead
+    with reverts("use susdBuffer"):
+        synth_strategy.setProfitReserveFactor(5_000, {"from": gov})
+    assert synth_strategy.profitReserveFactor() == 0
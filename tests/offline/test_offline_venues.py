@@ -0,0 +1,144 @@
+import pytest
+from brownie import chain, reverts, ZERO_ADDRESS
+from eth_abi import encode_single
+
+pytestmark = pytest.mark.require_network("development")
+
+CHEAP_FEE = 4 * 10 ** 6  # 0.04%, Curve fees are in base 1e10
+EXPENSIVE_FEE = 10 ** 8  # 1%, Synthetix charges 0.3% in this setup
+
+
+def to_bytes32(name):
+    return encode_single("bytes32", name.encode())
+
+
+@pytest.fixture
+def pool(MockCurvePool, gov, susd, sbtc, exchange_rates):
+    pool = gov.deploy(
+        MockCurvePool,
+        [susd, sbtc],
+        [to_bytes32("sUSD"), to_bytes32("sBTC")],
+        exchange_rates,
+        CHEAP_FEE,
+    )
+    susd.issue(pool, 1_000_000 * 10 ** 18, {"from": gov})
+    sbtc.issue(pool, 100 * 10 ** 18, {"from": gov})
+    yield pool
+
+
+@pytest.fixture
+def venue(CurveVenue, gov, pool, susd, sbtc):
+    yield gov.deploy(CurveVenue, pool, [susd, sbtc])
+
+
+@pytest.fixture
+def funded(susd_vault, susd, susd_whale):
+    susd.approve(susd_vault, 2 ** 256 - 1, {"from": susd_whale})
+    susd_vault.deposit(100_000 * 10 ** 18, {"from": susd_whale})
+
+
+def test_atomic_venue_wins(
+    synth_strategy, venue, pool, exchanger, sbtc_vault, sbtc, susd, gov, funded
+):
+    synth_strategy.setVenues([venue], {"from": gov})
+    pool_susd = susd.balanceOf(pool)
+    assert synth_strategy.previewHarvest().dict()["deposit"]
+
+    synth_strategy.harvest({"from": gov})
+
+    # no waiting period, the synth went straight to the yVault
+    assert susd.balanceOf(pool) > pool_susd
+    assert synth_strategy.isWaitingPeriodFinished()
+    assert sbtc.balanceOf(synth_strategy) == 0
+    assert sbtc_vault.balanceOf(synth_strategy) > 0
+
+    # and back through the pool once Synthetix charges more for it
+    exchanger.setExchangeFeeRate(to_bytes32("sUSD"), 3 * 10 ** 15, {"from": gov})
+    pool_sbtc = sbtc.balanceOf(pool)
+    before = susd.balanceOf(synth_strategy)
+    synth_strategy.manualRemoveLiquidity(10_000 * 10 ** 18, {"from": gov})
+    assert susd.balanceOf(synth_strategy) > before
+    assert sbtc.balanceOf(pool) > pool_sbtc
+
+
+def test_synthetix_wins(synth_strategy, venue, pool, sbtc, susd, gov, funded):
+    pool.setFee(EXPENSIVE_FEE, {"from": gov})
+    synth_strategy.setVenues([venue], {"from": gov})
+    pool_susd = susd.balanceOf(pool)
+
+    synth_strategy.harvest({"from": gov})
+
+    assert susd.balanceOf(pool) == pool_susd
+    assert sbtc.balanceOf(synth_strategy) > 0
+    assert not synth_strategy.isWaitingPeriodFinished()
+
+
+def test_venue_slippage(synth_strategy, venue, pool, gov, management, funded):
+    synth_strategy.setVenues([venue], {"from": gov})
+    pool.setPayout(9_900, {"from": gov})
+
+    with reverts():
+        synth_strategy.harvest({"from": gov})
+
+    synth_strategy.setVenueSlippage(200, {"from": management})
+    synth_strategy.harvest({"from": gov})
+    assert synth_strategy.isWaitingPeriodFinished()
+
+
+def test_venue_allowance_cleared(
+    synth_strategy,
+    MockExchangeVenue,
+    exchange_rates,
+    susd_vault,
+    susd,
+    sbtc,
+    susd_whale,
+    gov,
+    funded,
+):
+    venue = gov.deploy(MockExchangeVenue, exchange_rates, [susd, sbtc])
+    sbtc.issue(venue, 100 * 10 ** 18, {"from": gov})
+    venue.setPulled(5_000, {"from": gov})
+    synth_strategy.setVenues([venue], {"from": gov})
+
+    synth_strategy.harvest({"from": gov})
+    assert susd.allowance(synth_strategy, venue) == 0
+
+    # a leftover allowance would make the next approval revert
+    susd_vault.deposit(10_000 * 10 ** 18, {"from": susd_whale})
+    synth_strategy.harvest({"from": gov})
+    assert susd.allowance(synth_strategy, venue) == 0
+
+
+def test_venues_wait_for_settlement(
+    synth_strategy, venue, pool, susd_vault, susd, susd_whale, gov, funded
+):
+    # in and out through Synthetix, the sUSD received is in its waiting period
+    pool.setFee(EXPENSIVE_FEE, {"from": gov})
+    synth_strategy.setVenues([venue], {"from": gov})
+    synth_strategy.harvest({"from": gov})
+    chain.sleep(360 + 1)
+    chain.mine(1)
+    synth_strategy.manualRemoveFullLiquidity({"from": gov})
+
+    # the pool is cheaper now, but the sUSD can't be sent to it yet
+    pool.setFee(CHEAP_FEE, {"from": gov})
+    susd_vault.deposit(10_000 * 10 ** 18, {"from": susd_whale})
+    preview = synth_strategy.previewHarvest().dict()
+    assert preview["exchange"]
+    assert not preview["deposit"]
+    assert preview["revertReason"] == "Cannot settle during waiting period"
+
+
+def test_set_venues(synth_strategy, venue, gov, strategist, management):
+    with reverts("!authorized"):
+        synth_strategy.setVenues([venue], {"from": management})
+    with reverts("!venues"):
+        synth_strategy.setVenues([venue] * 4, {"from": gov})
+    with reverts("!too high"):
+        synth_strategy.setVenueSlippage(10_001, {"from": gov})
+
+    synth_strategy.setVenues([venue], {"from": gov})
+    assert synth_strategy.getVenues() == [venue]
+    synth_strategy.setVenues([], {"from": gov})
+    assert synth_strategy.getVenues() == []
@@ -0,0 +1,103 @@
+import pytest
+from brownie import chain, reverts, MockVirtualSynth
+
+pytestmark = pytest.mark.require_network("development")
+
+DUST_THRESHOLD = 10_000
+MAX_VIRTUAL_SYNTHS = 5
+
+
+def wait_settlement():
+    chain.sleep(360 + 1)
+    chain.mine(1)
+
+
+@pytest.fixture
+def virtual_strategy(synth_strategy, susd_vault, susd, susd_whale, gov):
+    synth_strategy.setUseVirtualSynths(True, {"from": gov})
+    susd.approve(susd_vault, 2 ** 256 - 1, {"from": susd_whale})
+    yield synth_strategy
+
+
+def test_virtual_synth_lifecycle(
+    virtual_strategy, susd_vault, sbtc_vault, susd, sbtc, susd_whale, gov, keeper
+):
+    strategy = virtual_strategy
+    susd_vault.deposit(100_000 * 10 ** 18, {"from": susd_whale})
+    strategy.harvest({"from": gov})
+
+    # the synth sits in the virtual synth, the strategy is not locked
+    assert strategy.virtualSynthsLength() == 1
+    assert sbtc.balanceOf(strategy) == 0
+    assert strategy.balanceOfVirtualSynths() > 0
+    assert strategy.isWaitingPeriodFinished()
+    assert strategy.estimatedTotalAssets() == pytest.approx(
+        100_000 * 10 ** 18, rel=1e-2
+    )
+    assert not strategy.tendTrigger(0)
+
+    wait_settlement()
+    assert strategy.tendTrigger(0)
+    strategy.tend({"from": keeper})
+    assert strategy.virtualSynthsLength() == 0
+    assert sbtc.balanceOf(strategy) == 0
+    assert sbtc_vault.balanceOf(strategy) > 0
+
+    # a second exchange does not block withdrawing from the yVault
+    susd_vault.deposit(100_000 * 10 ** 18, {"from": susd_whale})
+    strategy.harvest({"from": gov})
+    assert strategy.virtualSynthsLength() == 1
+    before = susd.balanceOf(strategy)
+    strategy.manualRemoveLiquidity(10_000 * 10 ** 18, {"from": gov})
+    assert susd.balanceOf(strategy) > before
+
+    # settled by someone else, it is dropped
+    wait_settlement()
+    vsynth = MockVirtualSynth.at(strategy.virtualSynths(0))
+    vsynth.settle(strategy, {"from": susd_whale})
+    assert sbtc.balanceOf(strategy) > 0
+    strategy.settleVirtualSynths({"from": keeper})
+    assert strategy.virtualSynthsLength() == 0
+
+
+def test_virtual_synths_are_bounded(
+    virtual_strategy, susd_vault, sbtc, susd_whale, gov
+):
+    strategy = virtual_strategy
+    for i in range(MAX_VIRTUAL_SYNTHS):
+        susd_vault.deposit(10_000 * 10 ** 18, {"from": susd_whale})
+        strategy.harvest({"from": gov})
+    assert strategy.virtualSynthsLength() == MAX_VIRTUAL_SYNTHS
+
+    # falls back to a plain exchange
+    susd_vault.deposit(10_000 * 10 ** 18, {"from": susd_whale})
+    strategy.harvest({"from": gov})
+    assert strategy.virtualSynthsLength() == MAX_VIRTUAL_SYNTHS
+    assert sbtc.balanceOf(strategy) > 0
+    assert not strategy.isWaitingPeriodFinished()
+
+
+def test_emergency_exit_settles_virtual_synths(
+    virtual_strategy, susd_vault, susd, susd_whale, gov
+):
+    strategy = virtual_strategy
+    susd_vault.deposit(100_000 * 10 ** 18, {"from": susd_whale})
+    strategy.harvest({"from": gov})
+
+    strategy.setEmergencyExit({"from": gov})
+    with reverts("settle virtual synths first"):
+        strategy.harvest({"from": gov})
+
+    wait_settlement()
+    strategy.manualRemoveFullLiquidity({"from": gov})
+    assert strategy.virtualSynthsLength() == 0
+    wait_settlement()
+    strategy.harvest({"from": gov})
+    assert susd_vault.strategies(strategy).dict()["totalDebt"] == 0
+
+
+def test_set_use_virtual_synths(synth_strategy, management, rewards):
+    with reverts():
+        synth_strategy.setUseVirtualSynths(True, {"from": rewards})
+    synth_strategy.setUseVirtualSynths(True, {"from": management})
+    assert synth_strategy.useVirtualSynths()
@@ -0,0 +1,164 @@
+import pytest
+from brownie import chain, reverts, Wei
+
+pytestmark = pytest.mark.require_network("development")
+
+WEIGHTS = [5_000, 3_000, 2_000]
+
+
+@pytest.fixture
+def destinations(gov, MockYVault, weth):
+    yield [gov.deploy(MockYVault, weth) for _ in WEIGHTS]
+
+
+@pytest.fixture
+def weighted_strategy(
+    strategist, keeper, origin_vault, destinations, WeightedRouterStrategy, gov
+):
+    strategy = strategist.deploy(
+        WeightedRouterStrategy,
+        origin_vault,
+        destinations,
+        WEIGHTS,
+        "Weighted yvWETH router",
+    )
+    strategy.setKeeper(keeper)
+    origin_vault.addStrategy(strategy, 10_000, 0, 2 ** 256 - 1, 0, {"from": gov})
+    yield strategy
+
+
+def test_deposit_by_weight(weighted_strategy, origin_vault, destinations, gov):
+    weighted_strategy.harvest({"from": gov})
+
+    total = origin_vault.strategies(weighted_strategy).dict()["totalDebt"]
+    for destination, weight in zip(destinations, WEIGHTS):
+        assert destination.totalAssets() == total * weight // 10_000
+    assert weighted_strategy.estimatedTotalAssets() == pytest.approx(total, abs=10)
+
+
+def test_deposit_limit_overflow(weighted_strategy, origin_vault, destinations, gov):
+    destinations[0].setDepositLimit(Wei("10 ether"), {"from": gov})
+    weighted_strategy.harvest({"from": gov})
+
+    assert destinations[0].totalAssets() == Wei("10 ether")
+    assert weighted_strategy.balanceOfWant() == 0
+    assert weighted_strategy.estimatedTotalAssets() == pytest.approx(
+        origin_vault.strategies(weighted_strategy).dict()["totalDebt"], abs=10
+    )
+
+
+def test_withdraw_most_liquid_first(
+    weighted_strategy, origin_vault, destinations, gov, weth, weth_whale
+):
+    weighted_strategy.harvest({"from": gov})
+    before = [d.totalAssets() for d in destinations]
+
+    shares = origin_vault.balanceOf(weth_whale) // 10
+    origin_vault.withdraw(shares, weth_whale, 0, {"from": weth_whale})
+
+    after = [d.totalAssets() for d in destinations]
+    # the largest destination holds the most idle want
+    assert after[0] < before[0]
+    assert after[1:] == before[1:]
+    assert origin_vault.strategies(weighted_strategy).dict()["totalLoss"] == 0
+
+
+def test_rebalance(weighted_strategy, destinations, keeper, gov, user):
+    weighted_strategy.harvest({"from": gov})
+    total = weighted_strategy.estimatedTotalAssets()
+
+    new_weights = [2_000, 3_000, 5_000]
+    weighted_strategy.setDestinations(destinations, new_weights, {"from": gov})
+
+    with reverts("!authorized"):
+        weighted_strategy.rebalance(5, {"from": user})
+
+    # one move per call
+    weighted_strategy.rebalance(1, {"from": keeper})
+    assert destinations[2].totalAssets() == pytest.approx(total // 2, abs=10)
+    assert destinations[0].totalAssets() == pytest.approx(total // 5, abs=10)
+
+    tx = weighted_strategy.rebalance(5, {"from": keeper})
+    assert "Transfer" not in tx.events
+    assert weighted_strategy.estimatedTotalAssets() == pytest.approx(total, abs=10)
+
+
+def test_set_destinations(weighted_strategy, destinations, gov, MockYVault, weth):
+    weighted_strategy.harvest({"from": gov})
+    other = gov.deploy(MockYVault, weth)
+
+    with reverts("!weights"):
+        weighted_strategy.setDestinations(
+            destinations, [5_000, 5_000, 1], {"from": gov}
+        )
+    with reverts("!duplicate"):
+        weighted_strategy.setDestinations(
+            [destinations[0], destinations[0]], [5_000, 5_000], {"from": gov}
+        )
+    with reverts("!empty"):
+        weighted_strategy.setDestinations(
+            destinations[:2] + [other], WEIGHTS, {"from": gov}
+        )
+
+    weighted_strategy.setDestinations(
+        destinations + [other], [5_000, 3_000, 1_000, 1_000], {"from": gov}
+    )
+    assert weighted_strategy.getDestinations()[0] == destinations + [other]
+    assert weth.allowance(weighted_strategy, other) == 2 ** 256 - 1
+
+    # a dropped destination keeps no allowance
+    weighted_strategy.setDestinations(destinations, WEIGHTS, {"from": gov})
+    assert weth.allowance(weighted_strategy, other) == 0
+
+
+def test_profit_revoke(weighted_strategy, origin_vault, destinations, gov, weth):
+    weighted_strategy.harvest({"from": gov})
+    weth.mint(destinations[1], Wei("3 ether"))
+    chain.sleep(3600)
+    chain.mine(1)
+
+    tx = weighted_strategy.harvest({"from": gov})
+    assert tx.events["Harvested"]["profit"] > 0
+
+    origin_vault.revokeStrategy(weighted_strategy, {"from": gov})
+    weighted_strategy.harvest({"from": gov})
+    assert origin_vault.strategies(weighted_strategy).dict()["totalDebt"] == 0
+    assert origin_vault.strategies(weighted_strategy).dict()["totalLoss"] == 0
+
+
+def test_setter_bounds(weighted_strategy, gov):
+    weighted_strategy.setMaxLoss(10_000, {"from": gov})
+    weighted_strategy.setRebalanceThreshold(10_000, {"from": gov})
+    assert weighted_strategy.maxLoss() == 10_000
+    assert weighted_strategy.rebalanceThreshold() == 10_000
+
+    with reverts("!too high"):
+        weighted_strategy.setMaxLoss(10_001, {"from": gov})
+    with reverts("!too high"):
+        weighted_strategy.setRebalanceThreshold(10_001, {"from": gov})
+
+
+def test_harvest_trigger_without_quote(
+    weighted_strategy, origin_vault, destinations, gov, weth, MockUniswapRouter
+):
+    call_cost = Wei("0.01 ether")
+    uniswap = gov.deploy(MockUniswapRouter)
+    uniswap.setBroken(True, {"from": gov})
+    weighted_strategy.setEthToWantRouter(uniswap, {"from": gov})
+
+    weighted_strategy.harvest({"from": gov})
+    chain.sleep(3600)
+    chain.mine(1)
+    weth.mint(destinations[0], Wei("10 ether"))
+
+    # the call cost is unknown, it is not taken as a free call
+    assert weighted_strategy.ethToWant(call_cost) == 0
+    assert not weighted_strategy.harvestTrigger(call_cost)
+
+    uniswap.setBroken(False, {"from": gov})
+    uniswap.setRate(Wei("1 ether"), {"from": gov})
+    assert weighted_strategy.ethToWant(call_cost) == call_cost
+    assert weighted_strategy.harvestTrigger(call_cost)
+
+    weighted_strategy.harvest({"from": gov})
+    assert weighted_strategy.cachedEthToWant() == Wei("1 ether")
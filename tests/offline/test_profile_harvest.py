@@ -0,0 +1,65 @@
+import pytest
+
+from scripts.profile_harvest import Profile, step_costs
+
+pytestmark = pytest.mark.require_network("development")
+
+
+def step(depth, gas, gas_cost, fn, jump_depth=0):
+    return {
+        "depth": depth,
+        "gas": gas,
+        "gasCost": gas_cost,
+        "fn": fn,
+        "jumpDepth": jump_depth,
+    }
+
+
+def test_step_costs_charge_calls_without_the_callee():
+    trace = [
+        step(0, 10_000, 3, "Router.harvest"),
+        step(0, 9_997, 8, "Router._invest", 1),
+        # CALL: 2_600 to access, 7_000 forwarded, 389 kept
+        step(0, 9_989, 9_600, "Router._invest", 1),
+        step(1, 7_000, 2_100, "Token.approve"),
+        step(1, 4_900, 0, "Token.approve"),
+        # back with 389 + 4_900
+        step(0, 5_289, 3, "Router._invest", 1),
+        step(0, 5_286, 0, "Router.harvest"),
+    ]
+    costs = step_costs(trace)
+    assert costs[2] == 2_600
+    assert costs[3] == 2_100
+    # the trace is gas-tight: the costs add up to the gas the steps consumed
+    assert sum(costs) == trace[0]["gas"] - trace[-1]["gas"] + trace[-1]["gasCost"]
+
+    profile = Profile()
+    profile.add_trace(trace, 40_000)
+    assert profile.stacks["Router.harvest;Router._invest;Token.approve"] == 2_100
+    assert profile.self_gas()["Token.approve"] == 2_100
+    assert profile.inclusive_gas()["Router.harvest"] == sum(costs)
+    assert profile.inclusive_gas()["Router._invest"] == sum(costs[1:6])
+    assert profile.callees == {"Token.approve": 2_100}
+
+
+def test_profile_harvest(susd_vault, synth_strategy, gov, susd, susd_whale, tmp_path):
+    susd.approve(susd_vault, 2 ** 256 - 1, {"from": susd_whale})
+    susd_vault.deposit({"from": susd_whale})
+    tx = synth_strategy.harvest({"from": gov})
+
+    profile = Profile()
+    profile.add(tx)
+    trace = tx.trace
+    assert profile.traced == sum(step_costs(trace))
+    assert profile.traced == trace[0]["gas"] - trace[-1]["gas"] + trace[-1]["gasCost"]
+    assert profile.traced < tx.gas_used
+
+    assert all(stack.startswith(trace[0]["fn"]) for stack in profile.stacks)
+    callees = " ".join(profile.callees)
+    assert "Vault.report" in callees
+    assert "MockSynthetix.exchangeWithTracking" in callees
+
+    path = tmp_path / "harvest.folded"
+    profile.write_folded(path)
+    lines = path.read_text().splitlines()
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == profile.traced
@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+from brownie import web3, ZERO_ADDRESS
+
+from monitor import Indexer, JsonRpcClient, RouterLens, Store
+
+pytestmark = pytest.mark.require_network("development")
+
+
+@pytest.fixture
+def lens(RouterLens, gov):
+    yield gov.deploy(RouterLens)
+
+
+@pytest.fixture
+def invested(strategy, synth_strategy, susd_vault, susd, susd_whale, gov):
+    strategy.harvest({"from": gov})
+    susd.approve(susd_vault, 2 ** 256 - 1, {"from": susd_whale})
+    susd_vault.deposit(10_000 * 10 ** 18, {"from": susd_whale})
+    synth_strategy.harvest({"from": gov})
+
+
+def test_lens_states(
+    lens, strategy, synth_strategy, origin_vault, susd_vault, weth, gov, invested
+):
+    states = lens.getStates([strategy, synth_strategy, weth, gov])
+
+    state = states[0].dict()
+    params = origin_vault.strategies(strategy).dict()
+    assert state["isRouter"] and state["valid"] and not state["isSynth"]
+    assert state["vault"] == origin_vault
+    assert state["yVault"] == strategy.yVault()
+    assert state["estimatedTotalAssets"] == strategy.estimatedTotalAssets()
+    assert state["valueOfInvestment"] == strategy.valueOfInvestment()
+    assert state["maxLoss"] == strategy.maxLoss()
+    assert state["totalDebt"] == params["totalDebt"]
+    assert state["debtRatio"] == params["debtRatio"]
+
+    state = states[1].dict()
+    assert state["isRouter"] and state["valid"] and state["isSynth"]
+    assert state["vault"] == susd_vault
+    assert state["susdBuffer"] == synth_strategy.susdBuffer()
+    assert state["balanceOfSynth"] == synth_strategy.balanceOfSynth()
+    assert state["balanceOfSynth"] > 0
+    assert not state["waitingPeriodFinished"]
+    assert (
+        state["totalDebt"] == susd_vault.strategies(synth_strategy).dict()["totalDebt"]
+    )
+
+    # neither a token nor an account revert the read
+    for state in states[2:]:
+        assert not state.dict()["isRouter"]
+        assert state.dict()["vault"] == ZERO_ADDRESS
+
+
+def test_lens_reverting_router(
+    lens, strategy, synth_strategy, destination_vault, gov, invested
+):
+    destination_vault.setBroken(True, {"from": gov})
+    states = lens.getStates([strategy, synth_strategy])
+
+    # the reads of the yVault price revert, the other entries are still read
+    state = states[0].dict()
+    assert state["isRouter"] and not state["valid"]
+    assert state["estimatedTotalAssets"] == 0
+    assert state["balanceOfWant"] == strategy.balanceOfWant()
+    assert state["totalDebt"] > 0
+    assert states[1].dict()["valid"]
+
+
+def test_lens_client_pages(lens, strategy, synth_strategy, weth, invested):
+    routers = [strategy.address, synth_strategy.address, weth.address] * 3
+    client = RouterLens(
+        JsonRpcClient(web3.provider.endpoint_uri), lens.address, page_size=2
+    )
+    states = asyncio.run(client.states(routers))
+
+    assert [state["strategy"] for state in states] == [r.lower() for r in routers]
+    for state, expected in zip(states, lens.getStates(routers)):
+        expected = expected.dict()
+        assert state["is_router"] == expected["isRouter"]
+        assert state["valid"] == expected["valid"]
+        assert state["estimated_total_assets"] == expected["estimatedTotalAssets"]
+        assert state["balance_of_synth"] == expected["balanceOfSynth"]
+
+
+def test_indexer_with_lens(lens, strategy, synth_strategy, invested, tmp_path):
+    client = JsonRpcClient(web3.provider.endpoint_uri)
+    reports = []
+    for name, router_lens in [
+        ("calls", None),
+        ("lens", RouterLens(client, lens.address)),
+    ]:
+        store = Store(tmp_path / f"{name}.db")
+        indexer = Indexer(
+            client,
+            store,
+            routers=[strategy.address, synth_strategy.address],
+            lens=router_lens,
+        )
+        asyncio.run(indexer.refresh_state())
+        reports.append(store.report())
+
+    assert reports[0] == reports[1]
@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+from brownie import chain
+from eth_abi import encode_single
+
+from simulator import BufferSimulation, gbm_prices, user_flows
+
+pytestmark = pytest.mark.require_network("development")
+
+HARVEST_INTERVAL = 3600
+WEI = 10 ** 18
+
+# (sBTC price, deposit, withdrawn share of the servable sUSD, yVault yield,
+#  sBTC rate invalid)
+STEPS = [
+    (50_000, 10_000, 0, 0, False),
+    (51_000, 0, 0, 0.01, False),
+    (49_000, 2_000, 0.5, 0, False),
+    # the buffer can't be refilled and the deposit can't be invested
+    (49_000, 0, 0.9, 0, True),
+    (49_000, 3_000, 0, 0, True),
+    (49_500, 0, 0.3, 0.02, False),
+    (52_000, 5_000, 0, 0, False),
+    (52_000, 0, 0.9, 0.001, False),
+]
+
+
+def test_simulator_matches_chain(
+    susd_vault,
+    sbtc_vault,
+    synth_strategy,
+    exchange_rates,
+    exchanger,
+    susd,
+    sbtc,
+    susd_whale,
+    keeper,
+    gov,
+):
+    waiting_period = exchanger.waitingPeriodSecs()
+    fee_to_synth = exchanger.exchangeFeeRates(encode_single("bytes32", b"sBTC")) / WEI
+    fee_to_susd = exchanger.exchangeFeeRates(encode_single("bytes32", b"sUSD")) / WEI
+    sim = BufferSimulation(
+        [synth_strategy.susdBuffer()],
+        1,
+        harvest_interval=HARVEST_INTERVAL,
+        waiting_period=waiting_period,
+    )
+    susd.approve(susd_vault, 2 ** 256 - 1, {"from": susd_whale})
+
+    for price, deposit, withdraw_share, yield_, rate_invalid in STEPS:
+        if yield_ > 0:
+            before = sbtc_vault.totalAssets()
+            sbtc.issue(sbtc_vault, int(before * yield_), {"from": gov})
+            yield_ = (sbtc_vault.totalAssets() - before) / before
+        if deposit > 0:
+            susd_vault.deposit(deposit * WEI, {"from": susd_whale})
+        withdrawn = 0
+        if withdraw_share > 0:
+            servable = susd.balanceOf(susd_vault) + synth_strategy.balanceOfWant()
+            shares = int(servable * withdraw_share) * WEI // susd_vault.pricePerShare()
+            before = susd.balanceOf(susd_whale)
+            susd_vault.withdraw(shares, {"from": susd_whale})
+            withdrawn = susd.balanceOf(susd_whale) - before
+
+        exchange_rates.setRate(
+            encode_single("bytes32", b"sBTC"), price * WEI, {"from": gov}
+        )
+        exchange_rates.setRateInvalid(
+            encode_single("bytes32", b"sBTC"), rate_invalid, {"from": gov}
+        )
+        synth_strategy.harvest({"from": gov})
+        chain.sleep(waiting_period + 1)
+        assert synth_strategy.tendTrigger(0) == (
+            sbtc.balanceOf(synth_strategy) > 10_000
+        )
+        synth_strategy.tend({"from": keeper})
+        chain.sleep(HARVEST_INTERVAL - waiting_period - 1)
+        chain.mine(1)
+
+        sim.step(
+            price,
+            deposit=deposit * WEI,
+            withdrawal=withdrawn,
+            yield_=yield_,
+            fee_to_synth=fee_to_synth,
+            fee_to_susd=fee_to_susd,
+            rate_invalid=rate_invalid,
+        )
+        state = sim.state
+        params = susd_vault.strategies(synth_strategy).dict()
+        for on_chain, simulated in [
+            (susd.balanceOf(susd_vault), state.vault_idle),
+            (params["totalDebt"], state.debt),
+            (params["debtRatio"], state.debt_ratio),
+            (synth_strategy.balanceOfWant(), state.susd),
+            (sbtc.balanceOf(synth_strategy), state.synth),
+            (sbtc_vault.totalAssets(), state.invested),
+        ]:
+            assert on_chain == pytest.approx(simulated[0, 0], rel=1e-6, abs=10_000)
+
+    assert synth_strategy.estimatedTotalAssets() == pytest.approx(
+        sim.estimated_total_assets()[0, 0], rel=1e-6
+    )
+
+
+def test_grid_matches_single_scenarios():
+    buffers = [0, 100, 500]
+    prices = gbm_prices(4, 60, 50_000, seed=1)
+    deposits, withdrawals = user_flows(
+        4, 60, 1_000_000 * WEI, withdraw_rate=0.2, seed=2
+    )
+    fees = np.array([[0.001], [0.003], [0.005], [0.01]])
+
+    grid = BufferSimulation(buffers, 4).run(
+        prices, deposits=deposits, withdrawals=withdrawals, fee_to_synth=fees
+    )
+
+    for i, buffer in enumerate(buffers):
+        for p in range(4):
+            single = BufferSimulation([buffer], 1).run(
+                prices[p : p + 1],
+                deposits=deposits[p : p + 1],
+                withdrawals=withdrawals[p : p + 1],
+                fee_to_synth=fees[p : p + 1],
+            )
+            assert single.fees_paid[0, 0] == grid.fees_paid[i, p]
+            assert single.unmet_withdrawals[0, 0] == grid.unmet_withdrawals[i, p]
+            assert single.final_assets[0, 0] == grid.final_assets[i, p]
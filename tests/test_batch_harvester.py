@@ -0,0 +1,94 @@
+import pytest
+from brownie import chain, reverts, Contract, ZERO_ADDRESS
+
+HARVEST = 0
+TEND = 1
+DEPOSIT_IN_VAULT = 2
+GAS_LIMIT = 3_000_000
+
+
+@pytest.fixture
+def harvester(BatchHarvester, gov, keeper):
+    harvester = gov.deploy(BatchHarvester)
+    harvester.setKeeper(keeper, True, {"from": gov})
+    yield harvester
+
+
+def test_batch_harvest_clones(
+    origin_vault,
+    destination_vault,
+    strategy,
+    strategist,
+    rewards,
+    keeper,
+    gov,
+    harvester,
+):
+    clone_tx = strategy.cloneRouter(
+        origin_vault, strategist, rewards, harvester, destination_vault, "Clone"
+    )
+    cloned_strategy = Contract.from_abi(
+        "Strategy", clone_tx.events["Cloned"]["clone"], strategy.abi
+    )
+    strategy.setKeeper(harvester, {"from": strategist})
+
+    origin_vault.updateStrategyDebtRatio(strategy, 5_000, {"from": gov})
+    origin_vault.addStrategy(cloned_strategy, 5_000, 0, 2 ** 256 - 1, 0, {"from": gov})
+
+    tx = harvester.execute(
+        [(strategy, HARVEST, GAS_LIMIT), (cloned_strategy, HARVEST, GAS_LIMIT)],
+        {"from": keeper},
+    )
+
+    assert len(tx.events["Executed"]) == 2
+    for event in tx.events["Executed"]:
+        assert event["success"]
+        assert event["gasUsed"] > 0
+    assert len(tx.events["Harvested"]) == 2
+    assert strategy.valueOfInvestment() > 0
+    assert cloned_strategy.valueOfInvestment() > 0
+
+
+def test_batch_failures_are_isolated(strategy, strategist, keeper, harvester):
+    # the harvester is not keeper of the strategy, depositInVault does not exist
+    tx = harvester.execute(
+        [
+            (strategy, DEPOSIT_IN_VAULT, GAS_LIMIT),
+            (strategy, HARVEST, GAS_LIMIT),
+            (ZERO_ADDRESS, TEND, GAS_LIMIT),
+        ],
+        {"from": keeper},
+    )
+
+    results = [event["success"] for event in tx.events["Executed"]]
+    assert results == [False, False, False]
+
+    strategy.setKeeper(harvester, {"from": strategist})
+    tx = harvester.execute(
+        [(strategy, DEPOSIT_IN_VAULT, GAS_LIMIT), (strategy, HARVEST, GAS_LIMIT)],
+        {"from": keeper},
+    )
+    results = [event["success"] for event in tx.events["Executed"]]
+    assert results == [False, True]
+
+
+def test_batch_out_of_gas_job(strategy, strategist, keeper, harvester, MockGasBurner):
+    burner = keeper.deploy(MockGasBurner)
+    strategy.setKeeper(harvester, {"from": strategist})
+
+    tx = harvester.execute(
+        [(burner, HARVEST, 1_000_000), (strategy, HARVEST, GAS_LIMIT)],
+        {"from": keeper, "gas_limit": 1_000_000 + GAS_LIMIT + 500_000},
+    )
+
+    results = [event["success"] for event in tx.events["Executed"]]
+    assert results == [False, True]
+    assert tx.events["Executed"][0]["gasUsed"] >= 1_000_000
+    assert len(tx.events["Harvested"]) == 1
+
+
+def test_batch_permissions(strategy, user, keeper, harvester):
+    with reverts("!authorized"):
+        harvester.execute([(strategy, HARVEST, GAS_LIMIT)], {"from": user})
+    with reverts("!gasLimit"):
+        harvester.execute([(strategy, HARVEST, 0)], {"from": keeper})
@@ -0,0 +1,96 @@
+import pytest
+from brownie import chain, Wei
+
+
+def test_gas_harvest_deposit(unique_strategy, gov, gas_recorder):
+    tx = unique_strategy.harvest({"from": gov})
+    assert unique_strategy.valueOfInvestment() > 0
+
+    gas_recorder.record("RouterStrategy.harvest", "deposit", tx)
+
+
+def test_gas_harvest_idle(unique_strategy, gov, gas_recorder):
+    unique_strategy.harvest({"from": gov})
+    chain.sleep(3600)
+    chain.mine(1)
+
+    tx = unique_strategy.harvest({"from": gov})
+    assert tx.events["Harvested"]["loss"] == 0
+
+    gas_recorder.record("RouterStrategy.harvest", "idle", tx)
+
+
+def test_gas_harvest_profit(
+    unique_strategy, yvweth_042, gov, weth, weth_whale, gas_recorder
+):
+    unique_strategy.harvest({"from": gov})
+    weth.transfer(yvweth_042, Wei("10 ether"), {"from": weth_whale})
+    chain.sleep(3600)
+    chain.mine(1)
+
+    tx = unique_strategy.harvest({"from": gov})
+    assert tx.events["Harvested"]["profit"] > 0
+
+    gas_recorder.record("RouterStrategy.harvest", "profit", tx)
+
+
+def test_gas_harvest_profit_netted(
+    unique_strategy, yvweth_042, gov, weth, weth_whale, gas_recorder
+):
+    strategy = unique_strategy
+    strategy.harvest({"from": gov})
+
+    # the second profit is half the first, so the reserve covers it
+    txs = {}
+    for factor in [0, 10_000]:
+        strategy.setProfitReserveFactor(factor, {"from": gov})
+        for i in range(2):
+            weth.transfer(yvweth_042, Wei("10 ether") // (i + 1), {"from": weth_whale})
+            chain.sleep(3600)
+            chain.mine(1)
+            txs[factor] = strategy.harvest({"from": gov})
+            assert txs[factor].events["Harvested"]["profit"] > 0
+
+    # the reserve paid the profit, no yVault withdraw
+    assert strategy.balanceOfWant() > 0
+    assert txs[10_000].gas_used < txs[0].gas_used
+
+    gas_recorder.record("RouterStrategy.harvest", "profit_netted", txs[10_000])
+
+
+def test_gas_harvest_revoke(unique_strategy, yvweth_032, gov, gas_recorder):
+    unique_strategy.harvest({"from": gov})
+    chain.sleep(3600)
+    chain.mine(1)
+    yvweth_032.revokeStrategy(unique_strategy, {"from": gov})
+
+    tx = unique_strategy.harvest({"from": gov})
+    assert tx.events["Harvested"]["debtPayment"] > 0
+
+    gas_recorder.record("RouterStrategy.harvest", "revoke", tx)
+
+
+def test_gas_tend(unique_strategy, gov, weth, weth_whale, gas_recorder):
+    unique_strategy.harvest({"from": gov})
+    weth.transfer(unique_strategy, Wei("1 ether"), {"from": weth_whale})
+
+    tx = unique_strategy.tend({"from": gov})
+    assert unique_strategy.balanceOfWant() == 0
+
+    gas_recorder.record("RouterStrategy.tend", "deposit", tx)
+
+
+def test_gas_vault_withdraw(
+    unique_strategy, yvweth_032, gov, weth, weth_whale, gas_recorder
+):
+    weth.approve(yvweth_032, 2 ** 256 - 1, {"from": weth_whale})
+    yvweth_032.setDepositLimit(2 ** 256 - 1, {"from": gov})
+    yvweth_032.deposit(Wei("100 ether"), {"from": weth_whale})
+    unique_strategy.harvest({"from": gov})
+
+    # more than the vault has idle, so the strategy is liquidated
+    tx = yvweth_032.withdraw(
+        yvweth_032.balanceOf(weth_whale), weth_whale, 10_000, {"from": weth_whale}
+    )
+
+    gas_recorder.record("RouterStrategy.liquidatePosition", "withdraw", tx)
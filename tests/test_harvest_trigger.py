@@ -0,0 +1,64 @@
+import pytest
+from brownie import chain, reverts, Wei
+
+
+def test_harvest_trigger(unique_strategy, yvweth_042, gov, weth, weth_whale):
+    strategy = unique_strategy
+    strategy.harvest({"from": gov})
+    call_cost = Wei("0.01 ether")
+
+    chain.sleep(60)
+    chain.mine(1)
+    assert not strategy.harvestTrigger(call_cost)
+
+    # pending profit pays for the call
+    weth.transfer(yvweth_042, Wei("10 ether"), {"from": weth_whale})
+    assert strategy.harvestTrigger(call_cost)
+
+    # unless the call cost multiplier is too high
+    strategy.setProfitFactor(2 ** 128, {"from": gov})
+    assert not strategy.harvestTrigger(call_cost)
+
+    chain.sleep(strategy.maxReportDelay())
+    chain.mine(1)
+    assert strategy.harvestTrigger(call_cost)
+
+
+def test_harvest_trigger_credit(unique_strategy, yvweth_032, gov):
+    strategy = unique_strategy
+    strategy.harvest({"from": gov})
+    chain.sleep(60)
+    chain.mine(1)
+
+    # credit available from an unused vault debt ratio
+    yvweth_032.updateStrategyDebtRatio(
+        strategy,
+        yvweth_032.strategies(strategy).dict()["debtRatio"] // 2,
+        {"from": gov},
+    )
+    strategy.harvest({"from": gov})
+    yvweth_032.updateStrategyDebtRatio(
+        strategy, yvweth_032.strategies(strategy).dict()["debtRatio"] * 2, {"from": gov}
+    )
+    assert yvweth_032.creditAvailable(strategy) > 0
+    assert strategy.harvestTrigger(Wei("0.01 ether"))
+
+    strategy.setCreditFactor(0, {"from": gov})
+    assert not strategy.harvestTrigger(Wei("0.01 ether"))
+
+
+def test_set_credit_factor(unique_strategy, gov, user):
+    with reverts("!authorized"):
+        unique_strategy.setCreditFactor(5_000, {"from": user})
+
+    with reverts("!too high"):
+        unique_strategy.setCreditFactor(10_001, {"from": gov})
+
+    unique_strategy.setCreditFactor(5_000, {"from": gov})
+    assert unique_strategy.creditFactor() == 5_000
+
+
+def test_eth_to_want_weth(strategy):
+    # WETH routes need no quote
+    assert strategy.ethToWant(Wei("1 ether")) == Wei("1 ether")
+    assert strategy.cachedEthToWant() == 0
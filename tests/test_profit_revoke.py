@@ -24,3 +24,31 @@ def test_profit_revoke(yvweth_032, yvweth_042, unique_strategy, gov, weth, weth_
     assert yvweth_032.strategies(strategy).dict()["totalLoss"] == 0
     assert strategy.balanceOfWant() == 0
     assert strategy.valueOfInvestment() < Wei("0.001 ether")  # there might be dust
+
+
+def test_profit_reserve(yvweth_032, yvweth_042, unique_strategy, gov, weth, weth_whale):
+    strategy = unique_strategy
+    strategy.setProfitReserveFactor(10_000, {"from": gov})
+    strategy.harvest({"from": gov})
+
+    weth.transfer(yvweth_042, Wei("10 ether"), {"from": weth_whale})
+    chain.sleep(3600)
+    chain.mine(1)
+    tx = strategy.harvest({"from": gov})
+    profit = tx.events["Harvested"]["profit"]
+    assert strategy.lastHarvestProfit() == profit
+    assert strategy.balanceOfWant() == profit
+
+    # the next profit comes out of the reserve
+    shares = yvweth_042.balanceOf(strategy)
+    weth.transfer(yvweth_042, Wei("1 ether"), {"from": weth_whale})
+    chain.sleep(3600)
+    chain.mine(1)
+    strategy.harvest({"from": gov})
+    assert yvweth_042.balanceOf(strategy) >= shares
+
+    # revoking still returns everything
+    yvweth_032.revokeStrategy(strategy, {"from": gov})
+    strategy.harvest({"from": gov})
+    assert yvweth_032.strategies(strategy).dict()["totalDebt"] == 0
+    assert strategy.balanceOfWant() == 0
@@ -0,0 +1,82 @@
+import pytest
+from brownie import reverts, Contract, ZERO_ADDRESS
+from eth_abi import encode_single
+
+NO_SYNTH = b"\x00" * 32
+
+
+@pytest.fixture
+def factory(RouterFactory, strategy, gov):
+    yield gov.deploy(RouterFactory, strategy, ZERO_ADDRESS)
+
+
+def test_deploy_predicted_router(
+    factory, origin_vault, destination_vault, strategy, strategist, rewards, keeper, gov
+):
+    predicted = factory.predictRouterAddress(origin_vault, destination_vault, NO_SYNTH)
+
+    params = (
+        origin_vault,
+        strategist,
+        rewards,
+        keeper,
+        destination_vault,
+        "Route yvWETH 042 (CREATE2)",
+        NO_SYNTH,
+        0,
+    )
+    tx = factory.deployRouter(params, {"from": gov})
+
+    assert tx.events["Cloned"]["clone"] == predicted
+    cloned_strategy = Contract.from_abi("Strategy", predicted, strategy.abi)
+    assert cloned_strategy.vault() == origin_vault
+    assert cloned_strategy.yVault() == destination_vault
+    assert cloned_strategy.keeper() == keeper
+    assert cloned_strategy.name() == "Route yvWETH 042 (CREATE2)"
+
+    # same route cannot be deployed twice
+    with reverts("!create2"):
+        factory.deployRouter(params, {"from": gov})
+
+
+def test_deploy_batch(
+    factory,
+    origin_vault,
+    destination_vault,
+    strategist,
+    rewards,
+    keeper,
+    gov,
+):
+    routes = [
+        (origin_vault, destination_vault),
+        (destination_vault, origin_vault),
+    ]
+    predicted = [
+        factory.predictRouterAddress(vault, y_vault, NO_SYNTH)
+        for vault, y_vault in routes
+    ]
+
+    tx = factory.deployRouters(
+        [
+            (vault, strategist, rewards, keeper, y_vault, f"Route {i}", NO_SYNTH, 0)
+            for i, (vault, y_vault) in enumerate(routes)
+        ],
+        {"from": gov},
+    )
+
+    assert [event["clone"] for event in tx.events["Cloned"]] == predicted
+
+
+def test_factory_permissions(factory, origin_vault, destination_vault, user):
+    with reverts("!authorized"):
+        factory.deployRouter(
+            (origin_vault, user, user, user, destination_vault, "Route", NO_SYNTH, 0),
+            {"from": user},
+        )
+
+    # no SynthetixRouterStrategy original configured
+    with reverts("!original"):
+        factory.predictRouterAddress(
+            origin_vault, destination_vault, encode_single("bytes32", b"ProxysBTC")
+        )